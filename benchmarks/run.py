@@ -0,0 +1,353 @@
+"""
+Benchmarks for the hot paths of quantityfield
+
+Every benchmark is compared to a baseline using plain Django fields, so the
+overhead of quantities is visible. Run from the repository root with
+
+    python -m benchmarks.run [--rows 10000] [--number 5] [--filter get_prep]
+
+The results can be written to a JSON file with ``--json results.json`` and
+the times compared to such a file of a previous run with
+``--compare results.json``.
+The benchmarks only need SQLite and no network access.
+"""
+
+import argparse
+import gc
+import json
+import os
+import platform
+import subprocess
+import sys
+import time
+import tracemalloc
+from collections.abc import Callable
+from decimal import Decimal
+
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "benchmarks.settings")
+
+import django  # noqa: E402
+
+django.setup()
+
+from django import forms  # noqa: E402
+from django.core.management import call_command  # noqa: E402
+from django.db import connection, models  # noqa: E402
+from django.forms.widgets import NumberInput  # noqa: E402
+
+from quantityfield.fields import (  # noqa: E402
+    DecimalQuantityField,
+    QuantityField,
+    QuantityFormField,
+)
+from quantityfield.units import ureg  # noqa: E402
+from quantityfield.widgets import QuantityWidget  # noqa: E402
+from tests.dummyapp.models import (  # noqa: E402
+    FloatFieldSaveModel,
+    PlainFloatFieldSaveModel,
+)
+
+BENCHMARKS: list[tuple[str, Callable]] = []
+
+
+def benchmark(name: str):
+    """Register a benchmark returning the (quantity, baseline) functions"""
+
+    def decorator(factory):
+        BENCHMARKS.append((name, factory))
+        return factory
+
+    return decorator
+
+
+def measure_time(func: Callable[[], object], number: int) -> float:
+    """Return the best time of number runs in seconds"""
+    best = float("inf")
+    for _ in range(number):
+        gc.collect()
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def measure_allocations(func: Callable[[], object]) -> int:
+    """Return the peak of memory allocated during one run in bytes"""
+    gc.collect()
+    tracemalloc.start()
+    try:
+        func()
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def create_rows(rows: int) -> None:
+    for model in (FloatFieldSaveModel, PlainFloatFieldSaveModel):
+        model.objects.all().delete()
+        model.objects.bulk_create(
+            model(name=str(i), weight=float(i)) for i in range(rows)
+        )
+
+
+@benchmark("from_db_value (queryset)")
+def bench_from_db_value(rows: int):
+    def quantity():
+        for obj in FloatFieldSaveModel.objects.all():
+            obj.weight  # noqa: B018
+
+    def baseline():
+        for obj in PlainFloatFieldSaveModel.objects.all():
+            obj.weight  # noqa: B018
+
+    return quantity, baseline
+
+
+@benchmark("get_prep_value (same unit)")
+def bench_get_prep_value_same_unit(rows: int):
+    field = QuantityField("gram")
+    plain = models.FloatField()
+    values = [ureg.Quantity(float(i), "gram") for i in range(rows)]
+    numbers = [float(i) for i in range(rows)]
+
+    def quantity():
+        for value in values:
+            field.get_prep_value(value)
+
+    def baseline():
+        for value in numbers:
+            plain.get_prep_value(value)
+
+    return quantity, baseline
+
+
+@benchmark("get_prep_value (converted)")
+def bench_get_prep_value_converted(rows: int):
+    field = QuantityField("gram", unit_choices=["kilogram"])
+    plain = models.FloatField()
+    values = [ureg.Quantity(float(i), "kilogram") for i in range(rows)]
+    numbers = [float(i) for i in range(rows)]
+
+    def quantity():
+        for value in values:
+            field.get_prep_value(value)
+
+    def baseline():
+        for value in numbers:
+            plain.get_prep_value(value)
+
+    return quantity, baseline
+
+
+@benchmark("bulk_create (converted)")
+def bench_bulk_create(rows: int):
+    def quantity():
+        FloatFieldSaveModel.objects.bulk_create(
+            FloatFieldSaveModel(name="bulk", weight=ureg.Quantity(i, "kilogram"))
+            for i in range(rows)
+        )
+        FloatFieldSaveModel.objects.filter(name="bulk").delete()
+
+    def baseline():
+        PlainFloatFieldSaveModel.objects.bulk_create(
+            PlainFloatFieldSaveModel(name="bulk", weight=i * 1000.0)
+            for i in range(rows)
+        )
+        PlainFloatFieldSaveModel.objects.filter(name="bulk").delete()
+
+    return quantity, baseline
+
+
+@benchmark("DecimalQuantityField.get_db_prep_save")
+def bench_decimal_get_db_prep_save(rows: int):
+    field = DecimalQuantityField("gram", max_digits=10, decimal_places=2)
+    plain = models.DecimalField(max_digits=10, decimal_places=2)
+    values = [ureg.Quantity(Decimal(i), "gram") for i in range(rows)]
+    numbers = [Decimal(i) for i in range(rows)]
+
+    def quantity():
+        for value in values:
+            field.get_db_prep_save(value, connection)
+
+    def baseline():
+        for value in numbers:
+            plain.get_db_prep_save(value, connection)
+
+    return quantity, baseline
+
+
+@benchmark("QuantityFormField.clean")
+def bench_form_field_clean(rows: int):
+    field = QuantityFormField(base_units="gram", unit_choices=["kilogram", "ounce"])
+    plain = forms.FloatField()
+    count = max(rows // 10, 1)
+
+    def quantity():
+        for i in range(count):
+            field.clean([str(i), "kilogram"])
+
+    def baseline():
+        for i in range(count):
+            plain.clean(str(i))
+
+    return quantity, baseline
+
+
+@benchmark("QuantityWidget.render (unit_choices)")
+def bench_widget_render_choices(rows: int):
+    count = max(rows // 100, 1)
+    value = ureg.Quantity(5.0, "gram")
+
+    def quantity():
+        for _ in range(count):
+            widget = QuantityWidget(
+                base_units="gram", unit_choices=["gram", "kilogram", "ounce"]
+            )
+            widget.render("weight", value)
+
+    def baseline():
+        for _ in range(count):
+            NumberInput().render("weight", 5.0)
+
+    return quantity, baseline
+
+
+@benchmark("QuantityWidget.render (all units)")
+def bench_widget_render_all_units(rows: int):
+    count = max(rows // 1000, 1)
+    value = ureg.Quantity(5.0, "gram")
+
+    def quantity():
+        for _ in range(count):
+            QuantityWidget(base_units="gram").render("weight", value)
+
+    def baseline():
+        for _ in range(count):
+            NumberInput().render("weight", 5.0)
+
+    return quantity, baseline
+
+
+def _import_code(statement: str) -> str:
+    # No installed apps, so quantityfield is not imported by django.setup()
+    return (
+        "import time; from django.conf import settings; settings.configure(); "
+        "start = time.perf_counter(); "
+        f"{statement}; "
+        "print(time.perf_counter() - start)"
+    )
+
+
+def measure_import(statement: str, number: int) -> float:
+    """Return the best time of statement in a fresh interpreter in seconds"""
+    best = float("inf")
+    for _ in range(number):
+        result = subprocess.run(
+            [sys.executable, "-c", _import_code(statement)],
+            capture_output=True,
+            check=True,
+            text=True,
+        )
+        best = min(best, float(result.stdout.strip()))
+    return best
+
+
+def format_bytes(size: float) -> str:
+    return f"{size / 1024:.1f} KiB"
+
+
+def format_change(name: str, seconds: float, previous: dict) -> str:
+    """Return the time relative to the previous run, if it contains name"""
+    if name not in previous:
+        return ""
+    return f" {seconds / previous[name]['time']:>6.2f}x"
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rows", type=int, default=10_000)
+    parser.add_argument("--number", type=int, default=5)
+    parser.add_argument("--filter", default="", help="Only run matching benchmarks")
+    parser.add_argument("--json", help="Write the results as JSON into this file")
+    parser.add_argument(
+        "--compare", help="Compare the times to the JSON results of a previous run"
+    )
+    args = parser.parse_args(argv)
+
+    previous = {}
+    if args.compare:
+        with open(args.compare) as file:
+            previous = json.load(file)["benchmarks"]
+
+    call_command("migrate", verbosity=0)
+    create_rows(args.rows)
+
+    header = (
+        f"{'benchmark':<40} {'time':>10} {'baseline':>10} {'ratio':>7} "
+        f"{'memory':>12} {'baseline':>12} {'ratio':>7}"
+    )
+    if previous:
+        header += f" {'previous':>7}"
+    print(header)
+    print("-" * len(header))
+    results: dict[str, dict[str, float]] = {}
+    for name, factory in BENCHMARKS:
+        if args.filter not in name:
+            continue
+        quantity, baseline = factory(args.rows)
+        quantity_time = measure_time(quantity, args.number)
+        baseline_time = measure_time(baseline, args.number)
+        quantity_memory = measure_allocations(quantity)
+        baseline_memory = measure_allocations(baseline)
+        results[name] = {
+            "time": quantity_time,
+            "baseline_time": baseline_time,
+            "memory": quantity_memory,
+            "baseline_memory": baseline_memory,
+        }
+        print(
+            f"{name:<40} {quantity_time * 1000:>8.2f}ms {baseline_time * 1000:>8.2f}ms "
+            f"{quantity_time / baseline_time:>6.1f}x "
+            f"{format_bytes(quantity_memory):>12} {format_bytes(baseline_memory):>12} "
+            f"{quantity_memory / max(baseline_memory, 1):>6.1f}x"
+            f"{format_change(name, quantity_time, previous)}"
+        )
+
+    startup = {
+        "import quantityfield.fields": "import quantityfield.fields",
+        "startup (import and default registry)": (
+            "import quantityfield.fields; quantityfield.settings.get_unit_registry()"
+        ),
+    }
+    baseline_time = measure_import("import django.db.models", args.number)
+    for name, statement in startup.items():
+        if args.filter not in name:
+            continue
+        quantity_time = measure_import(statement, args.number)
+        results[name] = {"time": quantity_time, "baseline_time": baseline_time}
+        change = format_change(name, quantity_time, previous)
+        print(
+            f"{name:<40} {quantity_time * 1000:>8.2f}ms "
+            f"{baseline_time * 1000:>8.2f}ms {quantity_time / baseline_time:>6.1f}x"
+            # There are no memory columns for the startup times
+            f"{change and ' ' * 34 + change}"
+        )
+
+    if args.json:
+        with open(args.json, "w") as file:
+            json.dump(
+                {
+                    "python": platform.python_version(),
+                    "django": django.get_version(),
+                    "rows": args.rows,
+                    "number": args.number,
+                    # Times in seconds, memory in bytes
+                    "benchmarks": results,
+                },
+                file,
+                indent=2,
+            )
+
+
+if __name__ == "__main__":
+    main()
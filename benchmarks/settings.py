@@ -0,0 +1,10 @@
+"""Django settings for running the benchmarks offline against SQLite"""
+
+from tests.settings import *  # noqa: F403
+
+DATABASES = {
+    "default": {
+        "ENGINE": "django.db.backends.sqlite3",
+        "NAME": ":memory:",
+    },
+}
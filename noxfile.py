@@ -68,3 +68,11 @@ def docs_doctest(session: nox.Session) -> None:
     wheel = _build_wheel()
     session.install("--group", "docs", str(wheel))
     session.run("sphinx-build", "-b", "doctest", "docs", "docs/_build/doctest")
+
+
+@nox.session(python="3.12", default=False)
+def benchmarks(session: nox.Session) -> None:
+    """Run the benchmarks against SQLite (not part of the default sessions)."""
+    wheel = _build_wheel()
+    session.install("--group", "testing", str(wheel))
+    session.run("python", "-m", "benchmarks.run", *session.posargs)
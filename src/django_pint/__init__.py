@@ -9,6 +9,38 @@ except PackageNotFoundError:  # pragma: no cover
 finally:
     del version, PackageNotFoundError
 
-from quantityfield import fields, helper, settings, units, widgets
+from quantityfield import (
+    aggregates,
+    export,
+    expressions,
+    fields,
+    helper,
+    importer,
+    lookups,
+    operations,
+    query,
+    series,
+    settings,
+    units,
+    validators,
+    views,
+    widgets,
+)
 
-__all__ = ["fields", "helper", "settings", "units", "widgets"]
+__all__ = [
+    "aggregates",
+    "export",
+    "expressions",
+    "fields",
+    "helper",
+    "importer",
+    "lookups",
+    "operations",
+    "query",
+    "series",
+    "settings",
+    "units",
+    "validators",
+    "views",
+    "widgets",
+]
@@ -0,0 +1,112 @@
+from collections.abc import Callable
+
+from django.db.models import Avg, Max, Min, StdDev, Sum, Variance
+
+from pint import DimensionalityError, OffsetUnitCalculusError, Unit
+
+from .expressions import get_quantity_field, linear_conversion_sql
+from .fields import QuantityField
+
+
+def is_offset_unit(ureg, unit: Unit) -> bool:
+    """Return True for non multiplicative units like degC"""
+    # The difference of two values has the delta unit for offset units
+    return (ureg.Quantity(0, unit) - ureg.Quantity(0, unit)).units != unit
+
+
+class QuantityAggregateMixin:
+    """
+    Aggregate returning a Quantity in the units of the source quantity field
+
+    The aggregate is computed completely by the database. If units are given,
+    the result is converted into these units with the factor and offset
+    computed once for the query.
+    """
+
+    # Power of the resulting unit, i.e. 2 for the variance
+    unit_power = 1
+    # The result describes a difference of values, so offset units like degC
+    # are returned as delta units and the offset is not applied
+    is_difference = False
+    # Sums of offset units are not defined
+    allows_offset_units = True
+
+    get_source_expressions: Callable[[], list]
+
+    def __init__(self, expression, *args, units: str | None = None, **extra):
+        self.units = units
+        super().__init__(expression, *args, **extra)
+
+    def get_conversion(self) -> tuple[Unit, float, float]:
+        """
+        Return the unit of the result and the scale and shift needed to
+        convert the aggregated base unit magnitude into this unit
+        """
+        field = get_quantity_field(self.get_source_expressions()[0])
+        ureg = field.ureg
+        plan = field.conversion_plan
+        unit = plan.base_unit if self.units is None else getattr(ureg, self.units)
+        factors = plan.get_factors(unit)
+        if factors is None:
+            # Conversions within a pint context or of logarithmic units can't be
+            # expressed linearly
+            raise DimensionalityError(plan.base_unit, unit)
+        factor, offset = factors
+        scale = 1 / factor
+        shift = -offset / factor
+
+        if not self.allows_offset_units and (
+            is_offset_unit(ureg, plan.base_unit) or is_offset_unit(ureg, unit)
+        ):
+            raise OffsetUnitCalculusError(plan.base_unit, unit)
+        if self.is_difference:
+            shift = 0
+            if is_offset_unit(ureg, unit):
+                unit = (ureg.Quantity(0, unit) - ureg.Quantity(0, unit)).units
+        return unit**self.unit_power, scale**self.unit_power, shift
+
+    def _resolve_output_field(self):
+        unit, _, _ = self.get_conversion()
+        return QuantityField(str(unit))
+
+    def as_sql(self, compiler, connection, **extra_context):
+        sql, params = super().as_sql(compiler, connection, **extra_context)
+        _, scale, shift = self.get_conversion()
+        return linear_conversion_sql(sql, params, scale, shift)
+
+    def as_mysql(self, compiler, connection, **extra_context):
+        as_vendor = getattr(super(), "as_mysql", super().as_sql)
+        sql, params = as_vendor(compiler, connection, **extra_context)
+        _, scale, shift = self.get_conversion()
+        return linear_conversion_sql(sql, params, scale, shift)
+
+    def as_oracle(self, compiler, connection, **extra_context):
+        as_vendor = getattr(super(), "as_oracle", super().as_sql)
+        sql, params = as_vendor(compiler, connection, **extra_context)
+        _, scale, shift = self.get_conversion()
+        return linear_conversion_sql(sql, params, scale, shift)
+
+
+class QuantitySum(QuantityAggregateMixin, Sum):
+    allows_offset_units = False
+
+
+class QuantityAvg(QuantityAggregateMixin, Avg):
+    pass
+
+
+class QuantityMin(QuantityAggregateMixin, Min):
+    pass
+
+
+class QuantityMax(QuantityAggregateMixin, Max):
+    pass
+
+
+class QuantityStdDev(QuantityAggregateMixin, StdDev):
+    is_difference = True
+
+
+class QuantityVariance(QuantityAggregateMixin, Variance):
+    is_difference = True
+    unit_power = 2
@@ -0,0 +1,15 @@
+from django.apps import AppConfig
+from django.conf import settings
+
+from .settings import get_unit_table
+
+
+class QuantityFieldConfig(AppConfig):
+    name = "quantityfield"
+    verbose_name = "Quantity Field"
+
+    def ready(self):
+        # Parse the units of the shared unit table at startup and not
+        # while handling the first request
+        if hasattr(settings, "DJANGO_PINT_UNIT_CODES"):
+            get_unit_table()
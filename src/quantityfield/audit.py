@@ -0,0 +1,323 @@
+import json
+import math
+import multiprocessing
+from collections.abc import Callable, Iterable, Iterator
+from concurrent import futures
+from decimal import Decimal
+from typing import Any, NamedTuple
+
+import django
+from django.apps import apps
+from django.core.exceptions import ValidationError
+from django.core.management.base import BaseCommand, CommandError
+from django.db import models
+from django.db.models import F
+from django.db.models.functions import Round
+
+from pint import Quantity
+
+from .expressions import raw_magnitude
+from .fields import QuantityFieldMixin, QuantityRangeField, QuantityWithUnitField
+
+
+class ChunkResult(NamedTuple):
+    """
+    Result of auditing or re-normalizing one chunk of rows
+    """
+
+    label: str
+    rows: int
+    nulls: int = 0
+    invalid: int = 0
+    invalid_pks: tuple = ()
+
+
+def field_label(model: type[models.Model], field: models.Field) -> str:
+    return f"{model._meta.label}.{field.name}"
+
+
+def is_processable(field: models.Field) -> bool:
+    """
+    Return whether the field stores a quantity as a single number in its
+    column, which can be checked and converted by itself
+    """
+    # The stored values of ranges and fields keeping the unit are split
+    # over several columns, which have to be converted together
+    return (
+        isinstance(field, QuantityFieldMixin)
+        and isinstance(
+            field, (models.FloatField, models.IntegerField, models.DecimalField)
+        )
+        and not isinstance(field, (QuantityRangeField, QuantityWithUnitField))
+    )
+
+
+def get_quantity_fields(
+    labels: Iterable[str] = (),
+) -> list[tuple[type[models.Model], models.Field]]:
+    """
+    Return the numeric quantity fields of all installed apps
+
+    :param labels: Limit the fields to apps, models or fields given as
+                   ``app_label``, ``app_label.Model`` or ``app_label.Model.field``
+    :raise LookupError: if a label does not exist
+    :raise ValueError: if a field given by label can't be processed
+    """
+    selected: list[tuple[type[models.Model], models.Field]] = []
+    for label in labels or [None]:
+        if label is None:
+            candidates = apps.get_models()
+            field_name = None
+        else:
+            app_label, _, rest = label.partition(".")
+            model_name, _, field_name = rest.partition(".")
+            if model_name:
+                candidates = [apps.get_model(app_label, model_name)]
+            else:
+                candidates = apps.get_app_config(app_label).get_models()
+        for model in candidates:
+            if field_name:
+                fields = [model._meta.get_field(field_name)]
+                if not is_processable(fields[0]):
+                    raise ValueError(
+                        f"Field '{label}' is no quantity field storing a single "
+                        "number and can't be processed."
+                    )
+            else:
+                fields = model._meta.concrete_fields
+            selected.extend((model, field) for field in fields if is_processable(field))
+    return selected
+
+
+def iter_chunks(model: type[models.Model], chunk_size: int) -> Iterator[tuple]:
+    """
+    Yield the primary key bounds ``(after, until)`` of chunks of chunk_size
+    rows, using keyset pagination
+
+    Only the primary key of the last row of every chunk is loaded.
+    The ``after`` bound of the first chunk is None.
+    """
+    rows = model._base_manager.order_by("pk").values_list("pk", flat=True)
+    after = None
+    while True:
+        chunk = rows if after is None else rows.filter(pk__gt=after)
+        until = chunk[chunk_size - 1 : chunk_size].first()
+        if until is None:
+            # The last chunk contains less than chunk_size rows
+            until = chunk.last()
+            if until is not None:
+                yield after, until
+            return
+        yield after, until
+        after = until
+
+
+def chunk_queryset(model_label: str, after: Any, until: Any) -> models.QuerySet:
+    model = apps.get_model(model_label)
+    queryset = model._base_manager.filter(pk__lte=until)
+    if after is not None:
+        queryset = queryset.filter(pk__gt=after)
+    return queryset
+
+
+def audit_chunk(
+    model_label: str,
+    field_name: str,
+    after: Any,
+    until: Any,
+    minimum: Any = None,
+    maximum: Any = None,
+    samples: int = 10,
+) -> ChunkResult:
+    """
+    Check the stored magnitudes of one chunk
+
+    Values are invalid if they are not finite, outside of minimum or
+    maximum (given in base units) or fail a validator of the field.
+    """
+    field = apps.get_model(model_label)._meta.get_field(field_name)
+    validators = field.validators
+    rows = nulls = invalid = 0
+    invalid_pks = []
+    queryset = (
+        chunk_queryset(model_label, after, until)
+        .order_by("pk")
+        .values_list("pk", raw_magnitude(field))
+    )
+    for pk, magnitude in queryset.iterator():
+        rows += 1
+        if magnitude is None:
+            nulls += 1
+            continue
+        valid = (
+            (isinstance(magnitude, int) or math.isfinite(magnitude))
+            and (minimum is None or magnitude >= minimum)
+            and (maximum is None or magnitude <= maximum)
+        )
+        if valid:
+            try:
+                for validator in validators:
+                    validator(magnitude)
+            except ValidationError:
+                valid = False
+        if not valid:
+            invalid += 1
+            if len(invalid_pks) < samples:
+                invalid_pks.append(pk)
+    return ChunkResult(
+        f"{model_label}.{field_name}", rows, nulls, invalid, tuple(invalid_pks)
+    )
+
+
+def renormalize_chunk(
+    model_label: str,
+    field_name: str,
+    after: Any,
+    until: Any,
+    factor: float,
+    offset: float,
+) -> ChunkResult:
+    """
+    Convert the stored magnitudes of one chunk with
+    ``magnitude * factor + offset`` within the database
+    """
+    field = apps.get_model(model_label)._meta.get_field(field_name)
+    if isinstance(field, models.DecimalField):
+        factor, offset = Decimal(str(factor)), Decimal(str(offset))
+    expression = F(field_name) * factor + offset
+    if isinstance(field, models.IntegerField):
+        expression = Round(expression)
+    rows = chunk_queryset(model_label, after, until).update(**{field_name: expression})
+    return ChunkResult(f"{model_label}.{field_name}", rows)
+
+
+def init_worker() -> None:
+    # The processes are spawned, so they don't share the database
+    # connections of the parent, but have to set up django
+    if not apps.ready:
+        django.setup()
+
+
+def run_chunks(
+    function: Callable[..., ChunkResult],
+    tasks: Iterable[tuple],
+    processes: int = 1,
+) -> Iterator[ChunkResult]:
+    """
+    Run function for every task and yield the results
+
+    With more than one process, the tasks are spread over a process pool.
+    Only a few tasks per process are submitted at once, so the tasks are
+    consumed lazily.
+    """
+    if processes <= 1:
+        for task in tasks:
+            yield function(*task)
+        return
+
+    with futures.ProcessPoolExecutor(
+        processes,
+        mp_context=multiprocessing.get_context("spawn"),
+        initializer=init_worker,
+    ) as pool:
+        pending: set[futures.Future] = set()
+        for task in tasks:
+            pending.add(pool.submit(function, *task))
+            if len(pending) >= 2 * processes:
+                done, pending = futures.wait(
+                    pending, return_when=futures.FIRST_COMPLETED
+                )
+                for future in done:
+                    yield future.result()
+        for future in futures.as_completed(pending):
+            yield future.result()
+
+
+def parse_quantity(value: str, ureg) -> Quantity:
+    """
+    Parse a quantity like ``"-20 degC"``, also for offset units
+    """
+    magnitude, _, unit = value.strip().partition(" ")
+    return ureg.Quantity(float(magnitude), unit.strip() or "dimensionless")
+
+
+class ChunkedQuantityCommand(BaseCommand):
+    """
+    Base of the management commands processing quantity fields in chunks
+    """
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "labels",
+            nargs="*",
+            help="Limit to app_label, app_label.Model or app_label.Model.field",
+        )
+        parser.add_argument(
+            "--chunk-size",
+            type=int,
+            default=10000,
+            help="Number of rows processed at once (default: 10000)",
+        )
+        parser.add_argument(
+            "--processes",
+            type=int,
+            default=1,
+            help="Number of processes the chunks are spread over (default: 1)",
+        )
+        parser.add_argument(
+            "--report", help="Write the summary report as JSON into this file"
+        )
+
+    def get_fields(self, labels) -> list[tuple[type[models.Model], models.Field]]:
+        try:
+            fields = get_quantity_fields(labels)
+        except (LookupError, ValueError) as e:
+            raise CommandError(str(e)) from e
+        if not fields:
+            raise CommandError("No quantity fields found.")
+        return fields
+
+    def iter_tasks(self, fields, chunk_size: int, *args) -> Iterator[tuple]:
+        """
+        Yield the task of every chunk of every field, extended by the
+        arguments returned by get_task_arguments
+        """
+        for model, field in fields:
+            arguments = self.get_task_arguments(field, *args)
+            for after, until in iter_chunks(model, chunk_size):
+                yield model._meta.label, field.name, after, until, *arguments
+
+    def get_task_arguments(self, field, *args) -> tuple:
+        return args
+
+    def summarize(self, results: Iterable[ChunkResult], options) -> dict:
+        """
+        Combine the chunk results per field, write and return the report
+
+        Every chunk reports its smallest invalid primary keys, so the summary
+        keeps the smallest ones of the field.
+        """
+        summary: dict[str, dict] = {}
+        for result in results:
+            entry = summary.setdefault(
+                result.label, {"rows": 0, "nulls": 0, "invalid": 0, "invalid_pks": []}
+            )
+            entry["rows"] += result.rows
+            entry["nulls"] += result.nulls
+            entry["invalid"] += result.invalid
+            # The results of a process pool arrive in any order, so the
+            # smallest primary keys are kept to get the same report every run
+            entry["invalid_pks"] = sorted([*entry["invalid_pks"], *result.invalid_pks])[
+                : options.get("samples", 0)
+            ]
+            if options["verbosity"] > 1:
+                self.stdout.write(f"{result.label}: {entry['rows']} rows")
+        for label, entry in summary.items():
+            self.stdout.write(self.format_entry(label, entry))
+        if options["report"]:
+            with open(options["report"], "w") as report:
+                json.dump(summary, report, indent=2, default=str)
+        return summary
+
+    def format_entry(self, label: str, entry: dict) -> str:
+        raise NotImplementedError
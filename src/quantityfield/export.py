@@ -0,0 +1,209 @@
+import csv
+from collections.abc import Iterator, Sequence
+from typing import Any, TextIO
+
+from django.db import models
+from django.http import StreamingHttpResponse
+
+from .expressions import raw_magnitude
+from .fields import QuantityFieldMixin, QuantityRangeField, QuantityWithUnitField
+from .helper import UnitConversionPlan, check_matching_unit_dimension
+
+NUMERIC_FIELDS = (models.FloatField, models.IntegerField, models.DecimalField)
+
+
+def get_companion_names(model: type[models.Model]) -> set[str]:
+    """
+    Return the names of the fields storing a part of the value of another
+    quantity field, i.e. the upper bound of a QuantityRangeField
+    """
+    names = set()
+    for field in model._meta.concrete_fields:
+        if isinstance(field, QuantityRangeField):
+            names.add(field.upper_attname)
+        elif isinstance(field, QuantityWithUnitField):
+            names.update((field.magnitude_attname, field.unit_code_attname))
+    return names
+
+
+def is_exportable(field: models.Field) -> bool:
+    # Quantity fields storing arrays or series have no single magnitude.
+    # The unit of a QuantityWithUnitField can't be imported again, the upper
+    # bound of ranges is exported with the range.
+    if isinstance(field, QuantityWithUnitField) or field.name in get_companion_names(
+        field.model
+    ):
+        return False
+    return not isinstance(field, QuantityFieldMixin) or isinstance(
+        field, NUMERIC_FIELDS
+    )
+
+
+class Echo:
+    """
+    File like object returning what is written, to stream the lines of a
+    csv writer
+    """
+
+    def write(self, value: str) -> str:
+        return value
+
+
+class ExportColumn:
+    """
+    A column of the export, converting the raw magnitudes of a quantity field
+    from its base units into the display units in batches
+
+    The upper bound of a QuantityRangeField is exported in a second column,
+    named like its companion field.
+    """
+
+    def __init__(
+        self, field: models.Field, units: str | None = None, upper: bool = False
+    ) -> None:
+        self.field = field
+        self.plan: UnitConversionPlan | None = None
+        if not is_exportable(field):
+            raise ValueError(f"Field '{field.name}' can't be exported as CSV.")
+        if not isinstance(field, QuantityFieldMixin):
+            if units is not None:
+                raise ValueError(f"Field '{field.name}' is not a quantity field.")
+            self.header = field.attname
+            self.expression: Any = field.attname
+            return
+        units = units or field.base_units
+        check_matching_unit_dimension(field.ureg, field.base_units, [units])
+        if upper:
+            self.header = f"{field.upper_attname} [{units}]"
+            self.expression = raw_magnitude(field.upper_field)
+        else:
+            self.header = f"{field.name} [{units}]"
+            self.expression = raw_magnitude(field)
+        if getattr(field.ureg, units) != field.conversion_plan.base_unit:
+            # The base unit of the field is converted into the display unit
+            self.plan = UnitConversionPlan(field.ureg, units, [])
+
+    def convert(self, values: list) -> list:
+        """
+        Convert the magnitudes of one chunk at once, keeping NULL values
+        """
+        if self.plan is None:
+            return values
+        indexes = [index for index, value in enumerate(values) if value is not None]
+        magnitudes = [values[index] for index in indexes]
+        if isinstance(self.field, models.DecimalField):
+            magnitudes = [float(magnitude) for magnitude in magnitudes]
+        converted = self.plan.to_base_magnitudes(
+            magnitudes, self.field.conversion_plan.base_unit
+        )
+        for index, magnitude in zip(indexes, converted, strict=True):
+            values[index] = magnitude
+        return values
+
+
+class QuantityCsvExporter:
+    """
+    Stream the rows of a queryset as CSV, i.e.
+    ``QuantityCsvExporter(HayBale.objects.all(), units={"weight": "kilogram"})``
+
+    Quantity fields are read as raw magnitudes and converted chunk by chunk
+    into their display units, so no Quantity is created per value. The
+    headers of quantity columns contain the units, i.e. ``weight [kilogram]``.
+    Ranges are exported as two columns, i.e. ``weight [kilogram]`` and
+    ``weight_upper [kilogram]``; QuantityWithUnitField is not exported.
+    """
+
+    def __init__(
+        self,
+        queryset: models.QuerySet,
+        fields: Sequence[str] | None = None,
+        units: dict[str, str] | None = None,
+        chunk_size: int = 2000,
+    ) -> None:
+        """
+        :param queryset: Rows to export
+        :param fields: Names of the exported fields, all concrete fields by default
+        :param units: Display units per quantity field, the base units by default
+        :param chunk_size: Number of rows fetched and converted at once
+        :raise DimensionalityError: if a display unit does not match the field
+        """
+        if chunk_size < 1:
+            raise ValueError("chunk_size must be at least 1.")
+        opts = queryset.model._meta
+        if fields is None:
+            fields = [
+                field.name for field in opts.concrete_fields if is_exportable(field)
+            ]
+        units = units or {}
+        unknown = set(units) - set(fields)
+        if unknown:
+            raise ValueError(f"Units given for fields not exported: {sorted(unknown)}")
+        self.queryset = queryset
+        self.columns = []
+        for name in fields:
+            field = opts.get_field(name)
+            self.columns.append(ExportColumn(field, units.get(name)))
+            if isinstance(field, QuantityRangeField):
+                self.columns.append(ExportColumn(field, units.get(name), upper=True))
+        self.chunk_size = chunk_size
+
+    @property
+    def headers(self) -> list[str]:
+        return [column.header for column in self.columns]
+
+    def iter_chunks(self) -> Iterator[list[tuple]]:
+        """
+        Yield the converted rows, chunk_size rows at a time
+        """
+        rows = self.queryset.values_list(
+            *(column.expression for column in self.columns)
+        ).iterator(chunk_size=self.chunk_size)
+        chunk = []
+        for row in rows:
+            chunk.append(row)
+            if len(chunk) >= self.chunk_size:
+                yield self.convert(chunk)
+                chunk = []
+        if chunk:
+            yield self.convert(chunk)
+
+    def convert(self, chunk: list[tuple]) -> list[tuple]:
+        values = [
+            column.convert(list(values))
+            for column, values in zip(
+                self.columns, zip(*chunk, strict=True), strict=True
+            )
+        ]
+        return list(zip(*values, strict=True))
+
+    def iter_lines(self) -> Iterator[str]:
+        """
+        Yield the CSV lines, starting with the headers
+        """
+        writer = csv.writer(Echo())
+        yield writer.writerow(self.headers)
+        for chunk in self.iter_chunks():
+            # One string per chunk keeps the number of written parts small
+            yield "".join(map(writer.writerow, chunk))
+
+    def write(self, file: TextIO) -> int:
+        """
+        Write the CSV into a text file and return the number of rows
+        """
+        writer = csv.writer(file)
+        writer.writerow(self.headers)
+        count = 0
+        for chunk in self.iter_chunks():
+            writer.writerows(chunk)
+            count += len(chunk)
+        return count
+
+    def response(self, filename: str = "export.csv") -> StreamingHttpResponse:
+        """
+        Return a response streaming the CSV to the client
+        """
+        return StreamingHttpResponse(
+            self.iter_lines(),
+            content_type="text/csv",
+            headers={"Content-Disposition": f'attachment; filename="{filename}"'},
+        )
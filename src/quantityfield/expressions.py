@@ -0,0 +1,96 @@
+from collections.abc import Sequence
+from typing import Any
+
+from django.db import models
+from django.db.models import ExpressionWrapper, F, Func
+
+from pint import DimensionalityError
+
+from .fields import QuantityField, QuantityFieldMixin
+
+
+def get_quantity_field(expression) -> QuantityFieldMixin:
+    """
+    Return the quantity field the resolved expression refers to
+    :raise ValueError: if the expression is not based on a quantity field
+    """
+    field = expression.output_field
+    if not isinstance(field, QuantityFieldMixin):
+        raise ValueError(f"Expression {expression!r} is not a quantity field.")
+    return field
+
+
+def linear_conversion_sql(
+    sql: str, params: Sequence[Any], scale: float, shift: float
+) -> tuple[str, tuple[Any, ...]]:
+    """
+    Return the SQL of ``(sql * scale + shift)``, leaving out the identities
+    """
+    params = list(params)
+    if scale != 1:
+        sql = f"{sql} * %s"
+        params.append(scale)
+    if shift != 0:
+        sql = f"{sql} + %s"
+        params.append(shift)
+    return f"({sql})", tuple(params)
+
+
+def raw_magnitude(field: models.Field) -> ExpressionWrapper:
+    """
+    Return an expression selecting the stored magnitude of a quantity field,
+    without creating a Quantity for every row
+    """
+    if isinstance(field, models.DecimalField):
+        output_field = models.DecimalField(
+            max_digits=field.max_digits, decimal_places=field.decimal_places
+        )
+    elif isinstance(field, models.IntegerField):
+        output_field = models.IntegerField()
+    else:
+        output_field = models.FloatField()
+    return ExpressionWrapper(F(field.name), output_field=output_field)
+
+
+class ConvertUnits(Func):
+    """
+    Convert the values of a quantity field into other units within the database
+
+    The factor and offset are computed once when the query is built, so the
+    database only has to evaluate ``value * scale + shift``.
+    The result is returned as a Quantity in the given units.
+
+    Example: ``HayBale.objects.annotate(pounds=ConvertUnits("weight", "pound"))``
+    """
+
+    arity = 1
+
+    def __init__(self, expression, units: str, **extra):
+        if not isinstance(units, str):
+            raise ValueError('ConvertUnits must be defined with units, eg: "pound"')
+        self.units = units
+        self.scale = 1.0
+        self.shift = 0.0
+        super().__init__(expression, **extra)
+
+    def resolve_expression(self, *args, **kwargs):
+        resolved = super().resolve_expression(*args, **kwargs)
+        field = get_quantity_field(resolved.source_expressions[0])
+        unit = getattr(field.ureg, resolved.units)
+        factors = field.conversion_plan.get_factors(unit)
+        if factors is None:
+            # Conversions within a pint context or of logarithmic units can't be
+            # expressed linearly
+            raise DimensionalityError(field.conversion_plan.base_unit, unit)
+        factor, offset = factors
+        # factor and offset convert into the base unit, we need the inverse
+        resolved.scale = 1 / factor
+        resolved.shift = -offset / factor
+        return resolved
+
+    def _resolve_output_field(self):
+        return QuantityField(self.units)
+
+    def as_sql(self, compiler, connection, **extra_context):
+        sql, params = compiler.compile(self.source_expressions[0])
+        return linear_conversion_sql(sql, params, self.scale, self.shift)
@@ -1,23 +1,43 @@
+import copy
 import datetime
+import math
+import struct
 import typing
 import warnings
+from base64 import b64decode, b64encode
 from collections.abc import Callable, Sequence
 from decimal import Decimal
-from typing import Any, Union, cast
+from types import ModuleType
+from typing import Any, NamedTuple, Union, cast
 
 from django import forms
 from django.contrib.admin.options import FORMFIELD_FOR_DBFIELD_DEFAULTS
 from django.core.exceptions import ValidationError
 from django.db import models
+from django.db.models import signals
 from django.db.models.expressions import BaseExpression
+from django.db.models.query_utils import DeferredAttribute
 from django.utils import formats
+from django.utils.functional import cached_property
 from django.utils.translation import gettext_lazy as _
 
-from pint import Quantity
-
-from .helper import check_matching_unit_dimension
-from .units import ureg
-from .widgets import QuantityWidget
+from pint import PintError, Quantity
+
+from .helper import (
+    ForeignUnitCache,
+    UnitConversionPlan,
+    UnitParseCache,
+    UnitPrefixIndex,
+    UnitTable,
+    check_matching_unit_dimension,
+    import_numpy,
+    register_unit_index,
+    split_quantity,
+)
+from .lookups import INTERVAL_LOOKUPS, QUANTITY_LOOKUPS
+from .settings import get_unit_registry, get_unit_table
+from .validators import QuantityValueValidatorMixin
+from .widgets import QuantityAutocompleteWidget, QuantityTextInput, QuantityWidget
 
 DJANGO_JSON_SERIALIZABLE_BASE = Union[  # noqa: UP007
     None, bool, str, int, float, complex, datetime.datetime
@@ -28,6 +48,30 @@ DJANGO_JSON_SERIALIZABLE = Union[  # noqa: UP007
 NUMBER_TYPE = Union[int, float, Decimal]  # noqa: UP007
 
 
+class LazyQuantityDescriptor(DeferredAttribute):
+    """
+    Descriptor for lazy quantity fields
+
+    The database value is kept as plain magnitude within the instance __dict__
+    and only converted to a Quantity on first access.
+    """
+
+    def __get__(self, instance, cls=None):
+        if instance is None:
+            return self
+        value = super().__get__(instance, cls)
+        if value is None or isinstance(value, Quantity):
+            return value
+        quantity = self.field.ureg.Quantity(value, self.field.conversion_plan.base_unit)
+        instance.__dict__[self.field.attname] = quantity
+        return quantity
+
+    def __set__(self, instance, value):
+        # Defining __set__ makes this a data descriptor, so that __get__ is
+        # also called if the value is already stored in the instance __dict__
+        instance.__dict__[self.field.attname] = value
+
+
 class QuantityFieldMixin:
     to_number_type: Callable[[Any], NUMBER_TYPE]
 
@@ -35,16 +79,28 @@ class QuantityFieldMixin:
     #       better defining a Mixin
     value_from_object: Callable[[Any], Any]
     name: str
+    attname: str
+    _validators: list
     validate: Callable
     run_validators: Callable
 
     """A Django Model Field that resolves to a pint Quantity object"""
 
+    # Shared between all fields, so that units of foreign registries
+    # are only translated once
+    foreign_unit_cache = ForeignUnitCache()
+
+    # Lookups converting the right hand side once per query, they take
+    # precedence over the lookups of the django field
+    class_lookups = {lookup.lookup_name: lookup for lookup in QUANTITY_LOOKUPS}
+
     def __init__(
         self,
         base_units: str,
         *args,
         unit_choices: typing.Iterable[str] | None = None,
+        lazy: bool = False,
+        db_constraints: bool = False,
         **kwargs,
     ):
         """
@@ -52,19 +108,31 @@ class QuantityFieldMixin:
         :param base_units: Unit description of base unit
         :param unit_choices: If given the possible unit choices with the same
                              dimension like the base_unit
+        :param lazy: If True, values loaded from the database are only converted
+                     to a Quantity on first attribute access.
+                     Note that ``values()``, ``values_list()`` and plain
+                     aggregates like ``Max`` will return the plain magnitude
+                     in base units in this case.
+        :param db_constraints: If True, quantity validators like
+                     QuantityMinValueValidator are added as CheckConstraint
+                     to the model, so they are enforced by the database.
         """
         if not isinstance(base_units, str):
             raise ValueError(
                 'QuantityField must be defined with base units, eg: "gram"'
             )
 
-        self.ureg = ureg
+        self.ureg = get_unit_registry()
 
         # we do this as a way of raising an exception if some crazy unit was supplied.
         unit = getattr(self.ureg, base_units)  # noqa: F841
 
         # if we've not hit an exception here, we should be all good
         self.base_units = base_units
+        self.lazy = lazy
+        if lazy:
+            self.descriptor_class = LazyQuantityDescriptor
+        self.db_constraints = db_constraints
 
         if unit_choices is None:
             self.unit_choices: list[str] = [self.base_units]
@@ -83,6 +151,11 @@ class QuantityFieldMixin:
         # Check if all unit_choices are valid
         check_matching_unit_dimension(self.ureg, self.base_units, self.unit_choices)
 
+        # Resolve units only once and not for every value loaded or saved
+        self.conversion_plan = UnitConversionPlan(
+            self.ureg, self.base_units, self.unit_choices
+        )
+
         super().__init__(*args, **kwargs)
 
     @property
@@ -117,8 +190,62 @@ class QuantityFieldMixin:
         name, path, args, kwargs = super_deconstruct()
         kwargs["base_units"] = self.base_units
         kwargs["unit_choices"] = self.unit_choices
+        if self.lazy:
+            kwargs["lazy"] = True
+        if self.db_constraints:
+            kwargs["db_constraints"] = True
         return name, path, args, kwargs
 
+    def contribute_to_class(self, cls, name, *args, **kwargs):
+        super().contribute_to_class(cls, name, *args, **kwargs)
+        # Models of the migration state already contain the constraints
+        if (
+            self.db_constraints
+            and not cls._meta.abstract
+            and cls.__module__ != "__fake__"
+        ):
+            self.add_validator_constraints(cls)
+
+    @cached_property
+    def validators(self) -> list:
+        # Quantity validators compare with the limit in base units. They are
+        # bound before IntegerField compares the limits of min and max value
+        # validators with the range of the column, using a copy of the field,
+        # as _validators are the deconstructed validators.
+        field = copy.copy(self)
+        field._validators = [
+            validator.bind(self)
+            if isinstance(validator, QuantityValueValidatorMixin)
+            else validator
+            for validator in self._validators
+        ]
+        return super(QuantityFieldMixin, field).validators
+
+    def add_validator_constraints(self, cls) -> None:
+        """
+        Add a CheckConstraint for every quantity validator to the model
+
+        They are added like the constraints of Meta.constraints, so they are
+        part of the migrations. The names end with the code of the validator
+        and a number if the field has several validators with the same code.
+        """
+        opts = cls._meta
+        constraints = []
+        codes: dict[str, int] = {}
+        for validator in self._validators:
+            if not isinstance(validator, QuantityValueValidatorMixin):
+                continue
+            codes[validator.code] = count = codes.get(validator.code, 0) + 1
+            name = f"{opts.app_label}_{opts.model_name}_{self.name}_{validator.code}"
+            constraints.append(
+                models.CheckConstraint(
+                    condition=validator.bind(self).get_constraint_condition(self),
+                    name=name if count == 1 else f"{name}_{count}",
+                )
+            )
+        cls._meta.constraints = [*cls._meta.constraints, *constraints]
+        cls._meta.original_attrs["constraints"] = cls._meta.constraints
+
     def fix_unit_registry(self, value: Quantity) -> Quantity:
         """
         Check if the UnitRegistry from settings is used.
@@ -130,15 +257,18 @@ class QuantityFieldMixin:
                 # the same is used within one project
                 # As we warn for this behaviour, we assume that the programmer
                 # will fix it and do not include more checks!
-                warnings.warn(
-                    "Trying to set value from a different unit register for "
-                    "quantityfield. "
-                    "We assume the naming is equal but best use the same register as"
-                    " for creating the quantityfield.",
-                    RuntimeWarning,
-                    stacklevel=2,
-                )
-                return value.magnitude * self.ureg(str(value.units))
+                unit, is_new = self.foreign_unit_cache.translate(self.ureg, value.units)
+                if is_new:
+                    # Warn only once per unit to not flood the logs
+                    warnings.warn(
+                        "Trying to set value from a different unit register for "
+                        "quantityfield. "
+                        "We assume the naming is equal but best use the same "
+                        "register as for creating the quantityfield.",
+                        RuntimeWarning,
+                        stacklevel=2,
+                    )
+                return self.ureg.Quantity(value.magnitude, unit)
             else:
                 return value
         else:
@@ -156,7 +286,7 @@ class QuantityFieldMixin:
 
         if isinstance(value, Quantity):
             quantity = self.fix_unit_registry(value)
-            magnitude = quantity.to(self.base_units).magnitude
+            magnitude = self.conversion_plan.to_base_magnitude(quantity)
         else:
             magnitude = value
 
@@ -167,6 +297,47 @@ class QuantityFieldMixin:
                 f"Field '{self.name}' expected a number but got {value!r}.",
             ) from e
 
+    def get_prep_values(self, values: Sequence[Any]) -> list[NUMBER_TYPE | None]:
+        """
+        Batch version of get_prep_value
+
+        Quantities are grouped by their unit, so every group is converted
+        with one precomputed factor instead of converting each value by itself.
+        """
+        return [
+            self.get_prep_value(magnitude)
+            for magnitude in self.get_base_magnitudes(values)
+        ]
+
+    def get_base_magnitudes(self, values: Sequence[Any]) -> list:
+        """
+        Replace the quantities of values by their magnitude in base units,
+        converted in batches per unit like get_prep_values
+
+        Unlike get_prep_values the magnitudes are not converted to the number
+        type of the field, so the fractions are kept for integer fields.
+        """
+        magnitudes = list(values)
+        groups: dict[Any, list[int]] = {}
+        for index, value in enumerate(magnitudes):
+            if not isinstance(value, Quantity):
+                continue
+            quantity = self.fix_unit_registry(value)
+            magnitude = quantity.magnitude
+            if type(magnitude) is float or type(magnitude) is int:
+                groups.setdefault(quantity.units, []).append(index)
+                magnitudes[index] = magnitude
+            else:
+                magnitudes[index] = self.conversion_plan.to_base_magnitude(quantity)
+
+        for unit, indexes in groups.items():
+            converted = self.conversion_plan.to_base_magnitudes(
+                [magnitudes[index] for index in indexes], unit
+            )
+            for index, magnitude in zip(indexes, converted, strict=True):
+                magnitudes[index] = magnitude
+        return magnitudes
+
     def get_db_prep_value(self, value, connection, prepared=False):
         """
         Convert value to database-compatible format.
@@ -182,10 +353,13 @@ class QuantityFieldMixin:
         value = self.value_from_object(obj)
         return str(self.get_prep_value(value))
 
-    def from_db_value(self, value: Any, *args, **kwargs) -> Quantity | None:
-        if value is None:
-            return None
-        return self.ureg.Quantity(value, getattr(self.ureg, self.base_units))
+    def from_db_value(
+        self, value: Any, *args, **kwargs
+    ) -> Quantity | NUMBER_TYPE | None:
+        if value is None or self.lazy:
+            # Lazy fields are converted to a quantity by the descriptor
+            return value
+        return self.ureg.Quantity(value, self.conversion_plan.base_unit)
 
     def to_python(self, value) -> Quantity | None:
         if isinstance(value, Quantity):
@@ -202,7 +376,7 @@ class QuantityFieldMixin:
 
         value = cast(NUMBER_TYPE, to_number(value))
 
-        return self.ureg.Quantity(value, getattr(self.ureg, self.base_units))
+        return self.ureg.Quantity(value, self.conversion_plan.base_unit)
 
     def clean(self, value, model_instance) -> Quantity:
         """
@@ -234,8 +408,15 @@ class QuantityFormFieldMixin:
     """This formfield allows a user to choose which units they
     wish to use to enter a value, but the value is yielded in
     the base_units
+
+    With ``text_input=True`` the value is entered as text like ``5 lb``.
+    With ``autocomplete=True`` the unit is entered in a text input suggesting
+    all units with the dimensionality of the base units, which are accepted.
     """
 
+    # Parsed unit texts of all text input form fields
+    unit_parse_cache = UnitParseCache()
+
     to_number_type: Callable[[Any], NUMBER_TYPE]
 
     # TODO: Move these stuff into an Protocol or anything
@@ -247,7 +428,7 @@ class QuantityFormFieldMixin:
     localize: bool
 
     def __init__(self, *args, **kwargs):
-        self.ureg = ureg
+        self.ureg = get_unit_registry()
         self.base_units = kwargs.pop("base_units", None)
         if self.base_units is None:
             raise ValueError(
@@ -259,6 +440,19 @@ class QuantityFormFieldMixin:
             self.units.append(self.base_units)
 
         check_matching_unit_dimension(self.ureg, self.base_units, self.units)
+        # Resolved when the form field is declared, so the copies made for
+        # every form instance share it
+        self.allowed_units = frozenset(
+            getattr(self.ureg, units) for units in self.units
+        )
+        self.text_input = kwargs.pop("text_input", False)
+        self.autocomplete = kwargs.pop("autocomplete", False)
+        if self.text_input and self.autocomplete:
+            raise ValueError("text_input and autocomplete can't be used together.")
+        if self.autocomplete:
+            # Build the index of the units when the form field is declared,
+            # the autocomplete view only answers for registered base units
+            register_unit_index(self.ureg, self.base_units)
 
         def is_special_admin_widget(widget) -> bool:
             """
@@ -290,7 +484,14 @@ class QuantityFormFieldMixin:
 
         widget = kwargs.get("widget")
         if widget is None or is_special_admin_widget(widget):
-            widget = QuantityWidget(base_units=self.base_units, unit_choices=self.units)
+            if self.text_input:
+                widget = QuantityTextInput(base_units=self.base_units)
+            elif self.autocomplete:
+                widget = QuantityAutocompleteWidget(base_units=self.base_units)
+            else:
+                widget = QuantityWidget(
+                    base_units=self.base_units, unit_choices=self.units
+                )
         kwargs["widget"] = widget
         super().__init__(*args, **kwargs)
 
@@ -308,6 +509,8 @@ class QuantityFormFieldMixin:
         if isinstance(value, list) or isinstance(value, tuple):
             val = value[0]
             units = value[1]
+        elif self.text_input and isinstance(value, str) and value.strip():
+            return self.clean_text(value)
         else:
             # If no multi widget is used
             val = value
@@ -319,7 +522,9 @@ class QuantityFormFieldMixin:
             self.run_validators(None)
             return None
 
-        if units not in self.units:
+        if units not in self.units and not (
+            self.autocomplete and units in self.unit_index
+        ):
             raise ValidationError(_("%(units)s is not a valid choice") % locals())
 
         if self.localize:
@@ -337,6 +542,61 @@ class QuantityFormFieldMixin:
         self.run_validators(val.magnitude)
         return val
 
+    @cached_property
+    def unit_index(self) -> UnitPrefixIndex:
+        """
+        Index of the units with the dimensionality of the base units, which
+        are accepted with autocomplete=True
+        """
+        return register_unit_index(self.ureg, self.base_units)
+
+    @cached_property
+    def base_dimensionality(self):
+        return getattr(self.ureg, self.base_units).dimensionality
+
+    def parse_unit(self, text: str):
+        """
+        Return the unit of a text input, using the shared cache of parsed units
+        :raise ValidationError: if the unit is unknown, malformed or not a
+            unit choice
+        """
+        try:
+            unit = self.unit_parse_cache.parse(self.ureg, text)
+        except (PintError, ValueError):
+            raise ValidationError(
+                _("%(units)s is not a valid unit") % {"units": text}
+            ) from None
+        # The dimensionality of the unit choices is already checked
+        if unit in self.allowed_units:
+            return unit
+        if unit.dimensionality != self.base_dimensionality:
+            raise ValidationError(
+                _("%(units)s can not be converted to %(base_units)s")
+                % {"units": text, "base_units": self.base_units}
+            )
+        raise ValidationError(_("%(units)s is not a valid choice") % {"units": text})
+
+    def clean_text(self, value: str) -> Quantity:
+        """
+        Clean a quantity given as text like ``5 lb``, numbers without unit
+        are given in base units
+        """
+        if self.localize:
+            value = formats.sanitize_separators(value)
+        try:
+            val, units = split_quantity(value)
+            val = self.to_number_type(val)
+        except (ValueError, TypeError):
+            raise ValidationError(
+                self.error_messages["invalid"], code="invalid"
+            ) from None
+        unit = self.parse_unit(units) if units else getattr(self.ureg, self.base_units)
+
+        val = self.ureg.Quantity(val, unit).to(self.base_units)
+        self.validate(val.magnitude)
+        self.run_validators(val.magnitude)
+        return val
+
 
 class QuantityFormField(QuantityFormFieldMixin, forms.FloatField):
     to_number_type = float
@@ -429,8 +689,531 @@ class DecimalQuantityField(QuantityFieldMixin, models.DecimalField):
         if isinstance(value, BaseExpression):
             return value
 
-        converted = self.to_python(value)
-        magnitude = self.get_prep_value(converted)
+        if isinstance(value, Quantity):
+            magnitude = self.get_prep_value(self.to_python(value))
+        else:
+            # Plain numbers are already given in base units, so there is no
+            # need to create a quantity
+            magnitude = self.get_prep_value(models.DecimalField.to_python(self, value))
         return connection.ops.adapt_decimalfield_value(
             magnitude, self.max_digits, self.decimal_places
         )
+
+
+class QuantityWithUnitDescriptor(DeferredAttribute):
+    """
+    Descriptor of QuantityWithUnitField
+
+    Assigned quantities are split into their magnitude and unit code,
+    which are stored in the companion fields.
+    """
+
+    def __set__(self, instance, value):
+        data = instance.__dict__
+        # Like ImageFileDescriptor, the companion fields are not touched while
+        # Model.__init__ runs, so deferred companion fields stay deferred.
+        # After __init__ the field or its companions are part of the __dict__
+        # or the instance was loaded from the database.
+        initialized = (
+            self.field.attname in data
+            or self.field.magnitude_attname in data
+            or not instance._state.adding
+        )
+        data[self.field.attname] = value
+        if initialized:
+            self.field.set_unit_fields(instance, value)
+
+
+class QuantityWithUnitField(QuantityField):
+    """
+    A quantity field keeping the unit the value was given in
+
+    The field itself stores the magnitude in base units, so filters and
+    ordering use this (by default indexed) column, even if values are stored
+    in different units.
+    The original magnitude and the unit code are stored in the additional
+    fields ``<name>_magnitude`` and ``<name>_unit``.
+    By default the code is the index of the unit within ``unit_choices``,
+    so only append new units to ``unit_choices``.
+    """
+
+    descriptor_class = QuantityWithUnitDescriptor
+
+    def __init__(
+        self,
+        base_units: str,
+        *args,
+        unit_table: UnitTable | str | Sequence[str] | None = None,
+        **kwargs,
+    ):
+        """
+        :param unit_table: Table of interned units used to encode the units,
+            given as name of the setting listing the units, i.e.
+            ``"DJANGO_PINT_UNIT_CODES"``, as list of units or as UnitTable.
+            Defaults to a table of the unit_choices.
+        :raise ValueError: if the base unit is not part of the unit_table
+        """
+        if kwargs.get("lazy"):
+            raise ValueError("QuantityWithUnitField does not support lazy=True.")
+        kwargs.setdefault("db_index", True)
+        super().__init__(base_units, *args, **kwargs)
+        self.has_default_unit_table = unit_table is None
+        if unit_table is None:
+            unit_table = UnitTable(self.ureg, self.unit_choices)
+        elif isinstance(unit_table, str):
+            unit_table = get_unit_table(unit_table)
+        elif not isinstance(unit_table, UnitTable):
+            unit_table = UnitTable(self.ureg, unit_table)
+        self.unit_table = unit_table
+        base_unit_code = unit_table.get_code(self.conversion_plan.base_unit)
+        if base_unit_code is None:
+            raise ValueError(
+                f"The base unit {self.base_units} is not part of the unit table."
+            )
+        self.base_unit_code = base_unit_code
+
+    def deconstruct(self):
+        name, path, args, kwargs = super().deconstruct()
+        if not self.has_default_unit_table:
+            # Historical models decode the codes with the same table, tables of
+            # a setting are referenced by the name of the setting
+            table = self.unit_table
+            kwargs["unit_table"] = table.setting or [str(unit) for unit in table.units]
+        return name, path, args, kwargs
+
+    @property
+    def magnitude_attname(self) -> str:
+        return f"{self.name}_magnitude"
+
+    @property
+    def unit_code_attname(self) -> str:
+        return f"{self.name}_unit"
+
+    def contribute_to_class(self, cls, name, *args, **kwargs):
+        super().contribute_to_class(cls, name, *args, **kwargs)
+        # Models of the migration state already contain the companion fields
+        if cls._meta.abstract or cls.__module__ == "__fake__":
+            return
+        cls.add_to_class(
+            self.magnitude_attname, models.FloatField(null=True, editable=False)
+        )
+        cls.add_to_class(
+            self.unit_code_attname,
+            models.PositiveSmallIntegerField(null=True, editable=False),
+        )
+        # Like ImageField, the companion fields are only final after __init__
+        signals.post_init.connect(self.update_from_unit_fields, sender=cls)
+
+    def set_unit_fields(self, instance, value) -> None:
+        """
+        Store magnitude and unit code of value in the companion fields
+
+        Units that are not part of the unit choices are stored in base units.
+        """
+        data = instance.__dict__
+        if isinstance(value, Quantity):
+            value = self.fix_unit_registry(value)
+            code = self.unit_table.get_code(value.units)
+            if code is None:
+                data[self.magnitude_attname] = self.get_prep_value(value)
+                data[self.unit_code_attname] = self.base_unit_code
+            else:
+                data[self.magnitude_attname] = value.magnitude
+                data[self.unit_code_attname] = code
+        elif value is None or hasattr(value, "resolve_expression"):
+            data[self.magnitude_attname] = None
+            data[self.unit_code_attname] = None
+        else:
+            data[self.magnitude_attname] = value
+            data[self.unit_code_attname] = self.base_unit_code
+
+    def update_from_unit_fields(self, instance, **kwargs) -> None:
+        """
+        Restore the original unit of instances loaded from the database
+
+        Instances created with a value get their companion fields set.
+        The value of the field itself is authoritative, so companion fields
+        not matching it, i.e. after ``QuerySet.update()`` of the field, are
+        replaced. Deferred companion fields are left deferred.
+        """
+        data = instance.__dict__
+        if (
+            self.attname not in data
+            or self.magnitude_attname not in data
+            or self.unit_code_attname not in data
+        ):
+            return
+        magnitude = data[self.magnitude_attname]
+        code = data[self.unit_code_attname]
+        value = data[self.attname]
+        if magnitude is None or code is None or value is None:
+            self.set_unit_fields(instance, value)
+            return
+        try:
+            original = self.unit_table.decode(magnitude, code)
+        except ValueError:
+            # Unknown unit code
+            self.set_unit_fields(instance, value)
+            return
+        if math.isclose(
+            self.get_prep_value(original), self.get_prep_value(value), rel_tol=1e-9
+        ):
+            data[self.attname] = original
+        else:
+            self.set_unit_fields(instance, value)
+
+
+class QuantityArrayField(QuantityFieldMixin, models.BinaryField):
+    """
+    A quantity field storing a one dimensional array as packed binary blob
+
+    The blob starts with a header containing the dtype, the length and the
+    unit of the values, followed by the little endian float64 or int64 values.
+    Values are decoded without copying the data, so the magnitude of loaded
+    quantities is a read-only numpy array. Requires numpy.
+    """
+
+    # magic, version, dtype, length, length of the unit string
+    HEADER = struct.Struct("<2sBcQH")
+    MAGIC = b"QA"
+    VERSION = 1
+    DTYPES = {b"f": "<f8", b"i": "<i8"}
+    # The values start at a multiple of ALIGNMENT bytes
+    ALIGNMENT = 8
+
+    def __init__(self, base_units: str, *args, **kwargs):
+        if kwargs.get("lazy"):
+            raise ValueError("QuantityArrayField does not support lazy=True.")
+        super().__init__(base_units, *args, **kwargs)
+        # Units of the stored blobs by their name
+        self._stored_units: dict[str, Any] = {}
+
+    @property
+    def np(self) -> ModuleType:
+        # Imported on use, so models can be loaded without numpy
+        return import_numpy()
+
+    def pack(self, magnitude: Any) -> bytes:
+        """
+        Pack an array of magnitudes given in base units as binary blob
+        :raise ValueError: if the array is not one dimensional
+        """
+        np = self.np
+        array = np.asarray(magnitude)
+        if array.ndim != 1:
+            raise ValueError(
+                f"Field '{self.name}' expected a one dimensional array "
+                f"but got {array.ndim} dimensions."
+            )
+        dtype_code = b"i" if array.dtype.kind in "biu" else b"f"
+        array = array.astype(self.DTYPES[dtype_code], copy=False)
+        unit = str(self.conversion_plan.base_unit).encode()
+        header = self.HEADER.pack(
+            self.MAGIC, self.VERSION, dtype_code, len(array), len(unit)
+        )
+        padding = -(len(header) + len(unit)) % self.ALIGNMENT
+        return b"".join((header, unit, b"\0" * padding, array.tobytes()))
+
+    def unpack(self, blob: bytes | memoryview) -> Quantity:
+        """
+        Decode a binary blob into an array backed quantity in base units
+        :raise ValueError: if the blob has an unknown format
+        """
+        magic, version, dtype_code, length, unit_length = self.HEADER.unpack_from(blob)
+        if magic != self.MAGIC or version != self.VERSION:
+            raise ValueError(f"Field '{self.name}' got an unknown array format.")
+        start = self.HEADER.size
+        unit_name = bytes(blob[start : start + unit_length]).decode()
+        offset = start + unit_length
+        offset += -offset % self.ALIGNMENT
+        array = self.np.frombuffer(
+            blob, dtype=self.DTYPES[dtype_code], count=length, offset=offset
+        )
+        unit = self._stored_units.get(unit_name)
+        if unit is None:
+            unit = self._stored_units[unit_name] = self.ureg.Unit(unit_name)
+        if unit == self.conversion_plan.base_unit:
+            return self.ureg.Quantity(array, self.conversion_plan.base_unit)
+        # The base units were changed after the values had been stored
+        return self.ureg.Quantity(
+            self.base_magnitudes(array, unit), self.conversion_plan.base_unit
+        )
+
+    def base_magnitudes(self, array: Any, unit: Any) -> Any:
+        """
+        Convert an array of magnitudes given in unit into the base unit
+        """
+        factors = self.conversion_plan.get_factors(unit)
+        if factors is None:
+            return self.ureg.Quantity(array, unit).to(self.base_units).magnitude
+        factor, offset = factors
+        if factor == 1 and offset == 0:
+            return array
+        return array * factor + offset
+
+    def get_prep_value(self, value: Any) -> bytes | None:
+        if value is None or isinstance(value, (bytes, memoryview)):
+            return value
+        if isinstance(value, Quantity):
+            quantity = self.fix_unit_registry(value)
+            magnitude = self.base_magnitudes(
+                self.np.asarray(quantity.magnitude), quantity.units
+            )
+        else:
+            magnitude = value
+        return self.pack(magnitude)
+
+    def get_db_prep_value(self, value, connection, prepared=False):
+        # Let the BinaryField wrap the blob for the database
+        return models.BinaryField.get_db_prep_value(self, value, connection, prepared)
+
+    def value_to_string(self, obj) -> str:
+        return b64encode(self.get_prep_value(self.value_from_object(obj))).decode(
+            "ascii"
+        )
+
+    def from_db_value(self, value: Any, *args, **kwargs) -> Quantity | None:
+        if value is None:
+            return None
+        return self.unpack(value)
+
+    def to_python(self, value) -> Quantity | None:
+        if isinstance(value, Quantity):
+            return self.fix_unit_registry(value)
+        if value is None:
+            return None
+        if isinstance(value, str):
+            # Serialized values are base64 encoded
+            value = b64decode(value.encode("ascii"))
+        if isinstance(value, (bytes, memoryview)):
+            return self.unpack(value)
+        return self.ureg.Quantity(
+            self.np.asarray(value), self.conversion_plan.base_unit
+        )
+
+    def formfield(self, **kwargs):
+        # There is no form field editing arrays
+        return models.BinaryField.formfield(self, **kwargs)
+
+
+class QuantityInterval(NamedTuple):
+    """
+    Closed interval of quantities, the value of a QuantityRangeField
+    """
+
+    lower: Quantity
+    upper: Quantity
+
+    def contains(self, value: "Quantity | QuantityInterval") -> bool:
+        if isinstance(value, QuantityInterval):
+            return self.lower <= value.lower and value.upper <= self.upper
+        return self.lower <= value <= self.upper
+
+    def overlaps(self, other: "QuantityInterval") -> bool:
+        return self.lower <= other.upper and other.lower <= self.upper
+
+
+class QuantityRangeDescriptor(DeferredAttribute):
+    """
+    Descriptor of QuantityRangeField
+
+    Keeps the companion field of the upper bound in sync with assigned
+    intervals.
+    """
+
+    def __set__(self, instance, value):
+        field = self.field
+        data = instance.__dict__
+        if isinstance(value, (tuple, list)):
+            value = field.to_interval(value)
+            data[field.upper_attname] = field.get_prep_value(value.upper)
+        elif value is None:
+            data[field.upper_attname] = None
+        elif field.upper_attname in data:
+            # The upper bound is set after the field while the instance is
+            # initialized, so the instance is already initialized
+            raise ValueError(
+                f"Field '{field.name}' expected an interval but got {value!r}."
+            )
+        # Otherwise it is the lower bound loaded from the database, which is
+        # combined with the upper bound after the instance was initialized
+        data[field.attname] = value
+
+
+class QuantityRangeField(QuantityFieldMixin, models.FloatField):
+    """
+    A field storing a closed interval of quantities, i.e. a tolerance
+
+    The lower bound is stored in the column of the field and the upper bound
+    in the additional field ``<name>_upper``, both in base units and covered
+    by one composite index.
+    The lookups ``exact``, ``overlaps``, ``contains`` and ``contained_by``
+    compare both columns with plain comparisons, so the index can be used.
+    Other lookups compare the lower bound.
+    Intervals can only be assigned in QuerySet.update() of a QuantityQuerySet,
+    which also updates the upper bound.
+    The field has no form field, so it's not part of model forms.
+    """
+
+    descriptor_class = QuantityRangeDescriptor
+    to_number_type = float
+
+    class_lookups = {lookup.lookup_name: lookup for lookup in INTERVAL_LOOKUPS}
+
+    def __init__(self, base_units: str, *args, **kwargs):
+        if kwargs.get("lazy"):
+            raise ValueError("QuantityRangeField does not support lazy=True.")
+        super().__init__(base_units, *args, **kwargs)
+
+    @property
+    def upper_attname(self) -> str:
+        return f"{self.name}_upper"
+
+    @property
+    def upper_field(self) -> models.Field:
+        return self.model._meta.get_field(self.upper_attname)
+
+    def contribute_to_class(self, cls, name, *args, **kwargs):
+        super().contribute_to_class(cls, name, *args, **kwargs)
+        # Models of the migration state already contain the upper bound field
+        # and the index
+        if cls._meta.abstract or cls.__module__ == "__fake__":
+            return
+        cls.add_to_class(
+            self.upper_attname, models.FloatField(null=self.null, editable=False)
+        )
+        # Added like an index of Meta.indexes, so it's part of the migrations
+        cls._meta.indexes = [
+            *cls._meta.indexes,
+            models.Index(fields=[self.name, self.upper_attname]),
+        ]
+        cls._meta.original_attrs["indexes"] = cls._meta.indexes
+        signals.post_init.connect(self.update_from_upper_field, sender=cls)
+
+    def update_from_upper_field(self, instance, **kwargs) -> None:
+        """
+        Combine the bounds of instances loaded from the database or set
+        the upper bound of instances created with an interval
+        """
+        data = instance.__dict__
+        value = data.get(self.attname)
+        if isinstance(value, QuantityInterval):
+            data[self.upper_attname] = self.get_prep_value(value.upper)
+        elif value is not None and data.get(self.upper_attname) is not None:
+            data[self.attname] = QuantityInterval(
+                value,
+                self.ureg.Quantity(
+                    data[self.upper_attname], self.conversion_plan.base_unit
+                ),
+            )
+
+    def to_interval(self, value) -> QuantityInterval:
+        """
+        Convert a pair of bounds into a QuantityInterval
+        :raise ValueError: if the value is no pair of bounds
+        :raise ValidationError: if the lower bound is greater than the upper
+            bound
+        """
+        try:
+            lower, upper = value
+        except (TypeError, ValueError):
+            raise ValueError(
+                f"Field '{self.name}' expected an interval but got {value!r}."
+            ) from None
+        lower = super().to_python(lower)
+        upper = super().to_python(upper)
+        if lower is None or upper is None:
+            raise ValueError(
+                f"Field '{self.name}' expected an interval but got {value!r}."
+            )
+        if lower > upper:
+            raise ValidationError(
+                _(
+                    "The lower bound %(lower)s is greater than the upper bound "
+                    "%(upper)s."
+                ),
+                code="invalid_bounds",
+                params={"lower": lower, "upper": upper},
+            )
+        return QuantityInterval(lower, upper)
+
+    def get_prep_bounds(self, value, allow_point: bool = False) -> tuple:
+        """
+        Return the bounds of an interval, or of a single quantity if allowed,
+        in base units
+        """
+        if allow_point and not isinstance(value, (tuple, list)):
+            point = self.get_prep_value(value)
+            return point, point
+        interval = self.to_interval(value)
+        return self.get_prep_value(interval.lower), self.get_prep_value(interval.upper)
+
+    def lower_bound(self, value: Any) -> Any:
+        """
+        Return the lower bound of intervals, the value stored in the column
+        of the field; the upper bound is stored by the upper bound field
+        """
+        if isinstance(value, QuantityInterval):
+            return value.lower
+        return value
+
+    def pre_save(self, model_instance, add):
+        value = super().pre_save(model_instance, add)
+        if (
+            isinstance(value, Quantity)
+            and self.upper_attname in model_instance.__dict__
+        ):
+            # i.e. a single quantity passed when the instance was created
+            raise ValueError(
+                f"Field '{self.name}' expected an interval but got {value!r}."
+            )
+        return self.lower_bound(value)
+
+    def get_prep_values(self, values: Sequence[Any]) -> list[NUMBER_TYPE | None]:
+        return super().get_prep_values([self.lower_bound(value) for value in values])
+
+    def get_prep_value(self, value: Any) -> NUMBER_TYPE | None:
+        """
+        :raise ValueError: if the value is an interval, which needs to update
+            the upper bound field as well
+        """
+        if isinstance(value, (QuantityInterval, tuple, list)):
+            raise ValueError(
+                f"Field '{self.name}' can't store the interval {value!r} in one "
+                f"column. Update '{self.name}' and '{self.upper_attname}' "
+                "together with QuantityQuerySet.update()."
+            )
+        return super().get_prep_value(value)
+
+    def value_to_string(self, obj) -> str:
+        return str(self.get_prep_value(self.lower_bound(self.value_from_object(obj))))
+
+    def to_python(self, value) -> Quantity | QuantityInterval | None:
+        # Single values are the lower bound, i.e. of deserialized instances
+        if isinstance(value, (tuple, list)):
+            return self.to_interval(value)
+        return super().to_python(value)
+
+    def clean(self, value, model_instance) -> QuantityInterval | None:
+        """
+        Validate an interval, the validators are run for both bounds
+        """
+        try:
+            value = self.to_python(value)
+        except ValueError as e:
+            raise ValidationError(str(e), code="invalid") from e
+        if value is not None and not isinstance(value, QuantityInterval):
+            raise ValidationError(
+                _("Enter an interval of a lower and an upper bound."),
+                code="invalid",
+            )
+        self.validate(value, model_instance)
+        if value is not None:
+            for bound in value:
+                self.run_validators(self.get_prep_value(bound))
+        return value
+
+    def formfield(self, **kwargs):
+        # There is no form field for intervals, the field is left out of
+        # model forms
+        return None
@@ -1,4 +1,48 @@
-from pint import DimensionalityError, UnitRegistry
+import bisect
+import functools
+import re
+import threading
+from collections import OrderedDict
+from collections.abc import Iterable
+from types import ModuleType
+from typing import Any
+from weakref import WeakKeyDictionary
+
+from pint import DimensionalityError, PintError, Quantity, Unit, UnitRegistry
+
+
+def import_numpy() -> ModuleType:
+    """
+    Import numpy, which is an optional dependency of django-pint
+    :raise ImportError: if numpy is not installed
+    """
+    try:
+        import numpy
+    except ImportError as e:
+        raise ImportError(
+            "This feature of django-pint requires numpy. "
+            "Install it with 'pip install django-pint[numpy]'."
+        ) from e
+    return numpy
+
+
+@functools.cache
+def optional_numpy() -> ModuleType | None:
+    """
+    Return numpy if it is installed, otherwise None
+    """
+    try:
+        import numpy
+    except ImportError:
+        return None
+    return numpy
+
+
+# Combinations of base units and unit choices already known to be matching,
+# stored per unit registry
+_matching_unit_dimensions: WeakKeyDictionary[
+    UnitRegistry, set[tuple[str, frozenset[str]]]
+] = WeakKeyDictionary()
 
 
 def check_matching_unit_dimension(
@@ -8,15 +52,556 @@ def check_matching_unit_dimension(
     Check if all units_to_check have the same Dimension like the base_units
     If not
     :raise DimensionalityError
+
+    Successful checks are cached per unit registry, unless a unit could only
+    be converted within a pint context.
+    Call clear_matching_unit_dimension_cache if units of the registry are
+    redefined.
     """
+    key = (base_units, frozenset(units_to_check))
+    checked = _matching_unit_dimensions.get(ureg)
+    if checked is not None and key in checked:
+        return
+
     base_unit = getattr(ureg, base_units)
     # create a pint quantity by multiplying unit with magnitude of 1
     base_quant = 1 * base_unit
+    depends_on_context = False
 
     for unit_string in units_to_check:
         unit = getattr(ureg, unit_string)
+        if unit.dimensionality == base_unit.dimensionality:
+            continue
         # try to convert base qunatity to new unit, this also work for ureg.context
         try:
             base_quant.to(unit)
         except DimensionalityError as e:
             raise DimensionalityError(base_unit, unit) from e
+        depends_on_context = True
+
+    if not depends_on_context:
+        _matching_unit_dimensions.setdefault(ureg, set()).add(key)
+
+
+def clear_matching_unit_dimension_cache(ureg: UnitRegistry | None = None) -> None:
+    """
+    Forget the cached results of check_matching_unit_dimension for the given
+    unit registry or for all registries if None is given
+    """
+    if ureg is None:
+        _matching_unit_dimensions.clear()
+    else:
+        _matching_unit_dimensions.pop(ureg, None)
+
+
+# Magnitude at the start of a quantity text, the rest is the unit text
+QUANTITY_RE = re.compile(
+    r"\s*(?P<magnitude>[-+]?(?:\d+(?:\.\d*)?|\.\d+)(?:[eE][-+]?\d+)?)\s*(?P<unit>.*?)\s*"
+)
+
+
+def split_quantity(text: str) -> tuple[str, str]:
+    """
+    Split a quantity like ``"12.5 kg"`` into the magnitude and the unit text
+    :raise ValueError: if the text does not start with a number
+    """
+    match = QUANTITY_RE.fullmatch(text)
+    if match is None:
+        raise ValueError(f"'{text}' is not a quantity.")
+    return match["magnitude"], match["unit"]
+
+
+def has_active_contexts(ureg: UnitRegistry) -> bool:
+    """
+    Return if a pint context is enabled in the unit registry, which may
+    redefine units or add conversions
+    """
+    # pint has no public API for the active contexts. Registries without
+    # the attribute are treated like having active contexts, so that all
+    # conversions are left to pint.
+    active = getattr(ureg, "_active_ctx", None)
+    return active is None or bool(getattr(active, "contexts", True))
+
+
+def get_root_conversion(ureg: UnitRegistry, unit: Unit) -> tuple[float, float] | None:
+    """
+    Return scale and offset converting the unit into its root units, derived
+    from the converters of the unit definitions.
+    Return None if the conversion is not linear, i.e. for logarithmic units,
+    or if the unit definitions can't be read from this version of pint.
+    """
+    # The unit definitions are internals of pint, which may change
+    try:
+        units = unit._units
+        non_multiplicative = [
+            name for name in units if not ureg._is_multiplicative(name)
+        ]
+        if not non_multiplicative:
+            return ureg.get_root_units(unit)[0], 0
+        # Like pint, only a single offset unit without exponent is converted
+        name = non_multiplicative[0]
+        if len(units) != 1 or units[name] != 1:
+            return None
+        definition = ureg._units[name]
+    except (AttributeError, KeyError, TypeError):
+        return None
+    converter = getattr(definition, "converter", None)
+    if (
+        getattr(converter, "is_logarithmic", False)
+        or not hasattr(converter, "offset")
+        or not hasattr(definition, "reference")
+    ):
+        return None
+    reference_scale, _ = ureg.get_root_units(definition.reference)
+    return converter.scale * reference_scale, converter.offset * reference_scale
+
+
+class UnitConversionPlan:
+    """
+    Resolved base unit and linear conversion factors of a quantity field
+
+    Units are resolved once on creation, so that loading and saving values
+    does not need to parse or look up units again.
+    For every known unit the factor and offset are stored, so that
+    ``base_magnitude = magnitude * factor + offset``.
+    Units that are only convertible within a pint context or whose
+    conversion is not linear, like logarithmic units, are not stored.
+    They will always be converted by pint. While a pint context is enabled,
+    which may redefine units, all conversions are done by pint as well.
+    """
+
+    # Upper limit of units stored additionally to the unit choices
+    MAX_FACTORS = 128
+    # Minimal number of magnitudes to be converted with numpy
+    VECTORIZE_MIN_SIZE = 64
+
+    def __init__(
+        self, ureg: UnitRegistry, base_units: str, unit_choices: list[str]
+    ) -> None:
+        self.ureg = ureg
+        self.base_unit: Unit = getattr(ureg, base_units)
+        self.factors: dict[Unit, tuple[float, float]] = {}
+        for unit_string in unit_choices:
+            self.get_factors(getattr(ureg, unit_string))
+
+    @functools.cached_property
+    def base_conversion(self) -> tuple[float, float] | None:
+        # Only resolved outside of pint contexts, see get_factors
+        return get_root_conversion(self.ureg, self.base_unit)
+
+    def get_factors(self, unit: Unit) -> tuple[float, float] | None:
+        """
+        Return the factor and offset to convert from unit into the base unit.
+        Return None if the conversion depends on a pint context or is not
+        linear.
+        """
+        # Contexts may redefine units, the factors are the ones without context
+        if has_active_contexts(self.ureg):
+            return None
+        try:
+            return self.factors[unit]
+        except KeyError:
+            pass
+        if (
+            self.base_conversion is None
+            or unit.dimensionality != self.base_unit.dimensionality
+        ):
+            return None
+        conversion = get_root_conversion(self.ureg, unit)
+        if conversion is None:
+            return None
+        scale, offset = conversion
+        base_scale, base_offset = self.base_conversion
+        factor = scale / base_scale
+        offset = (offset - base_offset) / base_scale
+        if len(self.factors) < self.MAX_FACTORS:
+            self.factors[unit] = (factor, offset)
+        return factor, offset
+
+    def to_base_magnitude(self, quantity: Quantity) -> Any:
+        """
+        Return the magnitude of the quantity converted into the base unit
+        """
+        factors = self.get_factors(quantity.units)
+        magnitude = quantity.magnitude
+        if factors is None:
+            return quantity.to(self.base_unit).magnitude
+        factor, offset = factors
+        if factor == 1 and offset == 0:
+            return magnitude
+        if type(magnitude) is float or type(magnitude) is int:
+            return magnitude * factor + offset
+        # Let pint handle special number types like Decimal
+        return quantity.to(self.base_unit).magnitude
+
+    def to_base_magnitudes(self, magnitudes: list[int | float], unit: Unit) -> list:
+        """
+        Convert int or float magnitudes, all given in the same unit, into the
+        base unit at once.
+        Large lists are converted vectorized if numpy is installed.
+        """
+        factors = self.get_factors(unit)
+        if factors is None:
+            return [
+                self.ureg.Quantity(magnitude, unit).to(self.base_unit).magnitude
+                for magnitude in magnitudes
+            ]
+        factor, offset = factors
+        if factor == 1 and offset == 0:
+            return list(magnitudes)
+        np = optional_numpy()
+        if np is not None and len(magnitudes) >= self.VECTORIZE_MIN_SIZE:
+            array = np.asarray(magnitudes, dtype=np.float64)
+            return (array * factor + offset).tolist()
+        return [magnitude * factor + offset for magnitude in magnitudes]
+
+
+class ForeignUnitCache:
+    """
+    Bounded, thread safe cache translating units of a different UnitRegistry
+    into the units of our registry
+
+    Units are translated by name, so it is assumed that both registries use
+    the same naming.
+    """
+
+    def __init__(self, maxsize: int = 256) -> None:
+        self.maxsize = maxsize
+        self._lock = threading.Lock()
+        self._units: OrderedDict[tuple, Unit] = OrderedDict()
+
+    def translate(self, ureg: UnitRegistry, unit: Unit) -> tuple[Unit, bool]:
+        """
+        Return the unit of ureg matching the foreign unit and if the unit
+        was translated for the first time
+        """
+        # The unit class is specific to its registry, so units with the same
+        # name but from different registries are stored separately
+        key = (ureg, type(unit), unit)
+        with self._lock:
+            try:
+                translated = self._units[key]
+            except KeyError:
+                pass
+            else:
+                self._units.move_to_end(key)
+                return translated, False
+
+        translated = ureg.Unit(str(unit))
+        with self._lock:
+            is_new = key not in self._units
+            self._units[key] = translated
+            if len(self._units) > self.maxsize:
+                self._units.popitem(last=False)
+        return translated, is_new
+
+    def clear(self) -> None:
+        with self._lock:
+            self._units.clear()
+
+
+class UnitParseCache:
+    """
+    Bounded, thread safe LRU cache of parsed unit texts, i.e. ``"kg"``
+
+    Texts that can't be parsed are not stored.
+    """
+
+    def __init__(self, maxsize: int = 256) -> None:
+        self.maxsize = maxsize
+        self._lock = threading.Lock()
+        self._units: OrderedDict[tuple, Unit] = OrderedDict()
+
+    def parse(self, ureg: UnitRegistry, text: str) -> Unit:
+        """
+        Return the unit of ureg described by text
+        :raise UndefinedUnitError: if the unit is not defined
+        :raise ValueError: if the text is no valid unit expression
+        """
+        key = (ureg, text)
+        with self._lock:
+            try:
+                unit = self._units[key]
+            except KeyError:
+                pass
+            else:
+                self._units.move_to_end(key)
+                return unit
+
+        try:
+            unit = ureg.Unit(text)
+        except PintError:
+            raise
+        except Exception as e:
+            # The parser of pint raises all kinds of errors for malformed
+            # texts, i.e. ZeroDivisionError, TokenError or AssertionError
+            raise ValueError(f"'{text}' is no valid unit expression.") from e
+        with self._lock:
+            self._units[key] = unit
+            if len(self._units) > self.maxsize:
+                self._units.popitem(last=False)
+        return unit
+
+    def clear(self) -> None:
+        with self._lock:
+            self._units.clear()
+
+    def __len__(self) -> int:
+        return len(self._units)
+
+
+class UnitTable:
+    """
+    Thread safe, bidirectional table of interned units and small integer codes
+
+    The code of a unit is its position within the table, so units may only
+    be appended to keep already stored codes valid.
+    Instead of the unit string, fields and serializers can store or transmit
+    the code of a unit.
+    """
+
+    # Name of the setting listing the units, if created by get_unit_table()
+    setting: str | None = None
+
+    def __init__(self, ureg: UnitRegistry, units: Iterable[str | Unit] = ()) -> None:
+        self.ureg = ureg
+        self._lock = threading.Lock()
+        self._units: list[Unit] = []
+        self._codes: dict[Unit, int] = {}
+        # Unit strings already parsed, so they are only parsed once
+        self._names: dict[str, int] = {}
+        for unit in units:
+            self.intern(unit)
+
+    def __len__(self) -> int:
+        return len(self._units)
+
+    def __contains__(self, unit: str | Unit) -> bool:
+        return self.get_code(unit) is not None
+
+    @property
+    def units(self) -> tuple[Unit, ...]:
+        return tuple(self._units)
+
+    def _parse(self, unit: str | Unit) -> Unit:
+        if isinstance(unit, str):
+            return self.ureg.Unit(unit)
+        if getattr(unit, "_REGISTRY", None) is self.ureg:
+            return unit
+        # Unit of a different registry
+        return self.ureg.Unit(str(unit))
+
+    def intern(self, unit: str | Unit) -> int:
+        """
+        Return the code of unit, adding the unit to the table if required
+        """
+        code = self.get_code(unit)
+        if code is not None:
+            return code
+        parsed = self._parse(unit)
+        with self._lock:
+            code = self._codes.get(parsed)
+            if code is None:
+                code = len(self._units)
+                self._units.append(parsed)
+                self._codes[parsed] = code
+            if isinstance(unit, str):
+                self._names[unit] = code
+        return code
+
+    def get_code(self, unit: str | Unit) -> int | None:
+        """
+        Return the code of unit or None if it is not part of the table
+        """
+        if isinstance(unit, str):
+            code = self._names.get(unit)
+            if code is None:
+                code = self._codes.get(self._parse(unit))
+                if code is not None:
+                    self._names[unit] = code
+            return code
+        # Units of different registries can't be compared with our units
+        return self._codes.get(self._parse(unit))
+
+    def get_unit(self, code: int) -> Unit:
+        """
+        Return the unit of code
+        :raise ValueError: if the code is not part of the table
+        """
+        if code < 0 or code >= len(self._units):
+            raise ValueError(f"Unknown unit code {code}.")
+        return self._units[code]
+
+    def encode(self, value: Quantity) -> tuple[Any, int]:
+        """
+        Return the magnitude and unit code of a quantity
+        :raise ValueError: if the unit is not part of the table
+        """
+        code = self.get_code(value.units)
+        if code is None:
+            raise ValueError(f"Unit {value.units} is not part of the unit table.")
+        return value.magnitude, code
+
+    def decode(self, magnitude: Any, code: int) -> Quantity:
+        """
+        Return the quantity of a magnitude and unit code
+        """
+        return self.ureg.Quantity(magnitude, self.get_unit(code))
+
+
+class UnitPrefixIndex:
+    """
+    Sorted index of unit texts (names, aliases, symbols and prefixed units)
+    for autocompletion
+
+    Queries are answered by bisection of the sorted texts without calling
+    into pint. Units without prefix are suggested before prefixed units.
+    """
+
+    def __init__(
+        self,
+        entries: Iterable[tuple[str, str]],
+        prefixed_entries: Iterable[tuple[str, str]] = (),
+    ) -> None:
+        """
+        :param entries: Pairs of unit text and the name of its unit
+        :param prefixed_entries: Pairs of prefixed unit texts and unit names
+        """
+        # unit name of every known text, for exact lookups
+        self.units: dict[str, str] = {}
+        self._tables: list[tuple[list[str], list[tuple[str, str, str]]]] = []
+        for group in (entries, prefixed_entries):
+            rows = []
+            for text, unit in group:
+                if text and text not in self.units:
+                    self.units[text] = unit
+                    rows.append((text.casefold(), text, unit))
+            rows.sort()
+            self._tables.append(([row[0] for row in rows], rows))
+
+    def __len__(self) -> int:
+        return len(self.units)
+
+    def __contains__(self, text: str) -> bool:
+        return text in self.units
+
+    def search(self, query: str, limit: int = 10) -> list[tuple[str, str]]:
+        """
+        Return up to limit pairs of unit text and unit name, whose text
+        starts with the query, ignoring the case
+        """
+        query = query.strip().casefold()
+        results: list[tuple[str, str]] = []
+        for keys, rows in self._tables:
+            index = bisect.bisect_left(keys, query)
+            while len(results) < limit and index < len(keys):
+                key, text, unit = rows[index]
+                if not key.startswith(query):
+                    break
+                results.append((text, unit))
+                index += 1
+        return results
+
+
+def get_unit_name(ureg: UnitRegistry, text: str) -> str | None:
+    try:
+        return ureg.get_name(text)
+    except (PintError, ValueError):
+        return None
+
+
+def get_prefixes(ureg: UnitRegistry) -> list[tuple[str, str]]:
+    """
+    Return the names and symbols of the prefixes of the registry
+    """
+    # pint has no public API for its prefixes, so they are read from the
+    # definitions. Without them, no prefixed units are suggested.
+    definitions = getattr(ureg, "_prefixes", {})
+    return [
+        (getattr(prefix, "name", ""), getattr(prefix, "symbol", "") or "")
+        for prefix in definitions.values()
+        if getattr(prefix, "name", "")
+    ]
+
+
+@functools.cache
+def build_unit_index(ureg: UnitRegistry, dimensionality: Any) -> UnitPrefixIndex:
+    """
+    Build the index of all units of the registry with the given dimensionality
+
+    Building an index is expensive, it is only called for the base units of
+    declared fields by register_unit_index.
+    """
+    # The registry lists the names, aliases and symbols of its units for
+    # autocompletion. get_compatible_units is not used, as it only knows
+    # units defined by the root units and would miss i.e. the pound.
+    texts = set(dir(ureg))
+    names: dict[str, list[str]] = {}
+    for text in texts:
+        # Other attributes of the registry are no units
+        name = get_unit_name(ureg, text)
+        if name is not None:
+            names.setdefault(name, []).append(text)
+    entries = []
+    prefixed_entries = []
+    prefixes = get_prefixes(ureg)
+    for name, unit_texts in names.items():
+        if ureg.get_dimensionality(name) != dimensionality:
+            continue
+        entries.extend((text, name) for text in unit_texts)
+        # pint returns the name of units without symbol
+        symbol = ureg.get_symbol(name)
+        if symbol == name:
+            symbol = ""
+        for prefix_name, prefix_symbol in prefixes:
+            unit = prefix_name + name
+            prefixed_entries.extend(
+                (prefix_name + text, unit) for text in unit_texts if text != symbol
+            )
+            if prefix_symbol and symbol:
+                prefixed_entries.append((prefix_symbol + symbol, unit))
+    # Only keep prefixed texts, which pint parses as the intended unit, i.e.
+    # "min" is a minute and not a milli inch. Offset units like degC can't be
+    # prefixed at all.
+    prefixed_entries = [
+        (text, unit)
+        for text, unit in prefixed_entries
+        if text not in texts and get_unit_name(ureg, text) == unit
+    ]
+    return UnitPrefixIndex(entries, prefixed_entries)
+
+
+# Indexes of the base units registered with register_unit_index, stored per
+# unit registry
+_unit_indexes: WeakKeyDictionary[UnitRegistry, dict[str, UnitPrefixIndex]] = (
+    WeakKeyDictionary()
+)
+_unit_indexes_lock = threading.Lock()
+
+
+def register_unit_index(ureg: UnitRegistry, base_units: str) -> UnitPrefixIndex:
+    """
+    Return the shared index of all units, which have the dimensionality of
+    the base units. The index is built if required and get_unit_index returns
+    it for the base units from now on.
+    Called by form fields declared with ``autocomplete=True``.
+    :raise UndefinedUnitError: if base_units is not defined
+    """
+    indexes = _unit_indexes.get(ureg)
+    if indexes is not None and base_units in indexes:
+        return indexes[base_units]
+    index = build_unit_index(ureg, ureg.get_dimensionality(base_units))
+    with _unit_indexes_lock:
+        _unit_indexes.setdefault(ureg, {})[base_units] = index
+    return index
+
+
+def get_unit_index(ureg: UnitRegistry, base_units: str) -> UnitPrefixIndex:
+    """
+    Return the index registered for the base units, without building it
+    :raise LookupError: if no index was registered for the base units
+    """
+    try:
+        return _unit_indexes[ureg][base_units]
+    except KeyError:
+        raise LookupError(f"No unit index registered for '{base_units}'.") from None
@@ -0,0 +1,321 @@
+import csv
+import re
+from collections.abc import Iterable, Iterator, Mapping
+from decimal import Decimal
+from typing import Any, NamedTuple, TextIO
+
+from django.core.exceptions import NON_FIELD_ERRORS, ValidationError
+from django.db import DataError, IntegrityError, models, router, transaction
+
+from pint import PintError
+
+from .fields import QuantityFieldMixin, QuantityRangeField
+from .helper import UnitParseCache, check_matching_unit_dimension, split_quantity
+
+# Headers written by QuantityCsvExporter, i.e. "weight [kilogram]"
+HEADER_RE = re.compile(r"\s*(?P<name>[^\[\]]+?)\s*(?:\[(?P<unit>[^\[\]]*)\])?\s*")
+
+
+class RowError(NamedTuple):
+    """
+    An error of one row, which was not imported
+    """
+
+    row: int
+    field: str
+    message: str
+
+
+class ImportResult(NamedTuple):
+    created: int
+    errors: list[RowError]
+
+
+class ImportColumn:
+    """
+    A column of the import, parsing the cells of one field
+    """
+
+    def __init__(
+        self,
+        field: models.Field,
+        units: str | None,
+        unit_cache: UnitParseCache,
+        upper: bool = False,
+    ) -> None:
+        """
+        :param upper: Whether the column is the upper bound of a
+                      QuantityRangeField
+        """
+        self.field = field
+        self.attname = field.upper_attname if upper else field.attname
+        self.is_quantity = isinstance(field, QuantityFieldMixin)
+        if not self.is_quantity:
+            if units:
+                raise ValueError(f"Field '{field.name}' is not a quantity field.")
+            return
+        if not isinstance(
+            field, (models.FloatField, models.IntegerField, models.DecimalField)
+        ):
+            raise ValueError(f"Field '{field.name}' can't be imported from CSV.")
+        self.unit_cache = unit_cache
+        self.allowed_units = {
+            getattr(field.ureg, choice) for choice in field.unit_choices
+        }
+        # Cells without unit are given in the units of the header, which
+        # may be any unit of the same dimensionality
+        if units:
+            self.default_unit = self.unit_cache.parse(field.ureg, units)
+            check_matching_unit_dimension(field.ureg, field.base_units, [units])
+        else:
+            self.default_unit = field.conversion_plan.base_unit
+
+    def parse_unit(self, text: str) -> Any:
+        """
+        Return the unit of the text, if it is one of the unit choices
+        :raise ValueError: if the unit is not allowed or unknown
+        """
+        try:
+            unit = self.unit_cache.parse(self.field.ureg, text)
+        except (PintError, ValueError) as e:
+            raise ValueError(f"Unknown unit '{text}'.") from e
+        if unit not in self.allowed_units:
+            raise ValueError(
+                f"Unit '{text}' is not one of {', '.join(self.field.unit_choices)}."
+            )
+        return unit
+
+    def parse(self, text: str) -> tuple[Any, Any]:
+        """
+        Return magnitude and unit of a quantity cell, the unit is None for
+        other fields and empty cells
+        :raise ValueError: if the cell is invalid
+        """
+        if text is None or not text.strip():
+            if self.field.null or self.field.empty_strings_allowed:
+                return None if self.field.null else "", None
+            raise ValueError("This field cannot be empty.")
+        if not self.is_quantity:
+            try:
+                return self.field.to_python(text), None
+            except ValidationError as e:
+                raise ValueError(" ".join(e.messages)) from e
+        magnitude_text, unit_text = split_quantity(text)
+        unit = self.parse_unit(unit_text) if unit_text else self.default_unit
+        if isinstance(self.field, models.DecimalField):
+            return Decimal(magnitude_text), unit
+        return float(magnitude_text), unit
+
+    def convert(self, cells: list[tuple[Any, Any]]) -> list:
+        """
+        Convert the parsed cells of one chunk to base units, one batch per unit
+        """
+        values = [magnitude for magnitude, _ in cells]
+        if not self.is_quantity:
+            return values
+        plan = self.field.conversion_plan
+        groups: dict[Any, list[int]] = {}
+        for index, (magnitude, unit) in enumerate(cells):
+            if unit is None or magnitude is None:
+                continue
+            if isinstance(magnitude, Decimal):
+                # Let pint convert special number types
+                values[index] = plan.to_base_magnitude(
+                    self.field.ureg.Quantity(magnitude, unit)
+                )
+            else:
+                groups.setdefault(unit, []).append(index)
+        for unit, indexes in groups.items():
+            converted = plan.to_base_magnitudes([values[i] for i in indexes], unit)
+            for index, magnitude in zip(indexes, converted, strict=True):
+                values[index] = magnitude
+        return [self.field.get_prep_value(value) for value in values]
+
+
+class QuantityCsvImporter:
+    """
+    Import rows with quantity cells like ``"12.5 kg"`` in chunks, i.e.
+    ``QuantityCsvImporter(HayBale).import_csv(file)``
+
+    Unit texts are parsed once and kept in a LRU cache, the magnitudes of one
+    chunk are converted into base units in one batch per unit and saved with
+    ``bulk_create`` within a transaction per chunk. Invalid rows, including
+    rows rejected by the database, are skipped and reported in the result.
+    """
+
+    default_unit_cache = UnitParseCache(maxsize=1024)
+
+    def __init__(
+        self,
+        model: type[models.Model],
+        chunk_size: int = 1000,
+        unit_cache: UnitParseCache | None = None,
+    ) -> None:
+        """
+        :param model: Model the rows are imported into
+        :param chunk_size: Number of rows converted and created at once
+        :param unit_cache: Cache of parsed unit texts, shared by all importers
+                           by default
+        """
+        if chunk_size < 1:
+            raise ValueError("chunk_size must be at least 1.")
+        self.model = model
+        self.chunk_size = chunk_size
+        if unit_cache is None:
+            unit_cache = self.default_unit_cache
+        self.unit_cache = unit_cache
+
+    def get_columns(self, headers: Iterable[str]) -> dict[str, ImportColumn]:
+        """
+        Return the columns of the headers, which are field names optionally
+        followed by the units of cells without unit, i.e. ``weight [kilogram]``
+
+        The upper bound of a QuantityRangeField is given in a second column
+        named like its companion field, i.e. ``weight_upper [kilogram]``.
+        :raise FieldDoesNotExist: if a header is not a field of the model
+        :raise ValueError: if a bound of a range is missing
+        """
+        ranges = {
+            field.upper_attname: field
+            for field in self.model._meta.concrete_fields
+            if isinstance(field, QuantityRangeField)
+        }
+        columns = {}
+        for header in headers:
+            match = HEADER_RE.fullmatch(header)
+            name, units = (header, None) if match is None else match.groups()
+            if name in ranges:
+                columns[header] = ImportColumn(
+                    ranges[name], units, self.unit_cache, upper=True
+                )
+            else:
+                field = self.model._meta.get_field(name)
+                columns[header] = ImportColumn(field, units, self.unit_cache)
+        attnames = {column.attname for column in columns.values()}
+        for upper_attname, field in ranges.items():
+            if (field.attname in attnames) != (upper_attname in attnames):
+                raise ValueError(
+                    f"Field '{field.name}' needs a column for the lower and the "
+                    f"upper bound ({field.name}, {upper_attname})."
+                )
+        return columns
+
+    def import_csv(self, file: TextIO) -> ImportResult:
+        """
+        Import the rows of a CSV file with a header line
+        """
+        reader = csv.DictReader(file)
+        return self.import_rows(reader, reader.fieldnames or [])
+
+    def import_rows(
+        self, rows: Iterable[Mapping[str, str]], headers: Iterable[str]
+    ) -> ImportResult:
+        """
+        Import rows given as mappings of header to cell text
+        """
+        columns = self.get_columns(headers)
+        created = 0
+        errors: list[RowError] = []
+        for chunk in self.iter_chunks(rows):
+            objs = self.build_chunk(chunk, columns, errors)
+            created += self.create_chunk(objs, errors)
+        return ImportResult(created, errors)
+
+    def create_chunk(
+        self, objs: list[tuple[int, models.Model]], errors: list[RowError]
+    ) -> int:
+        """
+        Create the instances of one chunk at once and return their number.
+        If the database rejects the chunk, the rows are created one by one
+        and the rejected rows are appended to errors.
+        """
+        manager = self.model._default_manager
+        using = router.db_for_write(self.model)
+        try:
+            with transaction.atomic(using=using):
+                manager.bulk_create([obj for _, obj in objs])
+        except (IntegrityError, DataError):
+            pass
+        else:
+            return len(objs)
+        created = 0
+        for number, obj in objs:
+            try:
+                with transaction.atomic(using=using):
+                    manager.bulk_create([obj])
+            except (IntegrityError, DataError) as e:
+                errors.append(RowError(number, NON_FIELD_ERRORS, str(e)))
+            else:
+                created += 1
+        return created
+
+    def iter_chunks(
+        self, rows: Iterable[Mapping[str, str]]
+    ) -> Iterator[list[tuple[int, Mapping[str, str]]]]:
+        chunk = []
+        # Rows are numbered like the lines of a CSV file with header
+        for number, row in enumerate(rows, start=2):
+            chunk.append((number, row))
+            if len(chunk) >= self.chunk_size:
+                yield chunk
+                chunk = []
+        if chunk:
+            yield chunk
+
+    def build_chunk(
+        self,
+        chunk: list[tuple[int, Mapping[str, str]]],
+        columns: dict[str, ImportColumn],
+        errors: list[RowError],
+    ) -> list[tuple[int, models.Model]]:
+        """
+        Return the row numbers and instances of the valid rows of one chunk,
+        the errors of the invalid rows are appended to errors
+        """
+        parsed: list[tuple[int, list]] = []
+        for number, row in chunk:
+            cells = []
+            for header, column in columns.items():
+                try:
+                    cells.append(column.parse(row.get(header)))
+                except ValueError as e:
+                    errors.append(RowError(number, column.field.name, str(e)))
+                    break
+            else:
+                parsed.append((number, cells))
+
+        values = [
+            column.convert([cells[index] for _, cells in parsed])
+            for index, column in enumerate(columns.values())
+        ]
+        ranges = {
+            column.field
+            for column in columns.values()
+            if isinstance(column.field, QuantityRangeField)
+        }
+        objs = []
+        for position, (number, _) in enumerate(parsed):
+            obj = self.model()
+            try:
+                for column, column_values in zip(columns.values(), values, strict=True):
+                    field = column.field
+                    value = column_values[position]
+                    if value is not None:
+                        field.run_validators(value)
+                    # Magnitudes are stored directly, so descriptors of
+                    # quantity fields don't create a Quantity
+                    obj.__dict__[column.attname] = value
+                for field in ranges:
+                    bounds = (
+                        obj.__dict__[field.attname],
+                        obj.__dict__[field.upper_attname],
+                    )
+                    if bounds != (None, None):
+                        field.to_interval(bounds)
+            except ValidationError as e:
+                errors.append(RowError(number, field.name, " ".join(e.messages)))
+            except ValueError as e:
+                errors.append(RowError(number, field.name, str(e)))
+            else:
+                objs.append((number, obj))
+        return objs
@@ -0,0 +1,235 @@
+import math
+from decimal import Decimal
+
+from django.db import models
+from django.db.models import lookups
+
+from pint import Quantity
+
+
+class QuantityLookupMixin:
+    """
+    Convert the right hand side of a lookup into the base units of the
+    quantity field once, when the query is built.
+
+    All values of iterable lookups like ``in`` and ``range`` are converted
+    in one batch, grouped by their unit. Values with a not matching dimension
+    raise a DimensionalityError.
+    The converted magnitudes are then prepared by the lookups of Django, so
+    fractions are rounded for integer fields like without quantities.
+    """
+
+    rhs_is_iterable = False
+    # Round fractions up for integer fields like IntegerFieldFloatRounding
+    rounds_up_for_integers = False
+
+    def get_prep_lookup(self):
+        field = getattr(self.lhs, "output_field", None)
+        if (
+            self.prepare_rhs
+            and hasattr(field, "get_base_magnitudes")
+            and not hasattr(self.rhs, "resolve_expression")
+        ):
+            if self.rhs_is_iterable:
+                self.rhs = self.prepare_values(field, list(self.rhs))
+            else:
+                self.rhs = self.prepare_values(field, [self.rhs])[0]
+            if (
+                self.rounds_up_for_integers
+                and isinstance(field, models.IntegerField)
+                and isinstance(self.rhs, float)
+            ):
+                self.rhs = math.ceil(self.rhs)
+        return super().get_prep_lookup()
+
+    @staticmethod
+    def prepare_values(field, values: list) -> list:
+        # Expressions are resolved by the database and are kept
+        indexes = [
+            index
+            for index, value in enumerate(values)
+            if not hasattr(value, "resolve_expression")
+        ]
+        prepared = field.get_base_magnitudes([values[index] for index in indexes])
+        for index, value in zip(indexes, prepared, strict=True):
+            values[index] = value
+        return values
+
+
+class QuantityExact(QuantityLookupMixin, lookups.Exact):
+    pass
+
+
+class QuantityGreaterThan(QuantityLookupMixin, lookups.GreaterThan):
+    pass
+
+
+class QuantityGreaterThanOrEqual(QuantityLookupMixin, lookups.GreaterThanOrEqual):
+    rounds_up_for_integers = True
+
+
+class QuantityLessThan(QuantityLookupMixin, lookups.LessThan):
+    rounds_up_for_integers = True
+
+
+class QuantityLessThanOrEqual(QuantityLookupMixin, lookups.LessThanOrEqual):
+    pass
+
+
+class QuantityIn(QuantityLookupMixin, lookups.In):
+    rhs_is_iterable = True
+
+
+class QuantityRange(QuantityLookupMixin, lookups.Range):
+    rhs_is_iterable = True
+
+
+class QuantityApprox(lookups.Range):
+    """
+    Match values within a tolerance, i.e.
+    ``weight__approx=(Q_(5, "kg"), Q_(10, "g"))``
+
+    It is compiled to ``BETWEEN value - tolerance AND value + tolerance``,
+    so an index on the column can be used.
+    """
+
+    lookup_name = "approx"
+    # The bounds are prepared by this lookup, so they are not truncated
+    # for integer fields
+    prepare_rhs = False
+
+    def get_prep_lookup(self):
+        field = self.lhs.output_field
+        try:
+            value, tolerance = self.rhs
+        except (TypeError, ValueError):
+            raise ValueError(
+                "The value for an approx lookup must be a tuple of value and tolerance."
+            ) from None
+        if value is None or tolerance is None:
+            raise ValueError(
+                "The value and tolerance of an approx lookup can't be None."
+            )
+        if isinstance(field, models.IntegerField):
+            # The center keeps its fraction
+            (value,) = field.get_base_magnitudes([value])
+        else:
+            value = field.get_prep_value(value)
+        tolerance = self.tolerance_to_base(field, tolerance)
+        if isinstance(value, Decimal):
+            tolerance = Decimal(str(tolerance))
+        self.rhs = [value - tolerance, value + tolerance]
+        return super().get_prep_lookup()
+
+    @staticmethod
+    def tolerance_to_base(field, tolerance):
+        """
+        Convert the tolerance into the base units of the field
+
+        The tolerance is a difference, so for offset units like degC only the
+        factor is applied.
+        """
+        if not isinstance(tolerance, Quantity):
+            return abs(tolerance)
+        tolerance = field.fix_unit_registry(tolerance)
+        ureg = field.ureg
+        base_unit = field.conversion_plan.base_unit
+        delta_unit = (ureg.Quantity(0, base_unit) - ureg.Quantity(0, base_unit)).units
+        delta = tolerance - ureg.Quantity(0, tolerance.units)
+        return abs(delta.to(delta_unit).magnitude)
+
+
+QUANTITY_LOOKUPS = [
+    QuantityExact,
+    QuantityGreaterThan,
+    QuantityGreaterThanOrEqual,
+    QuantityLessThan,
+    QuantityLessThanOrEqual,
+    QuantityIn,
+    QuantityRange,
+    QuantityApprox,
+]
+
+
+class IntervalLookup(lookups.Lookup):
+    """
+    Base of the lookups of a QuantityRangeField comparing its lower and
+    upper bound column with the bounds of an interval
+
+    Every condition compares a plain column with a value, so the composite
+    index of both columns can be used.
+    """
+
+    # The bounds are prepared by this lookup
+    prepare_rhs = False
+    # Whether a single quantity is allowed instead of an interval
+    allows_point = False
+
+    def get_prep_lookup(self):
+        if hasattr(self.rhs, "resolve_expression"):
+            raise ValueError(
+                f"The {self.lookup_name} lookup does not support expressions."
+            )
+        return self.lhs.output_field.get_prep_bounds(
+            self.rhs, allow_point=self.allows_point
+        )
+
+    def get_conditions(self, lower, upper, rhs_lower, rhs_upper) -> list:
+        """
+        Return the conditions as list of column, operator and value
+        """
+        raise NotImplementedError
+
+    def as_sql(self, compiler, connection):
+        alias = getattr(self.lhs, "alias", None)
+        if alias is None:
+            raise ValueError(
+                f"The {self.lookup_name} lookup can only be used on the field itself."
+            )
+        lower = self.process_lhs(compiler, connection)
+        upper = compiler.compile(self.lhs.output_field.upper_field.get_col(alias))
+        sql = []
+        params = []
+        for (column_sql, column_params), operator, value in self.get_conditions(
+            lower, upper, *self.rhs
+        ):
+            sql.append(f"{column_sql} {operator} %s")
+            params.extend((*column_params, value))
+        return f"({' AND '.join(sql)})", params
+
+
+class IntervalExact(IntervalLookup):
+    lookup_name = "exact"
+
+    def get_conditions(self, lower, upper, rhs_lower, rhs_upper) -> list:
+        return [(lower, "=", rhs_lower), (upper, "=", rhs_upper)]
+
+
+class IntervalOverlaps(IntervalLookup):
+    lookup_name = "overlaps"
+
+    def get_conditions(self, lower, upper, rhs_lower, rhs_upper) -> list:
+        return [(lower, "<=", rhs_upper), (upper, ">=", rhs_lower)]
+
+
+class IntervalContains(IntervalLookup):
+    lookup_name = "contains"
+    allows_point = True
+
+    def get_conditions(self, lower, upper, rhs_lower, rhs_upper) -> list:
+        return [(lower, "<=", rhs_lower), (upper, ">=", rhs_upper)]
+
+
+class IntervalContainedBy(IntervalLookup):
+    lookup_name = "contained_by"
+
+    def get_conditions(self, lower, upper, rhs_lower, rhs_upper) -> list:
+        return [(lower, ">=", rhs_lower), (upper, "<=", rhs_upper)]
+
+
+INTERVAL_LOOKUPS = [
+    IntervalExact,
+    IntervalOverlaps,
+    IntervalContains,
+    IntervalContainedBy,
+]
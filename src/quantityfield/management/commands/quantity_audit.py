@@ -0,0 +1,74 @@
+from pint import DimensionalityError
+
+from quantityfield.audit import (
+    ChunkedQuantityCommand,
+    audit_chunk,
+    parse_quantity,
+    run_chunks,
+)
+from quantityfield.settings import get_unit_registry
+
+
+class Command(ChunkedQuantityCommand):
+    help = (
+        "Check the stored values of quantity fields in chunks and report values "
+        "that are not finite, fail a validator or are outside of --min and --max."
+    )
+
+    def add_arguments(self, parser):
+        super().add_arguments(parser)
+        parser.add_argument(
+            "--min",
+            help="Smallest expected value, i.e. '0 kg'. Only applied to fields "
+            "with the same dimensionality",
+        )
+        parser.add_argument(
+            "--max",
+            help="Largest expected value, i.e. '1 t'. Only applied to fields "
+            "with the same dimensionality",
+        )
+        parser.add_argument(
+            "--samples",
+            type=int,
+            default=10,
+            help="Number of primary keys of invalid rows reported per field",
+        )
+
+    def get_task_arguments(self, field, minimum, maximum, samples) -> tuple:
+        return self.to_base(field, minimum), self.to_base(field, maximum), samples
+
+    @staticmethod
+    def to_base(field, limit):
+        # Limits of a different dimensionality don't apply to the field
+        if limit is None:
+            return None
+        try:
+            return field.get_prep_value(limit)
+        except DimensionalityError:
+            return None
+
+    def handle(self, *args, **options):
+        labels = options["labels"]
+        ureg = get_unit_registry()
+        limits = [
+            None if options[name] is None else parse_quantity(options[name], ureg)
+            for name in ("min", "max")
+        ]
+        fields = self.get_fields(labels)
+        tasks = self.iter_tasks(
+            fields, options["chunk_size"], *limits, options["samples"]
+        )
+        summary = self.summarize(
+            run_chunks(audit_chunk, tasks, options["processes"]), options
+        )
+        if any(entry["invalid"] for entry in summary.values()):
+            self.stderr.write("Invalid values found.")
+
+    def format_entry(self, label: str, entry: dict) -> str:
+        text = (
+            f"{label}: {entry['rows']} rows, {entry['nulls']} null, "
+            f"{entry['invalid']} invalid"
+        )
+        if entry["invalid_pks"]:
+            text += f" (pk {', '.join(map(str, entry['invalid_pks']))})"
+        return text
@@ -0,0 +1,69 @@
+from django.apps import apps
+from django.core.exceptions import FieldDoesNotExist
+from django.core.management.base import BaseCommand, CommandError
+
+from pint import DimensionalityError, UndefinedUnitError
+
+from quantityfield.export import QuantityCsvExporter
+
+
+class Command(BaseCommand):
+    help = (
+        "Export the rows of a model as CSV, with the values of quantity fields "
+        "in the chosen units."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("model", help="Model to export as app_label.Model")
+        parser.add_argument(
+            "--fields", nargs="+", help="Exported fields, all fields by default"
+        )
+        parser.add_argument(
+            "--unit",
+            action="append",
+            default=[],
+            metavar="FIELD=UNITS",
+            help="Display units of a quantity field, i.e. weight=kilogram",
+        )
+        parser.add_argument(
+            "--chunk-size",
+            type=int,
+            default=2000,
+            help="Number of rows fetched and converted at once (default: 2000)",
+        )
+        parser.add_argument(
+            "--output", help="Write the CSV into this file instead of stdout"
+        )
+
+    def handle(self, *args, **options):
+        try:
+            model = apps.get_model(options["model"])
+        except (LookupError, ValueError) as e:
+            raise CommandError(str(e)) from e
+        units = {}
+        for item in options["unit"]:
+            name, separator, unit = item.partition("=")
+            if not separator:
+                raise CommandError(f"Expected FIELD=UNITS, got '{item}'.")
+            units[name] = unit
+        try:
+            exporter = QuantityCsvExporter(
+                model._base_manager.order_by("pk"),
+                fields=options["fields"],
+                units=units,
+                chunk_size=options["chunk_size"],
+            )
+        except (
+            FieldDoesNotExist,
+            ValueError,
+            DimensionalityError,
+            UndefinedUnitError,
+        ) as e:
+            raise CommandError(str(e)) from e
+
+        if options["output"]:
+            with open(options["output"], "w", newline="") as file:
+                count = exporter.write(file)
+            self.stderr.write(f"Exported {count} rows to {options['output']}.")
+        else:
+            exporter.write(self.stdout)
@@ -0,0 +1,38 @@
+from django.apps import apps
+from django.core.exceptions import FieldDoesNotExist
+from django.core.management.base import BaseCommand, CommandError
+
+from pint import PintError
+
+from quantityfield.importer import QuantityCsvImporter
+
+
+class Command(BaseCommand):
+    help = (
+        "Import the rows of a CSV file into a model. Quantity cells like "
+        "'12.5 kg' are converted into the base units of their field."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("model", help="Model to import into as app_label.Model")
+        parser.add_argument("file", help="CSV file with a header line")
+        parser.add_argument(
+            "--chunk-size",
+            type=int,
+            default=1000,
+            help="Number of rows converted and created at once (default: 1000)",
+        )
+
+    def handle(self, *args, **options):
+        try:
+            model = apps.get_model(options["model"])
+            importer = QuantityCsvImporter(model, chunk_size=options["chunk_size"])
+            with open(options["file"], newline="") as file:
+                result = importer.import_csv(file)
+        except (LookupError, FieldDoesNotExist, ValueError, OSError, PintError) as e:
+            raise CommandError(str(e)) from e
+        for error in result.errors:
+            self.stderr.write(f"Row {error.row}, {error.field}: {error.message}")
+        self.stdout.write(
+            f"Imported {result.created} rows, skipped {len(result.errors)} rows."
+        )
@@ -0,0 +1,54 @@
+from django.core.management.base import CommandError
+
+from quantityfield.audit import (
+    ChunkedQuantityCommand,
+    renormalize_chunk,
+    run_chunks,
+)
+from quantityfield.helper import UnitConversionPlan
+from quantityfield.settings import get_unit_registry
+
+
+class Command(ChunkedQuantityCommand):
+    help = (
+        "Convert the stored values of quantity fields, written in --from-units, "
+        "into the base units of the fields within the database in chunks."
+    )
+
+    def add_arguments(self, parser):
+        super().add_arguments(parser)
+        parser.add_argument(
+            "--from-units", required=True, help="Units the values are stored in"
+        )
+        parser.add_argument(
+            "--to-units",
+            help="Units to convert the values to (default: base units of the field)",
+        )
+
+    def get_task_arguments(self, field, from_units, to_units) -> tuple:
+        ureg = get_unit_registry()
+        to_units = to_units or field.base_units
+        factors = UnitConversionPlan(ureg, to_units, []).get_factors(
+            getattr(ureg, from_units)
+        )
+        if factors is None:
+            raise CommandError(
+                f"Can't convert {field.model._meta.label}.{field.name} "
+                f"from {from_units} to {to_units}."
+            )
+        return factors
+
+    def handle(self, *args, **options):
+        labels = options["labels"]
+        if not labels:
+            raise CommandError("Give the fields to convert as app_label.Model.field.")
+        fields = self.get_fields(labels)
+        tasks = self.iter_tasks(
+            fields, options["chunk_size"], options["from_units"], options["to_units"]
+        )
+        self.summarize(
+            run_chunks(renormalize_chunk, tasks, options["processes"]), options
+        )
+
+    def format_entry(self, label: str, entry: dict) -> str:
+        return f"{label}: {entry['rows']} rows converted"
@@ -0,0 +1,201 @@
+import functools
+import logging
+from collections.abc import Callable
+from decimal import Decimal
+
+from django.apps.registry import Apps
+from django.db import models, router, transaction
+from django.db.migrations.operations.base import Operation
+
+from pint import DimensionalityError
+
+from .helper import UnitConversionPlan
+from .settings import get_unit_registry
+
+logger = logging.getLogger(__name__)
+
+
+@functools.cache
+def get_progress_model() -> type[models.Model]:
+    """
+    Return the model storing the progress of running conversions
+
+    Like the model of Django's MigrationRecorder, it is not part of an app
+    and is created on first use.
+    """
+
+    class ConversionProgress(models.Model):
+        name = models.CharField(max_length=255, primary_key=True)
+        last_pk = models.CharField(max_length=255)
+
+        class Meta:
+            apps = Apps()
+            app_label = "quantityfield"
+            db_table = "quantityfield_conversion_progress"
+
+        def __str__(self):
+            return f"{self.name} after pk {self.last_pk}"
+
+    return ConversionProgress
+
+
+def ensure_progress_model(schema_editor) -> type[models.Model]:
+    """
+    Return the progress model, creating its table if it doesn't exist
+    """
+    progress_model = get_progress_model()
+    connection = schema_editor.connection
+    with connection.cursor() as cursor:
+        tables = connection.introspection.table_names(cursor)
+    if progress_model._meta.db_table not in tables:
+        schema_editor.create_model(progress_model)
+    return progress_model
+
+
+class ConvertQuantityBaseUnits(Operation):
+    """
+    Convert the stored values of a quantity field into new base units, i.e.
+    ``ConvertQuantityBaseUnits("haybale", "weight", "gram", "kilogram")``
+
+    Factor and offset are computed once and the values are converted by
+    ``UPDATE`` statements within the database, chunk_size rows at a time in
+    the order of the primary key.
+    The last converted primary key is stored after every chunk, so for
+    migrations with ``atomic = False`` an interrupted conversion continues
+    with the next chunk when the migration is run again.
+    """
+
+    reversible = True
+
+    def __init__(
+        self,
+        model_name: str,
+        name: str,
+        from_units: str,
+        to_units: str,
+        chunk_size: int = 10000,
+        progress: Callable[[int, int], None] | None = None,
+    ):
+        """
+        :param model_name: Name of the model
+        :param name: Name of the quantity field
+        :param from_units: Base units the values are stored in
+        :param to_units: New base units of the field
+        :param chunk_size: Number of rows updated per statement
+        :param progress: Called with the number of converted and total rows
+                         after every chunk, the progress is logged otherwise
+        """
+        if chunk_size < 1:
+            raise ValueError("chunk_size must be at least 1.")
+        self.model_name = model_name
+        self.name = name
+        self.from_units = from_units
+        self.to_units = to_units
+        self.chunk_size = chunk_size
+        self.progress = progress
+
+    def deconstruct(self):
+        kwargs = {
+            "model_name": self.model_name,
+            "name": self.name,
+            "from_units": self.from_units,
+            "to_units": self.to_units,
+        }
+        if self.chunk_size != 10000:
+            kwargs["chunk_size"] = self.chunk_size
+        return self.__class__.__name__, [], kwargs
+
+    def state_forwards(self, app_label, state):
+        # The base_units of the field are changed by an AlterField operation
+        pass
+
+    def database_forwards(self, app_label, schema_editor, from_state, to_state):
+        model = to_state.apps.get_model(app_label, self.model_name)
+        self.convert(app_label, schema_editor, model, self.from_units, self.to_units)
+
+    def database_backwards(self, app_label, schema_editor, from_state, to_state):
+        model = to_state.apps.get_model(app_label, self.model_name)
+        self.convert(app_label, schema_editor, model, self.to_units, self.from_units)
+
+    def describe(self):
+        return (
+            f"Convert {self.model_name}.{self.name} "
+            f"from {self.from_units} to {self.to_units}"
+        )
+
+    @property
+    def migration_name_fragment(self):
+        return f"convert_{self.model_name.lower()}_{self.name.lower()}"
+
+    def get_factors(self, from_units: str, to_units: str) -> tuple[float, float]:
+        """
+        Return factor and offset, so ``to = from * factor + offset``
+        :raise DimensionalityError: if the units are not compatible or can't
+                                    be converted linearly
+        """
+        ureg = get_unit_registry()
+        plan = UnitConversionPlan(ureg, to_units, [])
+        factors = plan.get_factors(getattr(ureg, from_units))
+        if factors is None:
+            raise DimensionalityError(getattr(ureg, from_units), plan.base_unit)
+        return factors
+
+    def convert(self, app_label, schema_editor, model, from_units, to_units) -> None:
+        """
+        Convert the values of the field chunk by chunk
+        """
+        connection = schema_editor.connection
+        if not router.allow_migrate_model(connection.alias, model):
+            return
+        factor, offset = self.get_factors(from_units, to_units)
+        if factor == 1 and offset == 0:
+            return
+
+        field = model._meta.get_field(self.name)
+        pk = model._meta.pk
+        quote_name = schema_editor.quote_name
+        column = quote_name(field.column)
+        if field.get_internal_type() == "DecimalField":
+            factor, offset = Decimal(str(factor)), Decimal(str(offset))
+        expression = f"{column} * %s + %s"
+        if isinstance(field, models.IntegerField):
+            expression = f"ROUND({expression})"
+        # All names are quoted and values are passed as parameters
+        table = quote_name(model._meta.db_table)
+        sql = f"UPDATE {table} SET {column} = {expression}"  # noqa: S608
+        if schema_editor.collect_sql:
+            # sqlmigrate shows a single statement converting all rows
+            schema_editor.execute(sql, (factor, offset))
+            return
+        pk_column = quote_name(pk.column)
+        sql += f" WHERE {pk_column} >= %s AND {pk_column} <= %s"
+
+        progress_manager = ensure_progress_model(schema_editor).objects.using(
+            connection.alias
+        )
+        key = f"{app_label}.{model._meta.model_name}.{self.name}:{from_units}"
+        rows = model._base_manager.using(connection.alias).order_by("pk")
+
+        saved = progress_manager.filter(name=key).first()
+        last_pk = None if saved is None else pk.to_python(saved.last_pk)
+        if last_pk is not None:
+            logger.info("Resuming conversion of %s after pk %s", key, last_pk)
+            rows = rows.filter(pk__gt=last_pk)
+        total = rows.count()
+        done = 0
+        while pks := list(rows.values_list("pk", flat=True)[: self.chunk_size]):
+            with transaction.atomic(using=connection.alias):
+                schema_editor.execute(sql, (factor, offset, pks[0], pks[-1]))
+                progress_manager.update_or_create(
+                    name=key, defaults={"last_pk": str(pks[-1])}
+                )
+            rows = rows.filter(pk__gt=pks[-1])
+            done += len(pks)
+            self.report(key, done, total)
+        progress_manager.filter(name=key).delete()
+
+    def report(self, key: str, done: int, total: int) -> None:
+        if self.progress is not None:
+            self.progress(done, total)
+        else:
+            logger.info("Converted %s of %s rows of %s", done, total, key)
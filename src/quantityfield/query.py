@@ -0,0 +1,138 @@
+from collections.abc import Iterable, Iterator, Sequence
+from contextlib import contextmanager
+
+from django.db import models
+from django.db.models.expressions import ExpressionWrapper, F
+
+from pint import Quantity
+
+from .fields import QuantityFieldMixin, QuantityRangeField
+from .helper import import_numpy
+
+
+@contextmanager
+def prepared_quantities(
+    objs: Sequence[models.Model], fields: Iterable[QuantityFieldMixin]
+) -> Iterator[None]:
+    """
+    Temporarily replace the quantities of the given fields by their magnitude
+    in base units, converted in one batch per field.
+    The original values are restored afterwards.
+    """
+    originals = []
+    try:
+        for field in fields:
+            attname = field.attname
+            # Expressions are resolved by the database and are kept
+            indexes = [
+                index
+                for index, obj in enumerate(objs)
+                if not hasattr(getattr(obj, attname), "resolve_expression")
+            ]
+            values = [getattr(objs[index], attname) for index in indexes]
+            magnitudes = field.get_prep_values(values)
+            # The instance __dict__ is used directly, so descriptors
+            # of the fields don't interpret the magnitudes
+            for index, magnitude in zip(indexes, magnitudes, strict=True):
+                obj = objs[index]
+                originals.append((obj, attname, obj.__dict__[attname]))
+                obj.__dict__[attname] = magnitude
+        yield
+    finally:
+        for obj, attname, value in originals:
+            obj.__dict__[attname] = value
+
+
+class QuantityQuerySet(models.QuerySet):
+    """QuerySet with helpers for models containing quantity fields"""
+
+    def get_quantity_fields(self) -> list[QuantityFieldMixin]:
+        return [
+            field
+            for field in self.model._meta.concrete_fields
+            if isinstance(field, QuantityFieldMixin)
+        ]
+
+    def bulk_create(self, objs, *args, **kwargs):
+        """
+        Same as QuerySet.bulk_create, but the quantities are converted to
+        base units in one batch per field before they are passed to the database
+        """
+        objs = list(objs)
+        with prepared_quantities(objs, self.get_quantity_fields()):
+            return super().bulk_create(objs, *args, **kwargs)
+
+    def bulk_update(self, objs, fields, *args, **kwargs):
+        """
+        Same as QuerySet.bulk_update, but the quantities are converted to
+        base units in one batch per field before they are passed to the database
+        """
+        objs = list(objs)
+        quantity_fields = [
+            field
+            for field in self.get_quantity_fields()
+            if field.name in fields or field.attname in fields
+        ]
+        with prepared_quantities(objs, quantity_fields):
+            return super().bulk_update(objs, fields, *args, **kwargs)
+
+    def update(self, **kwargs):
+        """
+        Same as QuerySet.update, but intervals assigned to a QuantityRangeField
+        update the column of the upper bound as well
+        """
+        for field in self.get_quantity_fields():
+            if not isinstance(field, QuantityRangeField) or field.name not in kwargs:
+                continue
+            value = kwargs[field.name]
+            if value is None:
+                kwargs.setdefault(field.upper_attname, None)
+            elif not hasattr(value, "resolve_expression"):
+                kwargs[field.name], kwargs[field.upper_attname] = field.get_prep_bounds(
+                    value
+                )
+        return super().update(**kwargs)
+
+    update.alters_data = True
+
+    def get_quantity_field(self, field_name: str) -> QuantityFieldMixin:
+        field = self.model._meta.get_field(field_name)
+        if not isinstance(field, QuantityFieldMixin):
+            raise ValueError(
+                f"Field '{field_name}' of {self.model.__name__} is not a quantity "
+                "field."
+            )
+        return field
+
+    def quantity_array(self, field_name: str, units: str | None = None) -> Quantity:
+        """
+        Return all values of a quantity field as one Quantity wrapping a
+        float64 numpy array.
+
+        The raw magnitudes are fetched from the database without creating a
+        Quantity per row. NULL values are returned as NaN.
+        :param field_name: Name of the quantity field
+        :param units: If given, the values are converted into these units
+        """
+        np = import_numpy()
+        field = self.get_quantity_field(field_name)
+        plan = field.conversion_plan
+        # Wrap the column with a plain output field so the quantity field's
+        # from_db_value is not called for every row
+        raw = ExpressionWrapper(F(field_name), output_field=models.FloatField())
+        magnitudes = np.array(list(self.values_list(raw, flat=True)), dtype=np.float64)
+        quantity = field.ureg.Quantity(magnitudes, plan.base_unit)
+        if units is None:
+            return quantity
+
+        unit = getattr(field.ureg, units)
+        factors = plan.get_factors(unit)
+        if factors is None:
+            # Conversion depends on the active pint context or is not linear
+            return quantity.to(unit)
+        factor, offset = factors
+        if factor == 1 and offset == 0:
+            return field.ureg.Quantity(magnitudes, unit)
+        magnitudes -= offset
+        magnitudes *= 1 / factor
+        return field.ureg.Quantity(magnitudes, unit)
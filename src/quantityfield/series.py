@@ -0,0 +1,363 @@
+import datetime
+import zlib
+from typing import Any
+
+from django.db import models, transaction
+from django.db.models import F, Max, Min
+from django.db.models.query_utils import DeferredAttribute
+
+from pint import Quantity
+
+from .helper import UnitConversionPlan, check_matching_unit_dimension, import_numpy
+from .settings import get_unit_registry
+
+# Values of chunks are stored as little endian float64 or int64
+DTYPES = {b"f": "<f8", b"i": "<i8"}
+
+
+def encode_chunk(array: Any) -> bytes:
+    """
+    Delta encode the values of a chunk and compress them with zlib
+
+    Floats are delta encoded on their bit pattern, so that the encoding
+    is lossless.
+    """
+    np = import_numpy()
+    dtype_code = b"i" if array.dtype.kind in "biu" else b"f"
+    bits = array.astype(DTYPES[dtype_code], copy=False).view("<i8")
+    deltas = np.diff(bits, prepend=np.int64(0))
+    return dtype_code + zlib.compress(deltas.astype("<i8", copy=False).tobytes())
+
+
+def decode_chunk(blob: bytes | memoryview) -> Any:
+    """
+    Decode the values of a chunk encoded with encode_chunk
+    """
+    np = import_numpy()
+    blob = bytes(blob)
+    deltas = np.frombuffer(zlib.decompress(blob[1:]), dtype="<i8")
+    return np.cumsum(deltas, dtype=np.int64).view(DTYPES[blob[:1]])
+
+
+def create_chunk_model(field: "QuantitySeriesField", cls: type) -> type:
+    """
+    Create the model storing the chunks of a series field, like Django does
+    for the intermediary model of a ManyToManyField
+    """
+    opts = cls._meta
+    name = f"{opts.object_name}{field.name.title().replace('_', '')}Chunk"
+    meta = type(
+        "Meta",
+        (),
+        {
+            "app_label": opts.app_label,
+            "constraints": [
+                models.UniqueConstraint(
+                    fields=["owner", "index"],
+                    name=f"{opts.app_label}_{name.lower()}_unique",
+                )
+            ],
+        },
+    )
+    return type(
+        name,
+        (models.Model,),
+        {
+            "Meta": meta,
+            "__module__": cls.__module__,
+            "owner": models.ForeignKey(
+                f"{opts.app_label}.{opts.object_name}",
+                on_delete=models.CASCADE,
+                related_name="+",
+            ),
+            # number of the chunk, the first value is at index * chunk_size
+            "index": models.PositiveIntegerField(),
+            "length": models.PositiveIntegerField(),
+            # statistics in base units, so chunks can be filtered by value
+            "minimum": models.FloatField(),
+            "maximum": models.FloatField(),
+            "data": models.BinaryField(),
+        },
+    )
+
+
+class QuantitySeries:
+    """
+    Handle to the chunked values of a QuantitySeriesField of a model instance
+
+    Only chunks overlapping the requested window are loaded from the database.
+    """
+
+    def __init__(self, instance: models.Model, field: "QuantitySeriesField"):
+        self.instance = instance
+        self.field = field
+
+    def __len__(self) -> int:
+        return self.instance.__dict__.get(self.field.attname) or 0
+
+    @property
+    def chunks(self) -> models.QuerySet:
+        if self.instance.pk is None:
+            raise ValueError(
+                f"Save the {type(self.instance).__name__} instance before "
+                f"accessing the series '{self.field.name}'."
+            )
+        return self.field.chunk_model._default_manager.filter(owner=self.instance)
+
+    def _create_chunks(self, array: Any, first_index: int) -> None:
+        chunk_size = self.field.chunk_size
+        chunks = []
+        for start in range(0, len(array), chunk_size):
+            values = array[start : start + chunk_size]
+            chunks.append(
+                self.field.chunk_model(
+                    owner=self.instance,
+                    index=first_index + start // chunk_size,
+                    length=len(values),
+                    minimum=float(values.min()),
+                    maximum=float(values.max()),
+                    data=encode_chunk(values),
+                )
+            )
+        self.field.chunk_model._default_manager.bulk_create(chunks)
+
+    def _lock_length(self) -> int:
+        """
+        Lock the row of the instance until the end of the transaction and
+        return the stored length, which may be newer than the one of the
+        instance
+        """
+        length = (
+            type(self.instance)
+            ._base_manager.select_for_update()
+            .filter(pk=self.instance.pk)
+            .values_list(self.field.attname, flat=True)
+            .get()
+        )
+        self.instance.__dict__[self.field.attname] = length
+        return length
+
+    def _set_length(self, length: int) -> None:
+        type(self.instance)._base_manager.filter(pk=self.instance.pk).update(
+            **{self.field.attname: length}
+        )
+        self.instance.__dict__[self.field.attname] = length
+
+    def write(self, value: Quantity | Any) -> None:
+        """
+        Replace the series with the values of a one dimensional array
+        """
+        array = self.field.base_magnitudes(value)
+        chunks = self.chunks
+        with transaction.atomic():
+            self._lock_length()
+            chunks.delete()
+            self._create_chunks(array, 0)
+            self._set_length(len(array))
+
+    def append(self, value: Quantity | Any) -> None:
+        """
+        Append the values of a one dimensional array to the series
+        """
+        np = import_numpy()
+        array = self.field.base_magnitudes(value)
+        chunks = self.chunks
+        chunk_size = self.field.chunk_size
+        with transaction.atomic():
+            # Concurrent appends wait for each other instead of creating
+            # chunks with the same index
+            length = self._lock_length()
+            first_index = length // chunk_size
+            if length % chunk_size:
+                # Fill up the last chunk first
+                last = chunks.get(index=first_index)
+                array = np.concatenate((decode_chunk(last.data), array))
+                last.delete()
+            self._create_chunks(array, first_index)
+            self._set_length(length + len(array) - length % chunk_size)
+
+    def read(self, start: int = 0, stop: int | None = None) -> Quantity:
+        """
+        Return the values within the index window [start, stop)
+        """
+        np = import_numpy()
+        length = len(self)
+        stop = length if stop is None else min(stop, length)
+        start = max(start, 0)
+        base_unit = self.field.conversion_plan.base_unit
+        if start >= stop:
+            return self.field.ureg.Quantity(np.array([], dtype=np.float64), base_unit)
+        chunk_size = self.field.chunk_size
+        first_index = start // chunk_size
+        blobs = (
+            self.chunks.filter(
+                index__gte=first_index, index__lte=(stop - 1) // chunk_size
+            )
+            .order_by("index")
+            .values_list("data", flat=True)
+        )
+        array = np.concatenate([decode_chunk(blob) for blob in blobs])
+        offset = first_index * chunk_size
+        return self.field.ureg.Quantity(
+            array[start - offset : stop - offset], base_unit
+        )
+
+    def read_time(self, start: datetime.datetime, end: datetime.datetime) -> Quantity:
+        """
+        Return the values recorded within the time window [start, end)
+        :raise ValueError: if the field has no interval or origin_field
+        """
+        if self.field.interval is None:
+            raise ValueError(
+                f"The series '{self.field.name}' needs an interval and an "
+                "origin_field to be read by time."
+            )
+        origin = getattr(self.instance, self.field.origin_field)
+        interval = self.field.interval
+        # rounded up, so values before start are excluded
+        return self.read(-((origin - start) // interval), -((origin - end) // interval))
+
+    def _aggregate(self, aggregate: type[models.Aggregate], name: str):
+        value = self.chunks.aggregate(value=aggregate(name))["value"]
+        if value is None:
+            return None
+        return self.field.ureg.Quantity(value, self.field.conversion_plan.base_unit)
+
+    def min(self) -> Quantity | None:
+        """
+        Return the smallest value from the chunk statistics
+        """
+        return self._aggregate(Min, "minimum")
+
+    def max(self) -> Quantity | None:
+        """
+        Return the largest value from the chunk statistics
+        """
+        return self._aggregate(Max, "maximum")
+
+
+class QuantitySeriesDescriptor(DeferredAttribute):
+    """
+    Return a QuantitySeries handle instead of the stored length, like the
+    FileDescriptor returns a FieldFile
+    """
+
+    def __get__(self, instance, cls=None):
+        if instance is None:
+            return self
+        # Load the length, if it was deferred
+        super().__get__(instance, cls)
+        return QuantitySeries(instance, self.field)
+
+    def __set__(self, instance, value):
+        # A data descriptor, so the stored length doesn't hide the handle
+        instance.__dict__[self.field.attname] = value
+
+
+class QuantitySeriesField(models.PositiveBigIntegerField):
+    """
+    A long series of quantities stored in chunks of a side table
+
+    The column of the field stores the number of values. The values are
+    stored in base units, chunk_size values per row of an automatically
+    created chunk model, which is delta encoded and compressed with zlib.
+    Every chunk keeps the minimum and maximum of its values. Requires numpy.
+    """
+
+    descriptor_class = QuantitySeriesDescriptor
+
+    def __init__(
+        self,
+        base_units: str,
+        *args,
+        unit_choices: list[str] | None = None,
+        chunk_size: int = 1024,
+        interval: datetime.timedelta | None = None,
+        origin_field: str | None = None,
+        **kwargs,
+    ):
+        """
+        :param base_units: Unit description of base unit
+        :param unit_choices: Further units values may be given in
+        :param chunk_size: Number of values stored per chunk
+        :param interval: Time between two values, to read windows by time
+        :param origin_field: Name of the DateTimeField of the first value
+        :raise ValueError: if the arguments are invalid
+        """
+        if not isinstance(base_units, str):
+            raise ValueError(
+                'QuantitySeriesField must be defined with base units, eg: "gram"'
+            )
+        if chunk_size < 1:
+            raise ValueError("chunk_size must be at least 1.")
+        if (interval is None) != (origin_field is None):
+            raise ValueError("interval and origin_field have to be set together.")
+        self.ureg = get_unit_registry()
+        self.base_units = base_units
+        self.unit_choices = [
+            base_units,
+            *(unit for unit in unit_choices or () if unit != base_units),
+        ]
+        check_matching_unit_dimension(self.ureg, self.base_units, self.unit_choices)
+        self.conversion_plan = UnitConversionPlan(
+            self.ureg, self.base_units, self.unit_choices
+        )
+        self.chunk_size = chunk_size
+        self.interval = interval
+        self.origin_field = origin_field
+        kwargs.setdefault("default", 0)
+        kwargs.setdefault("editable", False)
+        super().__init__(*args, **kwargs)
+
+    def deconstruct(self):
+        name, path, args, kwargs = super().deconstruct()
+        kwargs["base_units"] = self.base_units
+        kwargs["unit_choices"] = self.unit_choices
+        kwargs["chunk_size"] = self.chunk_size
+        if self.interval is not None:
+            kwargs["interval"] = self.interval
+            kwargs["origin_field"] = self.origin_field
+        return name, path, args, kwargs
+
+    def contribute_to_class(self, cls, name, *args, **kwargs):
+        super().contribute_to_class(cls, name, *args, **kwargs)
+        # Models of the migration state already have their chunk model
+        if not cls._meta.abstract and cls.__module__ != "__fake__":
+            self.chunk_model = create_chunk_model(self, cls)
+
+    def pre_save(self, model_instance, add):
+        # The attribute is the series handle, the column stores the length.
+        # It is only written by the series itself, so saving an outdated
+        # instance keeps the values appended in the meantime.
+        if add:
+            return model_instance.__dict__.get(self.attname)
+        return F(self.attname)
+
+    def value_from_object(self, obj):
+        return obj.__dict__.get(self.attname)
+
+    def base_magnitudes(self, value: Quantity | Any) -> Any:
+        """
+        Return the values as one dimensional array in base units
+        :raise ValueError: if the array is not one dimensional
+        """
+        np = import_numpy()
+        if isinstance(value, Quantity):
+            if not isinstance(value, self.ureg.Quantity):
+                value = self.ureg.Quantity(value.magnitude, str(value.units))
+            factors = self.conversion_plan.get_factors(value.units)
+            if factors is None:
+                array = np.asarray(value.to(self.base_units).magnitude)
+            else:
+                factor, offset = factors
+                array = np.asarray(value.magnitude)
+                if factor != 1 or offset != 0:
+                    array = array * factor + offset
+        else:
+            array = np.asarray(value)
+        if array.ndim != 1:
+            raise ValueError(
+                f"Field '{self.name}' expected a one dimensional array "
+                f"but got {array.ndim} dimensions."
+            )
+        return array
@@ -1,11 +1,92 @@
-__version__ = "0.4"
+import inspect
+import threading
+import warnings
+
 from django.conf import settings
 
 from pint import UnitRegistry, set_application_registry
 
-# Define default unit register
-DJANGO_PINT_UNIT_REGISTER = getattr(
-    settings, "DJANGO_PINT_UNIT_REGISTER", UnitRegistry()
+from .helper import UnitTable
+
+_lock = threading.Lock()
+
+# The unit register defined in the settings, the default register is only
+# created on first use, as building it is expensive
+_unit_registry: UnitRegistry | None = getattr(
+    settings, "DJANGO_PINT_UNIT_REGISTER", None
 )
-# Set as default application registry for i.e. for pickle
-set_application_registry(DJANGO_PINT_UNIT_REGISTER)
+if _unit_registry is not None:
+    # Set as default application registry for i.e. for pickle
+    set_application_registry(_unit_registry)
+
+
+def _create_default_registry() -> UnitRegistry:
+    """
+    Create the default unit register
+
+    If DJANGO_PINT_CACHE_FOLDER is set, the parsed unit definitions are
+    cached in this folder and loaded from there by the next process.
+    Pint versions before 0.18 don't support caching, the setting is
+    ignored with a warning there.
+    """
+    cache_folder = getattr(settings, "DJANGO_PINT_CACHE_FOLDER", None)
+    if cache_folder is None:
+        return UnitRegistry()
+    if "cache_folder" not in inspect.signature(UnitRegistry.__init__).parameters:
+        warnings.warn(
+            "DJANGO_PINT_CACHE_FOLDER is ignored, caching unit definitions "
+            "requires pint>=0.18.",
+            RuntimeWarning,
+            stacklevel=2,
+        )
+        return UnitRegistry()
+    return UnitRegistry(cache_folder=cache_folder)
+
+
+def get_unit_registry() -> UnitRegistry:
+    """
+    Return the unit register defined in the settings or the default
+    unit register, which is created on the first call
+    """
+    global _unit_registry
+    if _unit_registry is None:
+        with _lock:
+            if _unit_registry is None:
+                registry = _create_default_registry()
+                # Set as default application registry for i.e. for pickle
+                set_application_registry(registry)
+                _unit_registry = registry
+    return _unit_registry
+
+
+# Tables of interned units by the name of the setting listing their units
+_unit_tables: dict[str, UnitTable] = {}
+
+
+def get_unit_table(setting: str = "DJANGO_PINT_UNIT_CODES") -> UnitTable:
+    """
+    Return the table of interned units of the unit register
+
+    The table is created on the first call from the units listed in the
+    setting, DJANGO_PINT_UNIT_CODES by default, the code of a unit being its
+    position. Only append units to this setting, as the codes may be stored
+    already.
+    """
+    table = _unit_tables.get(setting)
+    if table is None:
+        ureg = get_unit_registry()
+        with _lock:
+            table = _unit_tables.get(setting)
+            if table is None:
+                table = UnitTable(ureg, getattr(settings, setting, ()))
+                table.setting = setting
+                _unit_tables[setting] = table
+    return table
+
+
+def __getattr__(name: str):
+    # Keep DJANGO_PINT_UNIT_REGISTER available without creating the default
+    # unit register on import
+    if name == "DJANGO_PINT_UNIT_REGISTER":
+        return get_unit_registry()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -0,0 +1,48 @@
+// Suggest units for the unit inputs of QuantityAutocompleteWidget
+(function () {
+  "use strict";
+
+  function attach(input) {
+    var list = document.createElement("datalist");
+    list.id = input.id + "_units";
+    input.setAttribute("list", list.id);
+    input.parentNode.insertBefore(list, input.nextSibling);
+
+    var timer = null;
+    var controller = null;
+    input.addEventListener("input", function () {
+      clearTimeout(timer);
+      timer = setTimeout(function () {
+        if (controller) {
+          controller.abort();
+        }
+        controller = new AbortController();
+        var url = new URL(input.dataset.unitAutocomplete, window.location.href);
+        url.searchParams.set("base_units", input.dataset.baseUnits);
+        url.searchParams.set("q", input.value);
+        fetch(url, { signal: controller.signal })
+          .then(function (response) {
+            return response.json();
+          })
+          .then(function (data) {
+            list.replaceChildren.apply(
+              list,
+              (data.results || []).map(function (result) {
+                var option = document.createElement("option");
+                option.value = result.value;
+                option.label = result.unit;
+                return option;
+              })
+            );
+          })
+          .catch(function () {});
+      }, 150);
+    });
+  }
+
+  document.addEventListener("DOMContentLoaded", function () {
+    document
+      .querySelectorAll("input[data-unit-autocomplete]")
+      .forEach(attach);
+  });
+})();
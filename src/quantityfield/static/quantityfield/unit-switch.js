@@ -0,0 +1,34 @@
+// Convert the value of a QuantityWidget when its unit is changed, using the
+// factors and offsets from the base units embedded by the widget
+(function () {
+  "use strict";
+
+  function attach(select) {
+    var table = JSON.parse(select.dataset.unitConversions);
+    // The number input is named like the select, ending with _0
+    var name = select.name.replace(/_1$/, "_0");
+    var input = select.form ? select.form.elements[name] : null;
+    if (!input) {
+      return;
+    }
+    var previous = select.value;
+    select.addEventListener("change", function () {
+      var from = table[previous];
+      var to = table[select.value];
+      previous = select.value;
+      var value = parseFloat(input.value);
+      if (!from || !to || isNaN(value)) {
+        return;
+      }
+      var base = (value - from[1]) / from[0];
+      // Round away floating point noise like 0.30000000000000004
+      input.value = parseFloat((base * to[0] + to[1]).toPrecision(12));
+    });
+  }
+
+  document.addEventListener("DOMContentLoaded", function () {
+    document
+      .querySelectorAll("select[data-unit-conversions]")
+      .forEach(attach);
+  });
+})();
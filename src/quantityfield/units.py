@@ -1,4 +1,8 @@
-from .settings import DJANGO_PINT_UNIT_REGISTER
+from .settings import get_unit_registry
 
-# The unit register that was defined in the settings (shortcut)
-ureg = DJANGO_PINT_UNIT_REGISTER
+
+def __getattr__(name: str):
+    # The unit register that was defined in the settings (shortcut)
+    if name == "ureg":
+        return get_unit_registry()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -0,0 +1,9 @@
+from django.urls import path
+
+from . import views
+
+app_name = "quantityfield"
+
+urlpatterns = [
+    path("units/", views.unit_autocomplete, name="unit-autocomplete"),
+]
@@ -0,0 +1,113 @@
+import copy
+import math
+from collections.abc import Callable
+from typing import Any
+
+from django.core.exceptions import ValidationError
+from django.core.validators import MaxValueValidator, MinValueValidator
+from django.db import models
+
+from pint import Quantity
+
+from .settings import get_unit_registry
+
+
+class QuantityValueValidatorMixin:
+    """
+    Validator comparing values with a limit given as quantity, i.e.
+    ``QuantityMinValueValidator(Q_(0, "kg"))``
+
+    Quantity fields bind the validator to their base units, so the limit is
+    converted only once and values are compared as plain magnitudes.
+    """
+
+    limit_value: Any
+    message: str
+    code: str
+    compare: Any
+    # lookup used for the check constraint of the validator
+    lookup_name: str
+    # rounding of the limit in the check constraint of integer columns
+    round_limit: Callable[[float], int]
+
+    def __init__(
+        self, limit_value: Quantity | tuple[Any, str], message: str | None = None
+    ):
+        if isinstance(limit_value, tuple):
+            # Deconstructed validators store magnitude and unit of the limit
+            limit_value = get_unit_registry().Quantity(*limit_value)
+        if not isinstance(limit_value, Quantity):
+            raise ValueError(
+                f"{type(self).__name__} expects a quantity as limit_value, "
+                f"got {limit_value!r}."
+            )
+        super().__init__(limit_value, message)
+        self.limit_quantity = limit_value
+        self.base_limit_value: Any = None
+        self.base_unit: Any = None
+
+    def deconstruct(self):
+        path, args, kwargs = super().deconstruct()
+        # Quantities can't be serialized in migrations
+        limit_value = (self.limit_quantity.magnitude, str(self.limit_quantity.units))
+        if "limit_value" in kwargs:
+            kwargs["limit_value"] = limit_value
+        else:
+            args = (limit_value, *args[1:])
+        return path, args, kwargs
+
+    def bind(self, field) -> "QuantityValueValidatorMixin":
+        """
+        Return a copy of the validator comparing with the limit in the base
+        units of a quantity field
+        """
+        validator = copy.copy(self)
+        if isinstance(field, models.IntegerField):
+            # Keep the fractional limit, the integer would shift it
+            validator.base_limit_value = field.conversion_plan.to_base_magnitude(
+                field.fix_unit_registry(self.limit_quantity)
+            )
+        else:
+            validator.base_limit_value = field.get_prep_value(self.limit_quantity)
+        validator.base_unit = field.conversion_plan.base_unit
+        # Django compares the limit_value of min and max value validators
+        # with the range of integer columns
+        validator.limit_value = validator.base_limit_value
+        return validator
+
+    def get_constraint_condition(self, field) -> models.Q:
+        """
+        Return the condition of the check constraint of a bound validator
+        """
+        limit = self.base_limit_value
+        if isinstance(field, models.IntegerField):
+            limit = self.round_limit(limit)
+        return models.Q(**{f"{field.name}__{self.lookup_name}": limit})
+
+    def __call__(self, value: Any) -> None:
+        if self.base_unit is None:
+            raise ValueError(
+                f"{type(self).__name__} can only be used with quantity fields."
+            )
+        if isinstance(value, Quantity):
+            value = value.m_as(self.base_unit)
+        if self.compare(value, self.base_limit_value):
+            raise ValidationError(
+                self.message,
+                code=self.code,
+                params={
+                    "limit_value": self.limit_quantity,
+                    "show_value": value * self.base_unit,
+                    "value": value,
+                },
+            )
+
+
+class QuantityMinValueValidator(QuantityValueValidatorMixin, MinValueValidator):
+    lookup_name = "gte"
+    round_limit = staticmethod(math.ceil)
+
+
+class QuantityMaxValueValidator(QuantityValueValidatorMixin, MaxValueValidator):
+    lookup_name = "lte"
+    round_limit = staticmethod(math.floor)
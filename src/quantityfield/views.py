@@ -0,0 +1,36 @@
+from django.http import JsonResponse
+from django.views.decorators.http import require_GET
+
+from .helper import get_unit_index
+from .settings import get_unit_registry
+
+# Upper limit of suggestions returned per query
+MAX_LIMIT = 50
+
+
+@require_GET
+def unit_autocomplete(request):
+    """
+    Return units starting with the query ``q`` as JSON, which have the
+    dimensionality of the ``base_units``, i.e.
+    ``?base_units=gram&q=kil`` returns ``{"results": [{"value": "kilogram", ...}]}``
+
+    Only base units of form fields declared with ``autocomplete=True`` are
+    answered, their indexes are built when the fields are declared.
+    """
+    base_units = request.GET.get("base_units", "").strip()
+    try:
+        index = get_unit_index(get_unit_registry(), base_units)
+    except LookupError:
+        return JsonResponse(
+            {"error": f"Unknown base_units '{base_units}'."}, status=400
+        )
+    try:
+        limit = min(int(request.GET.get("limit", 10)), MAX_LIMIT)
+    except ValueError:
+        return JsonResponse({"error": "limit must be a number."}, status=400)
+    results = [
+        {"value": text, "unit": unit}
+        for text, unit in index.search(request.GET.get("q", ""), limit)
+    ]
+    return JsonResponse({"results": results})
@@ -1,11 +1,90 @@
+import functools
+import json
+import threading
 import warnings
 from numbers import Number
+from typing import Any
+from weakref import WeakKeyDictionary
 
-from django.forms.widgets import MultiWidget, NumberInput, Select
+from django.forms.widgets import MultiWidget, NumberInput, Select, TextInput
+from django.urls import reverse
+from django.utils.choices import BaseChoiceIterator
 
 import pint
 
-from .units import ureg
+from .helper import UnitConversionPlan
+from .settings import get_unit_registry
+
+
+class UnitChoices(BaseChoiceIterator, list):
+    """
+    Immutable list of unit choices, shared by all widgets with the same units
+
+    As a choice iterator it is not normalized into a new list by the Select
+    widget, and copies return the list itself, so forms don't copy the choices.
+    """
+
+    __iter__ = list.__iter__
+    __getitem__ = list.__getitem__
+    __eq__ = list.__eq__
+
+    def _immutable(self, *args, **kwargs):
+        raise TypeError("Unit choices are shared and can't be changed.")
+
+    __setitem__ = __delitem__ = __iadd__ = __imul__ = _immutable
+    append = extend = insert = pop = remove = clear = sort = reverse = _immutable
+
+    def __copy__(self):
+        return self
+
+    def __deepcopy__(self, memo):
+        return self
+
+    def __reduce__(self):
+        return UnitChoices, (list(self),)
+
+
+# Choices per unit registry and tuple of unit choices, None for all units
+_unit_choices: WeakKeyDictionary[pint.UnitRegistry, dict[Any, UnitChoices]] = (
+    WeakKeyDictionary()
+)
+_unit_choices_lock = threading.Lock()
+
+
+def get_unit_choices(ureg: pint.UnitRegistry, unit_choices=None) -> UnitChoices:
+    """
+    Return the shared choices of the units, all units of the registry if None
+    """
+    key = tuple(unit_choices) if unit_choices else None
+    with _unit_choices_lock:
+        choices = _unit_choices.setdefault(ureg, {})
+        try:
+            return choices[key]
+        except KeyError:
+            pass
+    units = key or dir(ureg)
+    result = UnitChoices((unit, unit) for unit in units)
+    with _unit_choices_lock:
+        return _unit_choices.setdefault(ureg, {}).setdefault(key, result)
+
+
+@functools.lru_cache(maxsize=256)
+def get_conversion_table(
+    ureg: pint.UnitRegistry, base_units: str, unit_choices: tuple[str, ...]
+) -> str:
+    """
+    Return the factor and offset converting values from the base units into
+    each unit choice as compact JSON, i.e. ``{"gram": [1, 0], "kilogram": [0.001, 0]}``
+
+    Units converted only within a pint context are left out.
+    """
+    table = {}
+    base_unit = getattr(ureg, base_units)
+    for unit in unit_choices:
+        factors = UnitConversionPlan(ureg, unit, []).get_factors(base_unit)
+        if factors is not None:
+            table[unit] = factors
+    return json.dumps(table, separators=(",", ":"))
 
 
 class QuantityWidget(MultiWidget):
@@ -24,17 +103,30 @@ class QuantityWidget(MultiWidget):
                 stacklevel=2,
             )
             unit_choices = allowed_types
-        self.ureg = ureg
-        choices = self.get_choices(unit_choices)
+        self.ureg = get_unit_registry()
         self.base_units = base_units
         attrs = attrs or {}
         attrs.setdefault("step", "any")
-        widgets = (NumberInput(attrs=attrs), Select(attrs=attrs, choices=choices))
+        widgets = (NumberInput(attrs=attrs), self.get_unit_widget(attrs, unit_choices))
         super().__init__(widgets, attrs)
 
+    class Media:
+        js = ["quantityfield/unit-switch.js"]
+
+    def get_unit_widget(self, attrs, unit_choices=None):
+        select_attrs = attrs
+        if self.base_units is not None and unit_choices:
+            # Let the browser convert the value when the unit is changed
+            select_attrs = {
+                **attrs,
+                "data-unit-conversions": get_conversion_table(
+                    self.ureg, self.base_units, tuple(unit_choices)
+                ),
+            }
+        return Select(attrs=select_attrs, choices=self.get_choices(unit_choices))
+
     def get_choices(self, unit_choices=None):
-        unit_choices = unit_choices or dir(self.ureg)
-        return [(x, x) for x in unit_choices]
+        return get_unit_choices(self.ureg, unit_choices)
 
     def decompress(self, value):
         """This function is called during rendering
@@ -49,3 +141,53 @@ class QuantityWidget(MultiWidget):
             return [value.magnitude, value.units]
 
         return [None, self.base_units]
+
+
+class QuantityTextInput(TextInput):
+    """
+    Single text input for quantities written like ``5 lb``
+
+    Numbers are shown with the base units.
+    """
+
+    def __init__(self, attrs=None, base_units=None):
+        self.base_units = base_units
+        super().__init__(attrs)
+
+    def format_value(self, value):
+        if isinstance(value, pint.Quantity):
+            return f"{value.magnitude} {value.units}"
+        if isinstance(value, Number) and self.base_units is not None:
+            return f"{value} {self.base_units}"
+        return super().format_value(value)
+
+
+class QuantityAutocompleteWidget(QuantityWidget):
+    """
+    QuantityWidget with a text input for the unit, suggesting the units
+    compatible with the base units from the unit autocomplete view
+    """
+
+    class Media:
+        js = ["quantityfield/unit-autocomplete.js"]
+
+    def __init__(self, *, attrs=None, base_units=None, url=None):
+        """
+        :param url: URL of the autocomplete view, by default the URL named
+                    ``quantityfield:unit-autocomplete``
+        """
+        self.url = url
+        super().__init__(attrs=attrs, base_units=base_units)
+
+    def get_unit_widget(self, attrs, unit_choices=None):
+        attrs = {key: value for key, value in attrs.items() if key != "step"}
+        attrs["autocomplete"] = "off"
+        attrs["data-base-units"] = self.base_units
+        return TextInput(attrs=attrs)
+
+    def get_context(self, name, value, attrs):
+        context = super().get_context(name, value, attrs)
+        # The URL is resolved on rendering, as widgets are created on import
+        url = self.url or reverse("quantityfield:unit-autocomplete")
+        context["widget"]["subwidgets"][1]["attrs"]["data-unit-autocomplete"] = url
+        return context
@@ -0,0 +1,46 @@
+# Generated by Django 5.2.18 on 2026-10-18 08:02
+
+from django.db import migrations, models
+
+import quantityfield.fields
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("dummyapp", "0002_offsetunitfloatfieldsavemodel"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="LazyHayBale",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("name", models.CharField(max_length=20)),
+                (
+                    "weight",
+                    quantityfield.fields.QuantityField(
+                        base_units="gram", lazy=True, unit_choices=["gram"]
+                    ),
+                ),
+                (
+                    "weight_decimal",
+                    quantityfield.fields.DecimalQuantityField(
+                        base_units="gram",
+                        decimal_places=2,
+                        lazy=True,
+                        max_digits=10,
+                        null=True,
+                        unit_choices=["gram"],
+                    ),
+                ),
+            ],
+        ),
+    ]
@@ -0,0 +1,31 @@
+# Generated by Django 5.2.18 on 2026-10-18 08:06
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("dummyapp", "0003_lazyhaybale"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="PlainFloatFieldSaveModel",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("name", models.CharField(max_length=20)),
+                ("weight", models.FloatField()),
+            ],
+            options={
+                "abstract": False,
+            },
+        ),
+    ]
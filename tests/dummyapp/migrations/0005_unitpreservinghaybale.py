@@ -0,0 +1,42 @@
+# Generated by Django 5.2.18 on 2026-10-18 08:14
+
+from django.db import migrations, models
+
+import quantityfield.fields
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("dummyapp", "0004_plainfloatfieldsavemodel"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="UnitPreservingHayBale",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("name", models.CharField(max_length=20)),
+                (
+                    "weight",
+                    quantityfield.fields.QuantityWithUnitField(
+                        base_units="gram",
+                        db_index=True,
+                        unit_choices=["gram", "kilogram", "pound"],
+                    ),
+                ),
+                ("weight_magnitude", models.FloatField(editable=False, null=True)),
+                (
+                    "weight_unit",
+                    models.PositiveSmallIntegerField(editable=False, null=True),
+                ),
+            ],
+        ),
+    ]
@@ -0,0 +1,37 @@
+# Generated by Django 5.2.18 on 2026-10-18 08:19
+
+from django.db import migrations, models
+
+import quantityfield.fields
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("dummyapp", "0005_unitpreservinghaybale"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="SensorTrace",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("name", models.CharField(max_length=20)),
+                (
+                    "values",
+                    quantityfield.fields.QuantityArrayField(
+                        base_units="meter",
+                        null=True,
+                        unit_choices=["meter", "kilometer"],
+                    ),
+                ),
+            ],
+        ),
+    ]
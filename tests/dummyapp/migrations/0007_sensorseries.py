@@ -0,0 +1,80 @@
+# Generated by Django 5.2.18 on 2026-10-18 08:21
+
+import datetime
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+import quantityfield.series
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("dummyapp", "0006_sensortrace"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="SensorSeries",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("name", models.CharField(max_length=20)),
+                ("started", models.DateTimeField(null=True)),
+                (
+                    "values",
+                    quantityfield.series.QuantitySeriesField(
+                        base_units="kelvin",
+                        chunk_size=4,
+                        default=0,
+                        editable=False,
+                        interval=datetime.timedelta(seconds=1),
+                        origin_field="started",
+                        unit_choices=["kelvin", "degC"],
+                    ),
+                ),
+            ],
+        ),
+        migrations.CreateModel(
+            name="SensorSeriesValuesChunk",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("index", models.PositiveIntegerField()),
+                ("length", models.PositiveIntegerField()),
+                ("minimum", models.FloatField()),
+                ("maximum", models.FloatField()),
+                ("data", models.BinaryField()),
+                (
+                    "owner",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="+",
+                        to="dummyapp.sensorseries",
+                    ),
+                ),
+            ],
+            options={
+                "constraints": [
+                    models.UniqueConstraint(
+                        fields=("owner", "index"),
+                        name="dummyapp_sensorseriesvalueschunk_unique",
+                    )
+                ],
+            },
+        ),
+    ]
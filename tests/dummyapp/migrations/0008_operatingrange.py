@@ -0,0 +1,46 @@
+# Generated by Django 5.2.18 on 2026-10-18 08:23
+
+from django.db import migrations, models
+
+import quantityfield.fields
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("dummyapp", "0007_sensorseries"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="OperatingRange",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("name", models.CharField(max_length=20)),
+                (
+                    "weight",
+                    quantityfield.fields.QuantityRangeField(
+                        base_units="kilogram",
+                        null=True,
+                        unit_choices=["kilogram", "gram"],
+                    ),
+                ),
+                ("weight_upper", models.FloatField(editable=False, null=True)),
+            ],
+            options={
+                "indexes": [
+                    models.Index(
+                        fields=["weight", "weight_upper"],
+                        name="dummyapp_op_weight_5eedb2_idx",
+                    )
+                ],
+            },
+        ),
+    ]
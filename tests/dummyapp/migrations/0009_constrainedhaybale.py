@@ -0,0 +1,72 @@
+# Generated by Django 5.2.18 on 2026-10-18 08:25
+
+from django.db import migrations, models
+
+import quantityfield.fields
+import quantityfield.validators
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("dummyapp", "0008_operatingrange"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="ConstrainedHayBale",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("name", models.CharField(max_length=20)),
+                (
+                    "weight",
+                    quantityfield.fields.QuantityField(
+                        base_units="kilogram",
+                        db_constraints=True,
+                        null=True,
+                        unit_choices=["kilogram", "gram"],
+                        validators=[
+                            quantityfield.validators.QuantityMinValueValidator(
+                                (0, "gram")
+                            ),
+                            quantityfield.validators.QuantityMaxValueValidator(
+                                (1, "metric_ton")
+                            ),
+                        ],
+                    ),
+                ),
+                (
+                    "temperature",
+                    quantityfield.fields.QuantityField(
+                        base_units="kelvin",
+                        null=True,
+                        unit_choices=["kelvin"],
+                        validators=[
+                            quantityfield.validators.QuantityMinValueValidator(
+                                (-20, "degree_Celsius")
+                            )
+                        ],
+                    ),
+                ),
+            ],
+            options={
+                "constraints": [
+                    models.CheckConstraint(
+                        condition=models.Q(("weight__gte", 0.0)),
+                        name="dummyapp_constrainedhaybale_weight_min_value",
+                    ),
+                    models.CheckConstraint(
+                        condition=models.Q(("weight__lte", 1000.0)),
+                        name="dummyapp_constrainedhaybale_weight_max_value",
+                    ),
+                ],
+            },
+        ),
+    ]
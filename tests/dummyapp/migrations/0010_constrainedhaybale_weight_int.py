@@ -0,0 +1,54 @@
+# Generated by Django 5.2.18 on 2026-10-18 09:10
+
+from django.db import migrations, models
+
+import quantityfield.fields
+import quantityfield.validators
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("dummyapp", "0009_constrainedhaybale"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="constrainedhaybale",
+            name="weight_int",
+            field=quantityfield.fields.IntegerQuantityField(
+                base_units="kilogram",
+                blank=True,
+                db_constraints=True,
+                null=True,
+                unit_choices=["kilogram"],
+                validators=[
+                    quantityfield.validators.QuantityMinValueValidator((500, "gram")),
+                    quantityfield.validators.QuantityMinValueValidator((0, "kilogram")),
+                    quantityfield.validators.QuantityMaxValueValidator(
+                        (2.5, "kilogram")
+                    ),
+                ],
+            ),
+        ),
+        migrations.AddConstraint(
+            model_name="constrainedhaybale",
+            constraint=models.CheckConstraint(
+                condition=models.Q(("weight_int__gte", 1)),
+                name="dummyapp_constrainedhaybale_weight_int_min_value",
+            ),
+        ),
+        migrations.AddConstraint(
+            model_name="constrainedhaybale",
+            constraint=models.CheckConstraint(
+                condition=models.Q(("weight_int__gte", 0)),
+                name="dummyapp_constrainedhaybale_weight_int_min_value_2",
+            ),
+        ),
+        migrations.AddConstraint(
+            model_name="constrainedhaybale",
+            constraint=models.CheckConstraint(
+                condition=models.Q(("weight_int__lte", 2)),
+                name="dummyapp_constrainedhaybale_weight_int_max_value",
+            ),
+        ),
+    ]
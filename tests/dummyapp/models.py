@@ -1,3 +1,5 @@
+import datetime
+
 from django.db import models
 from django.db.models import DecimalField
 
@@ -6,7 +8,17 @@ from quantityfield.fields import (
     BigIntegerQuantityField,
     DecimalQuantityField,
     IntegerQuantityField,
+    QuantityArrayField,
     QuantityField,
+    QuantityRangeField,
+    QuantityWithUnitField,
+)
+from quantityfield.query import QuantityQuerySet
+from quantityfield.series import QuantitySeriesField
+from quantityfield.units import ureg
+from quantityfield.validators import (
+    QuantityMaxValueValidator,
+    QuantityMinValueValidator,
 )
 
 
@@ -21,6 +33,8 @@ class FieldSaveModel(models.Model):
 class FloatFieldSaveModel(FieldSaveModel):
     weight = QuantityField("gram")
 
+    objects = QuantityQuerySet.as_manager()
+
 
 class IntFieldSaveModel(FieldSaveModel):
     weight = IntegerQuantityField("gram")
@@ -33,6 +47,13 @@ class BigIntFieldSaveModel(FieldSaveModel):
 class DecimalFieldSaveModel(FieldSaveModel):
     weight = DecimalQuantityField("gram", max_digits=10, decimal_places=2)
 
+    objects = QuantityQuerySet.as_manager()
+
+
+class PlainFloatFieldSaveModel(FieldSaveModel):
+    # Plain django field used as baseline for benchmarks
+    weight = models.FloatField()
+
 
 class HayBale(models.Model):
     name = models.CharField(max_length=20)
@@ -40,6 +61,8 @@ class HayBale(models.Model):
     weight_int = IntegerQuantityField("gram", blank=True, null=True)
     weight_bigint = BigIntegerQuantityField("gram", blank=True, null=True)
 
+    objects = QuantityQuerySet.as_manager()
+
 
 class EmptyHayBaleFloat(models.Model):
     name = models.CharField(max_length=20)
@@ -91,3 +114,76 @@ class OffsetUnitFloatFieldSaveModel(FieldSaveModel):
     # Note: This is a temperature not a weight.
     #       We wanted to reuse existing test cases inheritance
     weight = QuantityField("degC")
+
+    objects = QuantityQuerySet.as_manager()
+
+
+class LazyHayBale(models.Model):
+    name = models.CharField(max_length=20)
+    weight = QuantityField("gram", lazy=True)
+    weight_decimal = DecimalQuantityField(
+        "gram", lazy=True, null=True, max_digits=10, decimal_places=2
+    )
+
+
+class UnitPreservingHayBale(models.Model):
+    name = models.CharField(max_length=20)
+    weight = QuantityWithUnitField("gram", unit_choices=["kilogram", "pound"])
+
+    objects = QuantityQuerySet.as_manager()
+
+
+class SensorTrace(models.Model):
+    name = models.CharField(max_length=20)
+    values = QuantityArrayField("meter", unit_choices=["kilometer"], null=True)
+
+
+class SensorSeries(models.Model):
+    name = models.CharField(max_length=20)
+    started = models.DateTimeField(null=True)
+    values = QuantitySeriesField(
+        "kelvin",
+        unit_choices=["degC"],
+        chunk_size=4,
+        interval=datetime.timedelta(seconds=1),
+        origin_field="started",
+    )
+
+
+class OperatingRange(models.Model):
+    name = models.CharField(max_length=20)
+    weight = QuantityRangeField("kilogram", unit_choices=["gram"], null=True)
+
+    objects = QuantityQuerySet.as_manager()
+
+
+class ConstrainedHayBale(models.Model):
+    name = models.CharField(max_length=20)
+    weight = QuantityField(
+        "kilogram",
+        unit_choices=["gram"],
+        null=True,
+        db_constraints=True,
+        validators=[
+            QuantityMinValueValidator(ureg.Quantity(0, "gram")),
+            QuantityMaxValueValidator(ureg.Quantity(1, "tonne")),
+        ],
+    )
+    temperature = QuantityField(
+        "kelvin",
+        null=True,
+        validators=[QuantityMinValueValidator(ureg.Quantity(-20, "degC"))],
+    )
+    weight_int = IntegerQuantityField(
+        "kilogram",
+        null=True,
+        blank=True,
+        db_constraints=True,
+        validators=[
+            QuantityMinValueValidator(ureg.Quantity(500, "gram")),
+            QuantityMinValueValidator(ureg.Quantity(0, "kilogram")),
+            QuantityMaxValueValidator(ureg.Quantity(2.5, "kilogram")),
+        ],
+    )
+
+    objects = QuantityQuerySet.as_manager()
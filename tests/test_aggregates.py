@@ -0,0 +1,98 @@
+import pytest
+
+from django.test import TestCase
+
+from pint import DimensionalityError, OffsetUnitCalculusError
+
+from quantityfield.aggregates import (
+    QuantityAvg,
+    QuantityMax,
+    QuantityMin,
+    QuantityStdDev,
+    QuantitySum,
+    QuantityVariance,
+)
+from quantityfield.units import ureg
+from tests.dummyapp.models import HayBale, OffsetUnitFloatFieldSaveModel
+
+Quantity = ureg.Quantity
+
+
+@pytest.mark.django_db
+class TestQuantityAggregates(TestCase):
+    def setUp(self):
+        HayBale.objects.create(name="a", weight=1000, weight_int=3)
+        HayBale.objects.create(name="b", weight=500, weight_int=4)
+
+    def test_base_units(self):
+        result = HayBale.objects.aggregate(
+            sum=QuantitySum("weight"),
+            avg=QuantityAvg("weight_int"),
+            min=QuantityMin("weight"),
+            max=QuantityMax("weight"),
+        )
+        self.assertEqual(result["sum"], Quantity(1500, ureg.gram))
+        self.assertEqual(result["avg"], Quantity(3.5, ureg.gram))
+        self.assertEqual(result["min"], Quantity(500, ureg.gram))
+        self.assertEqual(result["max"], Quantity(1000, ureg.gram))
+
+    def test_converted(self):
+        result = HayBale.objects.aggregate(
+            sum=QuantitySum("weight", units="kilogram"),
+            max=QuantityMax("weight", units="kilogram"),
+        )
+        self.assertEqual(result["sum"], Quantity(1.5, ureg.kilogram))
+        self.assertEqual(str(result["max"].units), "kilogram")
+
+    def test_variance_has_squared_units(self):
+        result = HayBale.objects.aggregate(
+            var=QuantityVariance("weight", units="kilogram"),
+            std=QuantityStdDev("weight"),
+        )
+        self.assertEqual(result["var"].units, ureg.kilogram**2)
+        self.assertAlmostEqual(result["var"].magnitude, 0.0625)
+        self.assertEqual(result["std"], Quantity(250, ureg.gram))
+
+    def test_default(self):
+        result = HayBale.objects.filter(name="none").aggregate(
+            sum=QuantitySum("weight", default=0)
+        )
+        self.assertEqual(result["sum"], Quantity(0, ureg.gram))
+
+    def test_annotate(self):
+        result = (
+            HayBale.objects.values("name")
+            .annotate(total=QuantitySum("weight", units="kilogram"))
+            .order_by("name")
+        )
+        self.assertEqual(result[1]["total"], Quantity(0.5, ureg.kilogram))
+
+    def test_incompatible_units(self):
+        with self.assertRaises(DimensionalityError):
+            HayBale.objects.aggregate(QuantitySum("weight", units="meter"))
+
+
+@pytest.mark.django_db
+class TestQuantityAggregatesOffsetUnits(TestCase):
+    def setUp(self):
+        OffsetUnitFloatFieldSaveModel.objects.create(name="a", weight=10)
+        OffsetUnitFloatFieldSaveModel.objects.create(name="b", weight=20)
+
+    def test_avg_applies_offset(self):
+        result = OffsetUnitFloatFieldSaveModel.objects.aggregate(
+            avg=QuantityAvg("weight", units="degF")
+        )
+        self.assertAlmostEqual(result["avg"].magnitude, 59)
+
+    def test_std_dev_is_delta(self):
+        result = OffsetUnitFloatFieldSaveModel.objects.aggregate(
+            std=QuantityStdDev("weight", units="degF"),
+            var=QuantityVariance("weight", units="kelvin"),
+        )
+        self.assertEqual(result["std"].units, ureg.delta_degF)
+        self.assertAlmostEqual(result["std"].magnitude, 9)
+        self.assertAlmostEqual(result["var"].magnitude, 25)
+
+    def test_sum_not_defined(self):
+        with self.assertRaises(OffsetUnitCalculusError):
+            OffsetUnitFloatFieldSaveModel.objects.aggregate(QuantitySum("weight"))
@@ -0,0 +1,92 @@
+import pytest
+
+from django.core import serializers
+from django.test import TestCase
+
+from pint import DimensionalityError
+
+from quantityfield.fields import QuantityArrayField
+from quantityfield.units import ureg
+from tests.dummyapp.models import SensorTrace
+
+np = pytest.importorskip("numpy")
+
+Quantity = ureg.Quantity
+
+
+@pytest.mark.django_db
+class TestQuantityArrayField(TestCase):
+    def test_round_trip(self):
+        SensorTrace.objects.create(
+            name="a", values=Quantity(np.array([1.5, 2.5, -3.0]), "meter")
+        )
+        trace = SensorTrace.objects.get(name="a")
+        assert trace.values.units == ureg.meter
+        assert trace.values.magnitude.dtype == np.float64
+        np.testing.assert_array_equal(trace.values.magnitude, [1.5, 2.5, -3.0])
+
+    def test_converts_units(self):
+        SensorTrace.objects.create(
+            name="a", values=Quantity(np.array([1.0, 0.5]), "kilometer")
+        )
+        trace = SensorTrace.objects.get(name="a")
+        np.testing.assert_array_equal(trace.values.magnitude, [1000.0, 500.0])
+
+    def test_integer_array(self):
+        SensorTrace.objects.create(
+            name="a", values=Quantity(np.arange(5, dtype=np.int32), "meter")
+        )
+        trace = SensorTrace.objects.get(name="a")
+        assert trace.values.magnitude.dtype == np.int64
+        np.testing.assert_array_equal(trace.values.magnitude, np.arange(5))
+
+    def test_plain_values_and_lists(self):
+        SensorTrace.objects.create(name="a", values=[1.0, 2.0])
+        trace = SensorTrace.objects.get(name="a")
+        assert trace.values.units == ureg.meter
+        np.testing.assert_array_equal(trace.values.magnitude, [1.0, 2.0])
+
+    def test_empty_and_null(self):
+        SensorTrace.objects.create(name="empty", values=Quantity(np.array([]), "m"))
+        SensorTrace.objects.create(name="null", values=None)
+        assert len(SensorTrace.objects.get(name="empty").values.magnitude) == 0
+        assert SensorTrace.objects.get(name="null").values is None
+
+    def test_decoded_without_copy(self):
+        field = SensorTrace._meta.get_field("values")
+        blob = field.get_prep_value(Quantity(np.array([1.0, 2.0]), "m"))
+        value = field.from_db_value(blob, None, None)
+        assert not value.magnitude.flags.owndata
+        assert not value.magnitude.flags.writeable
+        assert value.magnitude.ctypes.data % field.ALIGNMENT == 0
+
+    def test_changed_base_units(self):
+        field = SensorTrace._meta.get_field("values")
+        blob = field.get_prep_value(Quantity(np.array([1.0, 2.0]), "m"))
+        other = QuantityArrayField("centimeter")
+        other.set_attributes_from_name("values")
+        value = other.from_db_value(blob, None, None)
+        assert value.units == ureg.centimeter
+        np.testing.assert_array_equal(value.magnitude, [100.0, 200.0])
+
+    def test_invalid_values(self):
+        field = SensorTrace._meta.get_field("values")
+        with pytest.raises(DimensionalityError):
+            field.get_prep_value(Quantity(np.array([1.0]), "second"))
+        with pytest.raises(ValueError, match="one dimensional"):
+            field.get_prep_value(Quantity(np.ones((2, 2)), "m"))
+        with pytest.raises(ValueError, match="unknown array format"):
+            field.from_db_value(b"XX" + bytes(20), None, None)
+
+    def test_serialization(self):
+        SensorTrace.objects.create(name="a", values=Quantity(np.array([4.0]), "km"))
+        data = serializers.serialize("json", SensorTrace.objects.all())
+        SensorTrace.objects.all().delete()
+        for obj in serializers.deserialize("json", data):
+            obj.save()
+        trace = SensorTrace.objects.get(name="a")
+        np.testing.assert_array_equal(trace.values.magnitude, [4000.0])
+
+    def test_lazy_not_supported(self):
+        with pytest.raises(ValueError, match="lazy"):
+            QuantityArrayField("meter", lazy=True)
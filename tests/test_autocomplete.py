@@ -0,0 +1,186 @@
+from unittest import mock
+
+import pytest
+
+from django import forms
+from django.test import SimpleTestCase
+
+from pint import UnitRegistry
+
+from quantityfield.fields import QuantityFormField
+from quantityfield.helper import (
+    UnitPrefixIndex,
+    build_unit_index,
+    get_prefixes,
+    get_unit_index,
+    register_unit_index,
+)
+from quantityfield.units import ureg
+from quantityfield.widgets import QuantityAutocompleteWidget
+
+Quantity = ureg.Quantity
+
+
+def test_prefix_index_search():
+    index = UnitPrefixIndex(
+        [("gram", "gram"), ("g", "gram"), ("grain", "grain"), ("Gy", "gray")],
+        [("kilogram", "kilogram"), ("kg", "kilogram"), ("gigagram", "gigagram")],
+    )
+    assert index.search("g") == [
+        ("g", "gram"),
+        ("grain", "grain"),
+        ("gram", "gram"),
+        ("Gy", "gray"),
+        ("gigagram", "gigagram"),
+    ]
+    assert index.search("GR ", limit=1) == [("grain", "grain")]
+    assert index.search("k") == [("kg", "kilogram"), ("kilogram", "kilogram")]
+    assert index.search("x") == []
+    assert "kg" in index
+    assert "KG" not in index
+    assert len(index) == 7
+
+
+def test_prefix_index_duplicates():
+    index = UnitPrefixIndex([("m", "meter")], [("m", "millifoo"), ("", "empty")])
+    assert index.units == {"m": "meter"}
+
+
+class TestUnitIndex(SimpleTestCase):
+    def test_units_of_dimensionality(self):
+        index = register_unit_index(ureg, "gram")
+        assert index is register_unit_index(ureg, "kilogram")
+        assert index is get_unit_index(ureg, "kilogram")
+        for text in ["gram", "g", "pound", "lb", "kilogram", "kg", "mg", "Mg"]:
+            assert text in index, text
+        assert "meter" not in index
+        assert index.units["kg"] == "kilogram"
+
+    def test_prefixed_units_are_parsed_as_given(self):
+        index = register_unit_index(ureg, "meter")
+        # "min" would be a milli inch, but is parsed as minute
+        assert "min" not in index
+        assert "km" in index
+        for text in list(index.units)[::50]:
+            assert ureg.get_name(text) == index.units[text]
+
+    def test_offset_units_not_prefixed(self):
+        index = register_unit_index(ureg, "degC")
+        assert "degC" in index
+        assert "kilodegC" not in index
+        assert "kK" in index
+
+    def test_without_prefix_definitions(self):
+        assert ("kilo", "k") in get_prefixes(ureg)
+        assert get_prefixes(object()) == []
+        registry = UnitRegistry()
+        with mock.patch("quantityfield.helper.get_prefixes", return_value=[]):
+            index = build_unit_index(registry, registry.get_dimensionality("gram"))
+        for text in ["gram", "g", "pound", "lb"]:
+            assert text in index, text
+        assert "mg" not in index
+
+    def test_not_registered(self):
+        with pytest.raises(LookupError):
+            get_unit_index(ureg, "gram*meter")
+
+    def test_search_without_pint(self):
+        index = register_unit_index(ureg, "gram")
+        with mock.patch.object(ureg, "parse_units") as parse:
+            assert ("pound", "pound") in index.search("pou")
+        parse.assert_not_called()
+
+
+class TestAutocompleteView(SimpleTestCase):
+    url = "/quantityfield/units/"
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        register_unit_index(ureg, "gram")
+        register_unit_index(ureg, "meter")
+
+    def test_search(self):
+        response = self.client.get(self.url, {"base_units": "gram", "q": "KILOGR"})
+        assert response.status_code == 200
+        # Units without prefix come first
+        assert response.json() == {
+            "results": [
+                {"value": "kilogram", "unit": "kilogram"},
+                {"value": "kilograin", "unit": "kilograin"},
+            ]
+        }
+
+    def test_limit(self):
+        response = self.client.get(
+            self.url, {"base_units": "meter", "q": "k", "limit": "3"}
+        )
+        assert len(response.json()["results"]) == 3
+        response = self.client.get(
+            self.url, {"base_units": "meter", "q": "", "limit": "1000"}
+        )
+        assert len(response.json()["results"]) == 50
+
+    def test_invalid(self):
+        for params in [
+            {},
+            {"base_units": "gunzu"},
+            {"base_units": "gram*meter"},
+            {"base_units": "gram", "limit": "many"},
+        ]:
+            with self.subTest(params=params):
+                response = self.client.get(self.url, params)
+                assert response.status_code == 400
+        assert self.client.post(self.url).status_code == 405
+
+    def test_index_not_built_by_requests(self):
+        with mock.patch(
+            "quantityfield.helper.build_unit_index", wraps=build_unit_index
+        ) as build:
+            response = self.client.get(self.url, {"base_units": "meter/second**3"})
+        assert response.status_code == 400
+        build.assert_not_called()
+
+
+class AutocompleteForm(forms.Form):
+    weight = QuantityFormField(base_units="gram", autocomplete=True)
+
+
+class TestAutocompleteWidget(SimpleTestCase):
+    def test_index_registered_on_declaration(self):
+        assert (
+            get_unit_index(ureg, "gram")
+            is AutocompleteForm.base_fields["weight"].unit_index
+        )
+
+    def test_widget(self):
+        form = AutocompleteForm()
+        widget = form.fields["weight"].widget
+        assert isinstance(widget, QuantityAutocompleteWidget)
+        html = str(form["weight"])
+        assert 'data-unit-autocomplete="/quantityfield/units/"' in html
+        assert 'data-base-units="gram"' in html
+        assert 'autocomplete="off"' in html
+        assert "<select" not in html
+        assert "quantityfield/unit-autocomplete.js" in str(form.media)
+
+    def test_url(self):
+        widget = QuantityAutocompleteWidget(base_units="gram", url="/units/")
+        assert 'data-unit-autocomplete="/units/"' in widget.render("weight", None)
+
+    def test_render_value(self):
+        widget = QuantityAutocompleteWidget(base_units="gram")
+        html = widget.render("weight", Quantity(2, "kg"))
+        assert 'value="2"' in html
+        assert 'value="kilogram"' in html
+
+    def test_clean(self):
+        form = AutocompleteForm(data={"weight_0": "2", "weight_1": "kg"})
+        assert form.is_valid()
+        assert form.cleaned_data["weight"] == Quantity(2000, "gram")
+        form = AutocompleteForm(data={"weight_0": "2", "weight_1": "meter"})
+        assert form.errors["weight"] == ["meter is not a valid choice"]
+
+    def test_text_input_and_autocomplete(self):
+        with pytest.raises(ValueError):
+            QuantityFormField(base_units="gram", autocomplete=True, text_input=True)
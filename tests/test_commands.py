@@ -0,0 +1,246 @@
+import json
+import os
+from io import StringIO
+from unittest import mock
+
+import pytest
+
+from django.core.management import CommandError, call_command
+from django.test import TestCase
+
+from quantityfield.audit import (
+    ChunkResult,
+    get_quantity_fields,
+    iter_chunks,
+    parse_quantity,
+    run_chunks,
+)
+from quantityfield.management.commands.quantity_audit import (
+    Command as AuditCommand,
+)
+from quantityfield.units import ureg
+from tests.dummyapp.models import (
+    ConstrainedHayBale,
+    HayBale,
+    OffsetUnitFloatFieldSaveModel,
+    OperatingRange,
+    UnitPreservingHayBale,
+)
+
+Quantity = ureg.Quantity
+
+
+def worker_result(label, rows):
+    # Module level, so it can be run by the spawned worker processes
+    return ChunkResult(label, rows, invalid_pks=(os.getpid(),))
+
+
+def call(command, *args, **kwargs):
+    out = StringIO()
+    call_command(command, *args, stdout=out, stderr=StringIO(), **kwargs)
+    return out.getvalue()
+
+
+class TestHelpers(TestCase):
+    def test_get_quantity_fields(self):
+        fields = get_quantity_fields(["dummyapp.HayBale"])
+        assert [field.name for _, field in fields] == [
+            "weight",
+            "weight_int",
+            "weight_bigint",
+        ]
+        fields = get_quantity_fields(["dummyapp.HayBale.weight_int"])
+        assert fields == [(HayBale, HayBale._meta.get_field("weight_int"))]
+        assert (ConstrainedHayBale, ConstrainedHayBale._meta.get_field("weight")) in (
+            get_quantity_fields(["dummyapp"])
+        )
+
+    def test_get_quantity_fields_unknown(self):
+        with pytest.raises(LookupError):
+            get_quantity_fields(["dummyapp.Unknown"])
+
+    def test_get_quantity_fields_multiple_columns(self):
+        # The values of ranges and fields keeping the unit span several columns
+        assert get_quantity_fields(["dummyapp.OperatingRange"]) == []
+        assert get_quantity_fields(["dummyapp.UnitPreservingHayBale"]) == []
+        for label in ["dummyapp.OperatingRange.weight", "dummyapp.HayBale.name"]:
+            with pytest.raises(ValueError, match="can't be processed"):
+                get_quantity_fields([label])
+
+    def test_iter_chunks(self):
+        bales = HayBale.objects.bulk_create(
+            [HayBale(name=str(i), weight=i) for i in range(5)]
+        )
+        pks = [bale.pk for bale in bales]
+        assert list(iter_chunks(HayBale, 2)) == [
+            (None, pks[1]),
+            (pks[1], pks[3]),
+            (pks[3], pks[4]),
+        ]
+        assert list(iter_chunks(HayBale, 5)) == [(None, pks[4])]
+        assert list(iter_chunks(ConstrainedHayBale, 2)) == []
+
+    def test_parse_quantity(self):
+        assert parse_quantity("-20 degC", ureg) == Quantity(-20, "degC")
+        assert parse_quantity(" 1.5  tonne ", ureg) == Quantity(1.5, "tonne")
+        assert parse_quantity("3", ureg) == Quantity(3)
+
+    def test_run_chunks_pool(self):
+        # The pool is only used with more than one process
+        with mock.patch("concurrent.futures.ProcessPoolExecutor") as pool:
+            assert list(run_chunks(ChunkResult, [("a", 1)], 1)) == [ChunkResult("a", 1)]
+            pool.assert_not_called()
+
+    def test_run_chunks_processes(self):
+        tasks = [("a", rows) for rows in range(6)]
+        results = list(run_chunks(worker_result, tasks, 2))
+        assert sorted(result.rows for result in results) == list(range(6))
+        pids = {result.invalid_pks[0] for result in results}
+        assert os.getpid() not in pids
+        assert len(pids) <= 2
+
+
+class TestAuditCommand(TestCase):
+    def test_audit_valid(self):
+        HayBale.objects.bulk_create(
+            [HayBale(name=str(i), weight=i, weight_int=i) for i in range(5)]
+        )
+        out = call("quantity_audit", "dummyapp.HayBale", chunk_size=2)
+        assert "dummyapp.HayBale.weight: 5 rows, 0 null, 0 invalid" in out
+        assert "dummyapp.HayBale.weight_bigint: 5 rows, 5 null, 0 invalid" in out
+
+    def test_audit_validators(self):
+        ConstrainedHayBale.objects.create(name="cold", temperature=Quantity(250, "K"))
+        ConstrainedHayBale.objects.create(name="ok", temperature=Quantity(260, "K"))
+        cold = ConstrainedHayBale.objects.create(
+            name="colder", temperature=Quantity(-30, "degC")
+        )
+        out = call("quantity_audit", "dummyapp.ConstrainedHayBale", chunk_size=1)
+        assert (
+            "dummyapp.ConstrainedHayBale.temperature: 3 rows, 0 null, 2 invalid" in out
+        )
+        assert f", {cold.pk})" in out
+
+    def test_audit_limits(self):
+        HayBale.objects.bulk_create(
+            [HayBale(name=str(i), weight=i * 500) for i in range(5)]
+        )
+        OffsetUnitFloatFieldSaveModel.objects.create(name="hot", weight=100)
+        out = call(
+            "quantity_audit",
+            "dummyapp.HayBale.weight",
+            "dummyapp.OffsetUnitFloatFieldSaveModel",
+            min="0.5 kg",
+            max="1.5 kg",
+        )
+        assert "dummyapp.HayBale.weight: 5 rows, 0 null, 2 invalid" in out
+        # The limits don't apply to temperatures
+        assert (
+            "dummyapp.OffsetUnitFloatFieldSaveModel.weight: 1 rows, 0 null, 0 invalid"
+            in out
+        )
+
+    def test_audit_report(self):
+        bales = HayBale.objects.bulk_create(
+            [HayBale(name=str(i), weight=-i) for i in range(4)]
+        )
+        with mock.patch("builtins.open", mock.mock_open()) as opened:
+            call(
+                "quantity_audit",
+                "dummyapp.HayBale.weight",
+                report="report.json",
+                min="0 g",
+                samples=2,
+                chunk_size=3,
+            )
+        opened.assert_called_once_with("report.json", "w")
+        written = "".join(call.args[0] for call in opened().write.call_args_list)
+        assert json.loads(written) == {
+            "dummyapp.HayBale.weight": {
+                "rows": 4,
+                "nulls": 0,
+                "invalid": 3,
+                "invalid_pks": [bales[1].pk, bales[2].pk],
+            }
+        }
+
+    def test_audit_samples_sorted(self):
+        command = AuditCommand(stdout=StringIO())
+        results = [
+            ChunkResult("a", 3, invalid=3, invalid_pks=(7, 8, 9)),
+            ChunkResult("a", 3, invalid=2, invalid_pks=(2, 3)),
+            ChunkResult("a", 3, invalid=1, invalid_pks=(5,)),
+        ]
+        summary = command.summarize(
+            results, {"samples": 4, "verbosity": 1, "report": None}
+        )
+        assert summary["a"]["invalid_pks"] == [2, 3, 5, 7]
+
+    def test_audit_unknown_label(self):
+        with pytest.raises(CommandError):
+            call("quantity_audit", "dummyapp.Unknown")
+
+
+class TestRenormalizeCommand(TestCase):
+    def test_renormalize(self):
+        HayBale.objects.bulk_create(
+            [HayBale(name=str(i), weight=i, weight_int=i) for i in range(5)]
+        )
+        out = call(
+            "quantity_renormalize",
+            "dummyapp.HayBale.weight",
+            "dummyapp.HayBale.weight_int",
+            from_units="kilogram",
+            chunk_size=2,
+        )
+        assert "dummyapp.HayBale.weight: 5 rows converted" in out
+        assert list(
+            HayBale.objects.order_by("pk").values_list("weight", "weight_int")
+        ) == [
+            (Quantity(i * 1000, "gram"), Quantity(i * 1000, "gram")) for i in range(5)
+        ]
+
+    def test_renormalize_offset(self):
+        OffsetUnitFloatFieldSaveModel.objects.create(name="hot", weight=373.15)
+        call(
+            "quantity_renormalize",
+            "dummyapp.OffsetUnitFloatFieldSaveModel.weight",
+            from_units="kelvin",
+        )
+        weight = OffsetUnitFloatFieldSaveModel.objects.get().weight
+        assert weight.m_as("degC") == pytest.approx(100)
+
+    def test_renormalize_to_units(self):
+        HayBale.objects.create(name="a", weight=2)
+        call(
+            "quantity_renormalize",
+            "dummyapp.HayBale.weight",
+            from_units="kilogram",
+            to_units="pound",
+        )
+        assert HayBale.objects.get().weight.magnitude == pytest.approx(4.409245)
+
+    def test_renormalize_incompatible(self):
+        with pytest.raises(CommandError, match="Can't convert"):
+            call("quantity_renormalize", "dummyapp.HayBale.weight", from_units="meter")
+
+    def test_renormalize_multiple_columns(self):
+        OperatingRange.objects.create(
+            name="a", weight=(Quantity(1, "kg"), Quantity(2, "kg"))
+        )
+        UnitPreservingHayBale.objects.create(name="a", weight=Quantity(1, "kg"))
+        for label in [
+            "dummyapp.OperatingRange.weight",
+            "dummyapp.UnitPreservingHayBale.weight",
+        ]:
+            with pytest.raises(CommandError, match="can't be processed"):
+                call("quantity_renormalize", label, from_units="gram")
+        assert OperatingRange.objects.get().weight == (
+            Quantity(1, "kg"),
+            Quantity(2, "kg"),
+        )
+        assert UnitPreservingHayBale.objects.get().weight == Quantity(1, "kg")
+
+    def test_renormalize_needs_labels(self):
+        with pytest.raises(CommandError):
+            call("quantity_renormalize", from_units="kilogram")
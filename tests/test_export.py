@@ -0,0 +1,185 @@
+import csv
+from io import StringIO
+
+import pytest
+
+from django.core.management import CommandError, call_command
+from django.test import TestCase
+
+from pint import DimensionalityError
+
+from quantityfield.export import QuantityCsvExporter
+from quantityfield.units import ureg
+from tests.dummyapp.models import (
+    DecimalFieldSaveModel,
+    HayBale,
+    OffsetUnitFloatFieldSaveModel,
+    OperatingRange,
+    SensorTrace,
+    UnitPreservingHayBale,
+)
+
+Quantity = ureg.Quantity
+
+
+def read(exporter):
+    return list(csv.reader(StringIO("".join(exporter.iter_lines()))))
+
+
+class TestQuantityCsvExporter(TestCase):
+    def setUp(self):
+        HayBale.objects.bulk_create(
+            [
+                HayBale(name=f"bale {i}", weight=i * 500, weight_int=i or None)
+                for i in range(5)
+            ]
+        )
+        self.queryset = HayBale.objects.order_by("pk")
+
+    def test_headers(self):
+        exporter = QuantityCsvExporter(self.queryset, units={"weight": "kilogram"})
+        assert exporter.headers == [
+            "id",
+            "name",
+            "weight [kilogram]",
+            "weight_int [gram]",
+            "weight_bigint [gram]",
+        ]
+
+    def test_rows(self):
+        exporter = QuantityCsvExporter(
+            self.queryset,
+            fields=["name", "weight", "weight_int"],
+            units={"weight": "kilogram", "weight_int": "milligram"},
+            chunk_size=2,
+        )
+        assert read(exporter) == [
+            ["name", "weight [kilogram]", "weight_int [milligram]"],
+            ["bale 0", "0.0", ""],
+            ["bale 1", "0.5", "1000.0"],
+            ["bale 2", "1.0", "2000.0"],
+            ["bale 3", "1.5", "3000.0"],
+            ["bale 4", "2.0", "4000.0"],
+        ]
+
+    def test_base_units_not_converted(self):
+        exporter = QuantityCsvExporter(
+            self.queryset, fields=["weight_int"], chunk_size=10
+        )
+        chunks = list(exporter.iter_chunks())
+        assert chunks == [[(None,), (1,), (2,), (3,), (4,)]]
+
+    def test_offset_unit(self):
+        OffsetUnitFloatFieldSaveModel.objects.create(name="boiling", weight=100)
+        exporter = QuantityCsvExporter(
+            OffsetUnitFloatFieldSaveModel.objects.all(),
+            fields=["weight"],
+            units={"weight": "kelvin"},
+        )
+        [[value]] = next(exporter.iter_chunks())
+        assert value == pytest.approx(373.15)
+
+    def test_decimal(self):
+        DecimalFieldSaveModel.objects.create(name="a", weight=Quantity(1500, "gram"))
+        exporter = QuantityCsvExporter(
+            DecimalFieldSaveModel.objects.all(),
+            fields=["weight"],
+            units={"weight": "kilogram"},
+        )
+        assert read(exporter)[1] == ["1.5"]
+
+    def test_write(self):
+        file = StringIO()
+        exporter = QuantityCsvExporter(self.queryset, fields=["weight"], chunk_size=3)
+        assert exporter.write(file) == 5
+        assert file.getvalue().splitlines() == [
+            "weight [gram]",
+            "0.0",
+            "500.0",
+            "1000.0",
+            "1500.0",
+            "2000.0",
+        ]
+
+    def test_response(self):
+        response = QuantityCsvExporter(self.queryset, fields=["weight"]).response(
+            "bales.csv"
+        )
+        assert response["Content-Type"] == "text/csv"
+        assert response["Content-Disposition"] == 'attachment; filename="bales.csv"'
+        content = b"".join(response.streaming_content).decode()
+        assert content.splitlines()[:2] == ["weight [gram]", "0.0"]
+
+    def test_invalid_units(self):
+        with pytest.raises(DimensionalityError):
+            QuantityCsvExporter(self.queryset, units={"weight": "meter"})
+        with pytest.raises(ValueError, match="not a quantity field"):
+            QuantityCsvExporter(self.queryset, units={"name": "meter"})
+        with pytest.raises(ValueError, match="not exported"):
+            QuantityCsvExporter(
+                self.queryset, fields=["name"], units={"weight": "gram"}
+            )
+        with pytest.raises(ValueError, match="chunk_size"):
+            QuantityCsvExporter(self.queryset, chunk_size=0)
+
+    def test_array_fields_skipped(self):
+        exporter = QuantityCsvExporter(SensorTrace.objects.all())
+        assert exporter.headers == ["id", "name"]
+        with pytest.raises(ValueError, match="can't be exported"):
+            QuantityCsvExporter(SensorTrace.objects.all(), fields=["values"])
+
+    def test_range_field(self):
+        OperatingRange.objects.create(
+            name="a", weight=(Quantity(500, "gram"), Quantity(2, "kilogram"))
+        )
+        OperatingRange.objects.create(name="none", weight=None)
+        exporter = QuantityCsvExporter(
+            OperatingRange.objects.order_by("pk"),
+            fields=["name", "weight"],
+            units={"weight": "gram"},
+        )
+        assert read(exporter) == [
+            ["name", "weight [gram]", "weight_upper [gram]"],
+            ["a", "500.0", "2000.0"],
+            ["none", "", ""],
+        ]
+        assert QuantityCsvExporter(OperatingRange.objects.all()).headers == [
+            "id",
+            "name",
+            "weight [kilogram]",
+            "weight_upper [kilogram]",
+        ]
+        with pytest.raises(ValueError, match="can't be exported"):
+            QuantityCsvExporter(OperatingRange.objects.all(), fields=["weight_upper"])
+
+    def test_unit_preserving_fields_skipped(self):
+        queryset = UnitPreservingHayBale.objects.all()
+        assert QuantityCsvExporter(queryset).headers == ["id", "name"]
+        for name in ["weight", "weight_magnitude", "weight_unit"]:
+            with self.subTest(name):
+                with pytest.raises(ValueError, match="can't be exported"):
+                    QuantityCsvExporter(queryset, fields=[name])
+
+
+class TestExportCommand(TestCase):
+    def test_export(self):
+        HayBale.objects.create(name="a", weight=Quantity(2, "kilogram"))
+        out = StringIO()
+        call_command(
+            "quantity_export",
+            "dummyapp.HayBale",
+            fields=["name", "weight"],
+            unit=["weight=kilogram"],
+            stdout=out,
+        )
+        assert out.getvalue().splitlines() == ["name,weight [kilogram]", "a,2.0"]
+
+    def test_invalid_arguments(self):
+        with pytest.raises(CommandError):
+            call_command("quantity_export", "dummyapp.Unknown")
+        with pytest.raises(CommandError, match="FIELD=UNITS"):
+            call_command("quantity_export", "dummyapp.HayBale", unit=["kilogram"])
+        with pytest.raises(CommandError):
+            call_command("quantity_export", "dummyapp.HayBale", fields=["unknown"])
+        with pytest.raises(CommandError):
+            call_command("quantity_export", "dummyapp.HayBale", unit=["weight=meter"])
@@ -0,0 +1,69 @@
+import pytest
+
+from django.db.models import F
+from django.test import TestCase
+
+from pint import DimensionalityError
+
+from quantityfield.expressions import ConvertUnits
+from quantityfield.units import ureg
+from tests.dummyapp.models import HayBale, OffsetUnitFloatFieldSaveModel
+
+Quantity = ureg.Quantity
+
+
+@pytest.mark.django_db
+class TestConvertUnits(TestCase):
+    def setUp(self):
+        HayBale.objects.create(name="heavy", weight=1000, weight_int=3000)
+        HayBale.objects.create(name="light", weight=500)
+
+    def test_annotate(self):
+        obj = HayBale.objects.annotate(pounds=ConvertUnits("weight", "pound")).get(
+            name="heavy"
+        )
+        self.assertIsInstance(obj.pounds, Quantity)
+        self.assertEqual(obj.pounds.units, ureg.pound)
+        self.assertAlmostEqual(obj.pounds.magnitude, 2.20462262185)
+
+    def test_values(self):
+        result = HayBale.objects.order_by("name").values(
+            "name", kg=ConvertUnits(F("weight_int"), "kilogram")
+        )
+        self.assertEqual(
+            list(result),
+            [
+                {"name": "heavy", "kg": Quantity(3, ureg.kilogram)},
+                {"name": "light", "kg": None},
+            ],
+        )
+
+    def test_order_by(self):
+        names = HayBale.objects.order_by(
+            ConvertUnits("weight", "ounce").desc()
+        ).values_list("name", flat=True)
+        self.assertEqual(list(names), ["heavy", "light"])
+
+    def test_filter_on_annotation(self):
+        qs = HayBale.objects.annotate(pounds=ConvertUnits("weight", "pound"))
+        self.assertEqual(qs.filter(pounds__gt=Quantity(600, ureg.gram)).count(), 1)
+
+    def test_same_unit_is_not_converted(self):
+        qs = HayBale.objects.values_list(ConvertUnits("weight", "g"), flat=True)
+        self.assertNotIn("*", str(qs.query).split("FROM")[0])
+
+    def test_offset_units(self):
+        OffsetUnitFloatFieldSaveModel.objects.create(name="boiling", weight=100)
+        result = OffsetUnitFloatFieldSaveModel.objects.values_list(
+            ConvertUnits("weight", "degF"), flat=True
+        ).get()
+        self.assertAlmostEqual(result.magnitude, 212)
+        self.assertEqual(result.units, ureg.degF)
+
+    def test_incompatible_units(self):
+        with self.assertRaises(DimensionalityError):
+            HayBale.objects.annotate(x=ConvertUnits("weight", "meter"))
+
+    def test_no_quantity_field(self):
+        with self.assertRaises(ValueError):
+            HayBale.objects.annotate(x=ConvertUnits("id", "meter"))
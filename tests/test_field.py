@@ -8,18 +8,20 @@ import django.core.exceptions
 import django.core.validators
 from django.core.serializers import deserialize, serialize
 from django.db import transaction
-from django.db.models import Field, Model
+from django.db.models import Field, Max, Model
 from django.test import TestCase, override_settings
 from django.utils.translation import override as translation_override
 
 from pint import DimensionalityError, UndefinedUnitError, UnitRegistry
 
+from quantityfield.aggregates import QuantityMax
 from quantityfield.fields import (
     BigIntegerQuantityField,
     DecimalQuantityField,
     DecimalQuantityFormField,
     IntegerQuantityField,
     IntegerQuantityFormField,
+    LazyQuantityDescriptor,
     PositiveIntegerQuantityField,
     QuantityField,
     QuantityFieldMixin,
@@ -39,6 +41,7 @@ from tests.dummyapp.models import (
     FieldSaveModel,
     FloatFieldSaveModel,
     IntFieldSaveModel,
+    LazyHayBale,
     OffsetUnitFloatFieldSaveModel,
 )
 
@@ -627,3 +630,62 @@ class TestLocalization(TestCase):
             # Standard dot decimal separator should still work without localization
             result = field.clean("1.5")
             self.assertAlmostEqual(result.magnitude, 1.5)
+
+
+@pytest.mark.django_db
+class TestLazyQuantityField(TestCase):
+    def setUp(self):
+        LazyHayBale.objects.create(
+            name="lazy", weight=2 * ureg.kilogram, weight_decimal=Decimal("5")
+        )
+
+    def tearDown(self):
+        LazyHayBale.objects.all().delete()
+
+    def test_magnitude_kept_until_access(self):
+        obj = LazyHayBale.objects.get()
+        self.assertEqual(obj.__dict__["weight"], 2000)
+        self.assertNotIsInstance(obj.__dict__["weight"], Quantity)
+        self.assertEqual(obj.weight, Quantity(2000, ureg.gram))
+        self.assertIsInstance(obj.__dict__["weight"], Quantity)
+
+    def test_decimal_magnitude(self):
+        obj = LazyHayBale.objects.get()
+        self.assertEqual(str(obj.weight_decimal), "5.00 gram")
+
+    def test_deferred(self):
+        obj = LazyHayBale.objects.defer("weight").get()
+        self.assertEqual(obj.weight, Quantity(2000, ureg.gram))
+
+    def test_values_list_returns_magnitude(self):
+        self.assertEqual(
+            list(LazyHayBale.objects.values_list("weight", flat=True)), [2000]
+        )
+        self.assertEqual(list(LazyHayBale.objects.values("weight")), [{"weight": 2000}])
+
+    def test_aggregate(self):
+        result = LazyHayBale.objects.aggregate(
+            plain=Max("weight"), quantity=QuantityMax("weight")
+        )
+        self.assertEqual(result["plain"], 2000)
+        self.assertNotIsInstance(result["plain"], Quantity)
+        self.assertEqual(result["quantity"], Quantity(2000, ureg.gram))
+
+    def test_descriptor_class(self):
+        self.assertIsInstance(LazyHayBale.__dict__["weight"], LazyQuantityDescriptor)
+        self.assertIs(
+            QuantityField("gram", lazy=True).descriptor_class, LazyQuantityDescriptor
+        )
+        self.assertIsNot(QuantityField("gram").descriptor_class, LazyQuantityDescriptor)
+
+    def test_save_after_load(self):
+        obj = LazyHayBale.objects.get()
+        obj.name = "saved"
+        obj.save()
+        obj.refresh_from_db()
+        self.assertEqual(obj.weight, Quantity(2000, ureg.gram))
+
+    def test_deconstruct(self):
+        field = LazyHayBale._meta.get_field("weight")
+        self.assertTrue(field.deconstruct()[3]["lazy"])
+        self.assertNotIn("lazy", QuantityField("gram").deconstruct()[3])
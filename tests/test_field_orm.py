@@ -1,17 +1,34 @@
+import warnings
 from decimal import Decimal
+from unittest import mock
 
 import pytest
 
-from django.db.models import Min, Subquery
-from django.test import TestCase
+from django.core.exceptions import ValidationError
+from django.db.models import F, Min, QuerySet, Subquery
+from django.forms import modelform_factory
+from django.test import TestCase, override_settings
 
+from pint import DimensionalityError, UnitRegistry
+
+import quantityfield.settings as qf_settings
+from quantityfield.fields import (
+    QuantityField,
+    QuantityInterval,
+    QuantityWithUnitField,
+)
+from quantityfield.helper import UnitTable
+from quantityfield.settings import get_unit_table
 from quantityfield.units import ureg
 from tests.dummyapp.models import (
     BigIntFieldSaveModel,
     DecimalFieldSaveModel,
     EmptyHayBalePositiveInt,
     FloatFieldSaveModel,
+    HayBale,
     IntFieldSaveModel,
+    OperatingRange,
+    UnitPreservingHayBale,
 )
 
 Quantity = ureg.Quantity
@@ -81,3 +98,381 @@ class TestBigIntegerQuantityFieldORM(BaseMixinQuantityFieldORM, TestCase):
 class TestPositiveIntegerQuantityFieldORM(BaseMixinQuantityFieldORM, TestCase):
     MODEL = EmptyHayBalePositiveInt
     EXPECTED_TYPE = int
+
+
+@pytest.mark.django_db
+class TestBulkOperations(TestCase):
+    def test_bulk_create_converts_units(self):
+        weights = [1 * ureg.kilogram, 500 * ureg.gram, 2.5, 16 * ureg.ounce, None]
+        objs = [
+            HayBale(name=str(i), weight=weight or 0, weight_int=weight)
+            for i, weight in enumerate(weights)
+        ]
+        HayBale.objects.bulk_create(objs)
+        result = list(HayBale.objects.order_by("name"))
+        self.assertEqual(result[0].weight, Quantity(1000.0, ureg.gram))
+        self.assertEqual(result[1].weight, Quantity(500.0, ureg.gram))
+        self.assertEqual(result[2].weight, Quantity(2.5, ureg.gram))
+        self.assertAlmostEqual(result[3].weight.magnitude, 453.59237)
+        self.assertEqual(result[3].weight_int, Quantity(453, ureg.gram))
+        self.assertIsNone(result[4].weight_int)
+        # The original values are kept on the objects
+        self.assertEqual(objs[0].weight, 1 * ureg.kilogram)
+
+    def test_bulk_create_many_values(self):
+        HayBale.objects.bulk_create(
+            HayBale(name="many", weight=i * ureg.kilogram) for i in range(200)
+        )
+        self.assertEqual(
+            HayBale.objects.filter(weight=199000).get().weight,
+            Quantity(199000.0, ureg.gram),
+        )
+
+    def test_bulk_create_restores_values_on_error(self):
+        objs = [HayBale(name="a", weight=1 * ureg.kilogram, weight_int=1 * ureg.meter)]
+        with self.assertRaises(DimensionalityError):
+            HayBale.objects.bulk_create(objs)
+        self.assertEqual(objs[0].weight, 1 * ureg.kilogram)
+
+    def test_bulk_update(self):
+        obj = HayBale.objects.create(name="a", weight=1)
+        obj.weight = 2 * ureg.kilogram
+        obj.weight_int = F("weight")
+        HayBale.objects.bulk_update([obj], ["weight", "weight_int"])
+        obj.refresh_from_db()
+        self.assertEqual(obj.weight, Quantity(2000.0, ureg.gram))
+        self.assertEqual(obj.weight_int, Quantity(1, ureg.gram))
+
+    def test_decimal_bulk_create(self):
+        DecimalFieldSaveModel.objects.bulk_create(
+            [
+                DecimalFieldSaveModel(name="a", weight=Decimal("1.5") * ureg.kilogram),
+                DecimalFieldSaveModel(name="b", weight=Decimal("2.25")),
+            ]
+        )
+        self.assertEqual(
+            [
+                obj.weight.magnitude
+                for obj in DecimalFieldSaveModel.objects.order_by("name")
+            ],
+            [Decimal("1500.00"), Decimal("2.25")],
+        )
+
+
+class TestGetPrepValues(TestCase):
+    def test_matches_get_prep_value(self):
+        field = QuantityField("gram")
+        values = [
+            1 * ureg.kilogram,
+            2 * ureg.kilogram,
+            3,
+            None,
+            Quantity(Decimal("4"), ureg.ounce),
+            UnitRegistry().Quantity(5, "kg"),
+        ]
+        with warnings.catch_warnings():
+            warnings.simplefilter("ignore")
+            self.assertEqual(
+                field.get_prep_values(values),
+                [field.get_prep_value(value) for value in values],
+            )
+
+    def test_without_numpy(self):
+        field = QuantityField("gram")
+        values = [i * ureg.kilogram for i in range(100)]
+        with mock.patch("quantityfield.helper.optional_numpy", return_value=None):
+            self.assertEqual(
+                field.get_prep_values(values), [i * 1000.0 for i in range(100)]
+            )
+
+
+class TestQuantityWithUnitField(TestCase):
+    def test_keeps_unit(self):
+        UnitPreservingHayBale.objects.create(name="a", weight=Quantity(1.5, "kilogram"))
+        bale = UnitPreservingHayBale.objects.get(name="a")
+        assert str(bale.weight.units) == "kilogram"
+        assert bale.weight.magnitude == 1.5
+        assert bale.weight_unit == 1
+
+    def test_base_unit_and_plain_numbers(self):
+        bale = UnitPreservingHayBale.objects.create(name="a", weight=20)
+        bale.refresh_from_db()
+        assert bale.weight == Quantity(20, "gram")
+        assert str(bale.weight.units) == "gram"
+
+    def test_unit_not_in_choices(self):
+        bale = UnitPreservingHayBale.objects.create(
+            name="a", weight=Quantity(2, "ounce")
+        )
+        bale.refresh_from_db()
+        assert str(bale.weight.units) == "gram"
+        assert bale.weight.magnitude == pytest.approx(56.699, rel=1e-4)
+
+    def test_filter_and_order_on_base_units(self):
+        UnitPreservingHayBale.objects.create(name="kg", weight=Quantity(1, "kg"))
+        UnitPreservingHayBale.objects.create(name="lb", weight=Quantity(1, "lb"))
+        UnitPreservingHayBale.objects.create(name="g", weight=Quantity(600, "g"))
+        names = UnitPreservingHayBale.objects.order_by("weight").values_list(
+            "name", flat=True
+        )
+        assert list(names) == ["lb", "g", "kg"]
+        heavy = UnitPreservingHayBale.objects.filter(weight__gt=Quantity(500, "g"))
+        assert {bale.name for bale in heavy} == {"g", "kg"}
+        in_range = UnitPreservingHayBale.objects.filter(
+            weight__range=(Quantity(0.4, "kg"), Quantity(0.5, "kg"))
+        )
+        assert [bale.name for bale in in_range] == ["lb"]
+
+    def test_update_unit(self):
+        bale = UnitPreservingHayBale.objects.create(name="a", weight=Quantity(1, "kg"))
+        bale.weight = Quantity(3, "lb")
+        bale.save()
+        bale = UnitPreservingHayBale.objects.get(pk=bale.pk)
+        assert bale.weight == Quantity(3, "lb")
+        assert str(bale.weight.units) == "pound"
+
+    def test_bulk_create_keeps_units(self):
+        objs = [
+            UnitPreservingHayBale(name="a", weight=Quantity(2, "kg")),
+            UnitPreservingHayBale(name="b", weight=Quantity(2, "lb")),
+        ]
+        UnitPreservingHayBale.objects.bulk_create(objs)
+        assert str(objs[0].weight.units) == "kilogram"
+        loaded = {
+            bale.name: bale.weight for bale in UnitPreservingHayBale.objects.all()
+        }
+        assert str(loaded["a"].units) == "kilogram"
+        assert str(loaded["b"].units) == "pound"
+        assert loaded["b"].magnitude == 2
+
+    def test_queryset_update_replaces_stale_unit(self):
+        bale = UnitPreservingHayBale.objects.create(name="a", weight=Quantity(2, "kg"))
+        UnitPreservingHayBale.objects.update(weight=Quantity(5, "lb"))
+        bale = UnitPreservingHayBale.objects.get(pk=bale.pk)
+        assert bale.weight.to("gram").magnitude == pytest.approx(2267.96, rel=1e-6)
+        assert str(bale.weight.units) == "gram"
+        # Saving writes companion fields matching the field again
+        bale.save()
+        assert UnitPreservingHayBale.objects.values_list(
+            "weight_magnitude", "weight_unit"
+        ).get() == (pytest.approx(2267.96, rel=1e-6), bale.weight_unit)
+
+    def test_bulk_update_replaces_stale_unit(self):
+        bale = UnitPreservingHayBale.objects.create(name="a", weight=Quantity(2, "kg"))
+        bale.weight = Quantity(5, "lb")
+        UnitPreservingHayBale.objects.bulk_update([bale], ["weight"])
+        bale = UnitPreservingHayBale.objects.get(pk=bale.pk)
+        assert bale.weight.to("pound").magnitude == pytest.approx(5)
+
+    def test_deferred_unit_fields_not_saved(self):
+        UnitPreservingHayBale.objects.create(name="a", weight=Quantity(3, "lb"))
+        bale = UnitPreservingHayBale.objects.only("name", "weight").get()
+        assert bale.get_deferred_fields() == {"weight_magnitude", "weight_unit"}
+        assert bale.weight.to("pound").magnitude == pytest.approx(3)
+        bale.name = "b"
+        bale.save()
+        bale = UnitPreservingHayBale.objects.get()
+        assert bale.weight == Quantity(3, "lb")
+        assert str(bale.weight.units) == "pound"
+
+    def test_assign_with_deferred_unit_fields(self):
+        UnitPreservingHayBale.objects.create(name="a", weight=Quantity(3, "lb"))
+        bale = UnitPreservingHayBale.objects.only("name", "weight").get()
+        bale.weight = Quantity(2, "kg")
+        bale.save()
+        bale = UnitPreservingHayBale.objects.get()
+        assert bale.weight == Quantity(2, "kg")
+        assert str(bale.weight.units) == "kilogram"
+
+    def test_lazy_not_supported(self):
+        with pytest.raises(ValueError, match="lazy"):
+            QuantityWithUnitField("gram", lazy=True)
+
+    def test_unit_table(self):
+        table = UnitTable(ureg, ["pound", "gram", "kilogram"])
+        field = QuantityWithUnitField("gram", unit_table=table)
+        field.set_attributes_from_name("weight")
+        self.assertEqual(field.base_unit_code, 1)
+        bale = UnitPreservingHayBale(name="a")
+        field.set_unit_fields(bale, Quantity(2, "kg"))
+        self.assertEqual((bale.weight_magnitude, bale.weight_unit), (2, 2))
+
+    def test_deconstruct_unit_table(self):
+        field = QuantityWithUnitField("gram", unit_choices=["kilogram"])
+        self.assertNotIn("unit_table", field.deconstruct()[3])
+        table = UnitTable(ureg, ["pound", "gram"])
+        field = QuantityWithUnitField("gram", unit_table=table)
+        kwargs = field.deconstruct()[3]
+        self.assertEqual(kwargs["unit_table"], ["pound", "gram"])
+        self.assertEqual(QuantityWithUnitField(**kwargs).unit_table.units, table.units)
+
+    def test_deconstruct_unit_table_of_setting(self):
+        with mock.patch.dict(qf_settings._unit_tables, clear=True):
+            with override_settings(DJANGO_PINT_UNIT_CODES=["gram", "kilogram"]):
+                field = QuantityWithUnitField("gram", unit_table=get_unit_table())
+                kwargs = field.deconstruct()[3]
+                self.assertEqual(kwargs["unit_table"], "DJANGO_PINT_UNIT_CODES")
+                self.assertIs(
+                    QuantityWithUnitField(**kwargs).unit_table, get_unit_table()
+                )
+
+    def test_unit_table_without_base_unit(self):
+        with pytest.raises(ValueError, match="base unit"):
+            QuantityWithUnitField("gram", unit_table=UnitTable(ureg, ["kilogram"]))
+
+
+class TestQuantityRangeField(TestCase):
+    def setUp(self):
+        OperatingRange.objects.create(
+            name="small", weight=(Quantity(10, "kg"), Quantity(12, "kg"))
+        )
+        OperatingRange.objects.create(
+            name="large",
+            weight=QuantityInterval(Quantity(11, "kg"), Quantity(20, "kg")),
+        )
+        OperatingRange.objects.create(name="none", weight=None)
+
+    def names(self, **filters):
+        return set(
+            OperatingRange.objects.filter(**filters).values_list("name", flat=True)
+        )
+
+    def test_round_trip(self):
+        value = OperatingRange.objects.get(name="small").weight
+        assert isinstance(value, QuantityInterval)
+        assert value == (Quantity(10, "kg"), Quantity(12, "kg"))
+        assert value.lower.units == ureg.kilogram
+        assert OperatingRange.objects.get(name="none").weight is None
+
+    def test_converts_bounds(self):
+        item = OperatingRange.objects.create(
+            name="gram", weight=(Quantity(500, "g"), Quantity(1, "kg"))
+        )
+        assert item.weight_upper == 1
+        item = OperatingRange.objects.get(name="gram")
+        assert item.weight.lower.magnitude == pytest.approx(0.5)
+        assert item.weight_upper == 1
+
+    def test_overlaps(self):
+        assert self.names(
+            weight__overlaps=(Quantity(12500, "g"), Quantity(13, "kg"))
+        ) == {"large"}
+        assert self.names(
+            weight__overlaps=(Quantity(12, "kg"), Quantity(30, "kg"))
+        ) == {
+            "small",
+            "large",
+        }
+        assert (
+            self.names(weight__overlaps=(Quantity(1, "kg"), Quantity(5, "kg"))) == set()
+        )
+
+    def test_contains(self):
+        assert self.names(weight__contains=Quantity(11500, "g")) == {"small", "large"}
+        assert self.names(
+            weight__contains=(Quantity(10, "kg"), Quantity(11.5, "kg"))
+        ) == {"small"}
+
+    def test_contained_by(self):
+        assert self.names(
+            weight__contained_by=(Quantity(9, "kg"), Quantity(15, "kg"))
+        ) == {"small"}
+
+    def test_exact(self):
+        assert self.names(weight=(Quantity(10, "kg"), Quantity(12000, "g"))) == {
+            "small"
+        }
+        assert self.names(weight__isnull=True) == {"none"}
+
+    def test_sargable_sql(self):
+        sql = str(
+            OperatingRange.objects.filter(
+                weight__overlaps=(Quantity(1, "kg"), Quantity(2, "kg"))
+            ).query
+        )
+        assert '"weight" <= 2.0' in sql
+        assert '"weight_upper" >= 1.0' in sql
+        index = OperatingRange._meta.indexes[0]
+        assert index.fields == ["weight", "weight_upper"]
+
+    def test_update_and_bulk_create(self):
+        item = OperatingRange.objects.get(name="small")
+        item.weight = (Quantity(1, "kg"), Quantity(2, "kg"))
+        item.save()
+        OperatingRange.objects.bulk_create(
+            [OperatingRange(name="bulk", weight=(Quantity(3, "g"), Quantity(4, "kg")))]
+        )
+        assert OperatingRange.objects.get(name="small").weight.upper == Quantity(
+            2, "kg"
+        )
+        bulk = OperatingRange.objects.get(name="bulk").weight
+        assert bulk.lower.magnitude == pytest.approx(0.003)
+        assert bulk.upper == Quantity(4, "kg")
+
+    def test_queryset_update(self):
+        OperatingRange.objects.filter(name="small").update(
+            weight=(Quantity(1, "kg"), Quantity(2000, "g"))
+        )
+        item = OperatingRange.objects.get(name="small")
+        assert item.weight == (Quantity(1, "kg"), Quantity(2, "kg"))
+        assert item.weight_upper == 2
+        OperatingRange.objects.filter(name="large").update(weight=None)
+        assert OperatingRange.objects.get(name="large").weight_upper is None
+        item.weight = QuantityInterval(Quantity(3, "kg"), Quantity(4, "kg"))
+        OperatingRange.objects.bulk_update([item], ["weight", "weight_upper"])
+        assert OperatingRange.objects.get(name="small").weight.upper == Quantity(
+            4, "kg"
+        )
+
+    def test_update_without_quantity_queryset(self):
+        queryset = QuerySet(OperatingRange).filter(name="small")
+        with pytest.raises(ValueError, match="weight_upper"):
+            queryset.update(weight=(Quantity(1, "kg"), Quantity(2, "kg")))
+        with pytest.raises(ValueError, match="weight_upper"):
+            queryset.update(
+                weight=QuantityInterval(Quantity(1, "kg"), Quantity(2, "kg"))
+            )
+
+    def test_full_clean(self):
+        item = OperatingRange.objects.get(name="small")
+        item.full_clean()
+        item.weight = (Quantity(500, "g"), Quantity(1, "kg"))
+        item.full_clean()
+        assert item.weight == (Quantity(0.5, "kg"), Quantity(1, "kg"))
+        with pytest.raises(ValidationError) as error:
+            OperatingRange(name="single", weight=Quantity(1, "kg")).full_clean()
+        assert "weight" in error.value.message_dict
+
+    def test_scalar_assignment(self):
+        item = OperatingRange.objects.get(name="small")
+        with pytest.raises(ValueError, match="interval"):
+            item.weight = Quantity(5, "kg")
+        assert item.weight == (Quantity(10, "kg"), Quantity(12, "kg"))
+        with pytest.raises(ValidationError, match="lower bound"):
+            item.weight = (Quantity(5, "kg"), Quantity(2, "kg"))
+        assert item.weight_upper == 12
+        with pytest.raises(ValueError, match="interval"):
+            OperatingRange.objects.create(name="single", weight=Quantity(1, "kg"))
+
+    def test_no_form_field(self):
+        assert OperatingRange._meta.get_field("weight").formfield() is None
+        form_class = modelform_factory(OperatingRange, exclude=[])
+        assert list(form_class.base_fields) == ["name"]
+
+    def test_invalid_values(self):
+        with pytest.raises(ValidationError, match="lower bound"):
+            OperatingRange(weight=(Quantity(2, "kg"), Quantity(1, "kg")))
+        with pytest.raises(ValueError, match="interval"):
+            OperatingRange.objects.filter(weight__overlaps=Quantity(1, "kg"))
+        with pytest.raises(DimensionalityError):
+            OperatingRange.objects.filter(weight__contains=Quantity(1, "m"))
+
+    def test_interval(self):
+        interval = QuantityInterval(Quantity(1, "kg"), Quantity(2, "kg"))
+        assert interval.contains(Quantity(1500, "g"))
+        assert not interval.contains(Quantity(3, "kg"))
+        assert interval.contains(QuantityInterval(Quantity(1, "kg"), Quantity(2, "kg")))
+        assert interval.overlaps(QuantityInterval(Quantity(2, "kg"), Quantity(3, "kg")))
+        assert not interval.overlaps(
+            QuantityInterval(Quantity(3, "kg"), Quantity(4, "kg"))
+        )
@@ -1,6 +1,9 @@
+import warnings
+from unittest import mock
+
 from django.test import TestCase
 
-from pint import Context, DimensionalityError
+from pint import Context, DimensionalityError, UnitRegistry
 
 import quantityfield.fields as fields
 import quantityfield.helper as helper
@@ -105,3 +108,209 @@ class TestContextHandling(TestCase):
         # Clean up by disabling and removing the context
         ureg.disable_contexts()
         ureg.remove_context("earth")
+
+
+class TestUnitConversionPlan(TestCase):
+    def test_base_unit_resolved(self):
+        plan = helper.UnitConversionPlan(ureg, "gram", ["gram", "ounce"])
+        self.assertEqual(plan.base_unit, ureg.gram)
+        self.assertIn(ureg.ounce, plan.factors)
+
+    def test_same_unit_keeps_magnitude(self):
+        plan = helper.UnitConversionPlan(ureg, "gram", ["gram"])
+        magnitude = plan.to_base_magnitude(ureg.Quantity(3, "g"))
+        self.assertEqual(magnitude, 3)
+        self.assertIsInstance(magnitude, int)
+
+    def test_matches_pint_conversion(self):
+        plan = helper.UnitConversionPlan(ureg, "gram", ["gram", "ounce"])
+        for quantity in (10 * ureg.ounce, 2.5 * ureg.kilogram, 7 * ureg.pound):
+            self.assertAlmostEqual(
+                plan.to_base_magnitude(quantity), quantity.to("gram").magnitude
+            )
+
+    def test_offset_units(self):
+        plan = helper.UnitConversionPlan(ureg, "degC", ["degC", "degF"])
+        quantity = ureg.Quantity(212, ureg.degF)
+        self.assertAlmostEqual(plan.to_base_magnitude(quantity), 100)
+
+    def test_offset_units_precision(self):
+        for base_units in ("degC", "kelvin", "degF"):
+            plan = helper.UnitConversionPlan(ureg, base_units, ["degC", "degF"])
+            for magnitude, units in ((212, "degF"), (32, "degF"), (-40, "degC")):
+                quantity = ureg.Quantity(magnitude, units)
+                expected = quantity.to(base_units).magnitude
+                self.assertAlmostEqual(
+                    plan.to_base_magnitude(quantity), expected, delta=1e-13
+                )
+
+    def test_logarithmic_units_converted_by_pint(self):
+        plan = helper.UnitConversionPlan(ureg, "watt", ["watt", "dBm"])
+        self.assertIsNone(plan.get_factors(ureg.dBm))
+        self.assertNotIn(ureg.dBm, plan.factors)
+        quantity = ureg.Quantity(30, "dBm")
+        self.assertAlmostEqual(plan.to_base_magnitude(quantity), 1)
+        for magnitude, expected in zip(
+            plan.to_base_magnitudes([30, 40], ureg.dBm), [1, 10], strict=True
+        ):
+            self.assertAlmostEqual(magnitude, expected)
+
+    def test_logarithmic_base_unit(self):
+        plan = helper.UnitConversionPlan(ureg, "dBm", ["watt"])
+        self.assertIsNone(plan.get_factors(ureg.watt))
+        self.assertAlmostEqual(plan.to_base_magnitude(ureg.Quantity(1, "W")), 30)
+
+    def test_field_stores_logarithmic_units(self):
+        field = fields.QuantityField("watt", unit_choices=["dBm"])
+        self.assertAlmostEqual(field.get_prep_value(ureg.Quantity(30, "dBm")), 1)
+
+    def test_context_conversion_not_cached(self):
+        context = Context("plan_earth")
+        context.add_transformation(
+            "[force]", "[mass]", lambda ureg, x: x / ureg.gravity
+        )
+        ureg.add_context(context)
+        try:
+            with ureg.context("plan_earth"):
+                plan = helper.UnitConversionPlan(ureg, "kg", ["kg", "newton"])
+                self.assertAlmostEqual(plan.to_base_magnitude(9.80665 * ureg.newton), 1)
+            self.assertNotIn(ureg.newton, plan.factors)
+        finally:
+            ureg.remove_context("plan_earth")
+
+    def test_context_redefinition(self):
+        context = Context("plan_pound")
+        context.redefine("pound = 0.5 kg")
+        ureg.add_context(context)
+        try:
+            plan = helper.UnitConversionPlan(ureg, "kg", ["kg", "pound"])
+            with ureg.context("plan_pound"):
+                self.assertEqual(plan.to_base_magnitude(1.0 * ureg.pound), 0.5)
+                self.assertEqual(plan.to_base_magnitudes([2.0], ureg.pound), [1.0])
+                in_context = helper.UnitConversionPlan(ureg, "kg", ["kg", "pound"])
+            self.assertAlmostEqual(plan.to_base_magnitude(1.0 * ureg.pound), 0.45359237)
+            self.assertAlmostEqual(
+                in_context.to_base_magnitude(1.0 * ureg.pound), 0.45359237
+            )
+        finally:
+            ureg.remove_context("plan_pound")
+
+    def test_missing_pint_internals(self):
+        with mock.patch.object(type(ureg), "_is_multiplicative", None, create=True):
+            self.assertIsNone(helper.get_root_conversion(ureg, ureg.pound))
+            plan = helper.UnitConversionPlan(ureg, "kg", ["kg", "pound"])
+            self.assertIsNone(plan.get_factors(ureg.pound))
+        self.assertAlmostEqual(plan.to_base_magnitude(1.0 * ureg.pound), 0.45359237)
+
+
+class TestForeignUnitCache(TestCase):
+    def test_translate_once(self):
+        cache = helper.ForeignUnitCache()
+        foreign = UnitRegistry()
+        unit, is_new = cache.translate(ureg, foreign.kilogram)
+        self.assertEqual(unit, ureg.kilogram)
+        self.assertTrue(is_new)
+        unit, is_new = cache.translate(ureg, foreign.kilogram)
+        self.assertEqual(unit, ureg.kilogram)
+        self.assertFalse(is_new)
+
+    def test_bounded(self):
+        cache = helper.ForeignUnitCache(maxsize=2)
+        foreign = UnitRegistry()
+        for unit in (foreign.gram, foreign.meter, foreign.second):
+            cache.translate(ureg, unit)
+        self.assertEqual(len(cache._units), 2)
+        self.assertTrue(cache.translate(ureg, foreign.gram)[1])
+
+
+class TestFixUnitRegistry(TestCase):
+    def setUp(self):
+        fields.QuantityFieldMixin.foreign_unit_cache.clear()
+
+    def test_warns_once_per_unit(self):
+        field = fields.QuantityField("gram")
+        foreign = UnitRegistry()
+        with warnings.catch_warnings(record=True) as w:
+            warnings.simplefilter("always")
+            for _ in range(3):
+                value = field.fix_unit_registry(5 * foreign.kilogram)
+        self.assertEqual(len(w), 1)
+        self.assertIsInstance(value, ureg.Quantity)
+        self.assertEqual(value, 5 * ureg.kilogram)
+
+    def test_offset_unit(self):
+        field = fields.QuantityField("degC")
+        foreign = UnitRegistry()
+        with self.assertWarns(RuntimeWarning):
+            value = field.fix_unit_registry(foreign.Quantity(20, "degF"))
+        self.assertEqual(value, ureg.Quantity(20, "degF"))
+
+
+class TestMatchingUnitDimensionCache(TestCase):
+    def tearDown(self):
+        helper.clear_matching_unit_dimension_cache()
+
+    def test_result_cached(self):
+        registry = UnitRegistry()
+        helper.check_matching_unit_dimension(registry, "meter", ["mile", "foot"])
+        self.assertIn(
+            ("meter", frozenset(["mile", "foot"])),
+            helper._matching_unit_dimensions[registry],
+        )
+
+    def test_invalidation(self):
+        registry = UnitRegistry()
+        registry.define("stick = [stick]")
+        helper.check_matching_unit_dimension(registry, "stick", ["stick"])
+        helper.clear_matching_unit_dimension_cache(registry)
+        self.assertNotIn(registry, helper._matching_unit_dimensions)
+
+    def test_failure_not_cached(self):
+        registry = UnitRegistry()
+        with self.assertRaises(DimensionalityError):
+            helper.check_matching_unit_dimension(registry, "meter", ["kg"])
+        self.assertNotIn(registry, helper._matching_unit_dimensions)
+
+
+class TestUnitTable(TestCase):
+    def test_codes_are_positions(self):
+        table = helper.UnitTable(ureg, ["gram", "kg", "pound"])
+        self.assertEqual(len(table), 3)
+        self.assertEqual(table.get_code("gram"), 0)
+        self.assertEqual(table.get_code(ureg.kilogram), 1)
+        self.assertEqual(table.get_code("lb"), 2)
+        self.assertIs(table.get_unit(1), table.units[1])
+        self.assertEqual(table.get_unit(2), ureg.pound)
+
+    def test_unknown_units_and_codes(self):
+        table = helper.UnitTable(ureg, ["gram"])
+        self.assertIsNone(table.get_code("meter"))
+        self.assertNotIn("meter", table)
+        with self.assertRaises(ValueError):
+            table.get_unit(1)
+        with self.assertRaises(ValueError):
+            table.get_unit(-1)
+        with self.assertRaises(ValueError):
+            table.encode(ureg.Quantity(1, "meter"))
+
+    def test_intern_appends(self):
+        table = helper.UnitTable(ureg, ["gram", "gram"])
+        self.assertEqual(len(table), 1)
+        self.assertEqual(table.intern("kilogram"), 1)
+        self.assertEqual(table.intern("kg"), 1)
+        self.assertEqual(table.intern("gram"), 0)
+        self.assertIn("kilogram", table)
+
+    def test_foreign_registry_units(self):
+        table = helper.UnitTable(ureg, ["gram", "kilogram"])
+        other = UnitRegistry()
+        self.assertEqual(table.get_code(other.kilogram), 1)
+        self.assertEqual(table.intern(other.gram), 0)
+
+    def test_encode_decode(self):
+        table = helper.UnitTable(ureg, ["gram", "kilogram"])
+        magnitude, code = table.encode(ureg.Quantity(1.5, "kg"))
+        self.assertEqual((magnitude, code), (1.5, 1))
+        value = table.decode(magnitude, code)
+        self.assertEqual(value, ureg.Quantity(1.5, "kg"))
+        self.assertEqual(str(value.units), "kilogram")
@@ -0,0 +1,279 @@
+from decimal import Decimal
+from io import StringIO
+from unittest import mock
+
+import pytest
+
+from django.core.exceptions import NON_FIELD_ERRORS
+from django.core.management import CommandError, call_command
+from django.test import TestCase
+
+from pint import DimensionalityError
+
+from quantityfield.export import QuantityCsvExporter
+from quantityfield.helper import UnitParseCache
+from quantityfield.importer import QuantityCsvImporter, RowError, split_quantity
+from quantityfield.units import ureg
+from tests.dummyapp.models import (
+    ChoicesDefinedInModel,
+    ConstrainedHayBale,
+    DecimalFieldSaveModel,
+    HayBale,
+    OffsetUnitFloatFieldSaveModel,
+    OperatingRange,
+)
+
+Quantity = ureg.Quantity
+
+
+@pytest.mark.parametrize(
+    "text,expected",
+    [
+        ("12.5 kg", ("12.5", "kg")),
+        ("300g", ("300", "g")),
+        (" -1.2e3  t ", ("-1.2e3", "t")),
+        (".5 degC", (".5", "degC")),
+        ("7", ("7", "")),
+        ("4 kg / m", ("4", "kg / m")),
+    ],
+)
+def test_split_quantity(text, expected):
+    assert split_quantity(text) == expected
+
+
+@pytest.mark.parametrize("text", ["kg", "", "e5 kg", "- 5 kg"])
+def test_split_quantity_invalid(text):
+    with pytest.raises(ValueError, match="is not a quantity"):
+        split_quantity(text)
+
+
+@pytest.mark.parametrize("text", ["1/0", "kg)", "(", "g*", ","])
+def test_unit_parse_cache_malformed(text):
+    with pytest.raises(ValueError, match="no valid unit"):
+        UnitParseCache().parse(ureg, text)
+
+
+def test_unit_parse_cache():
+    cache = UnitParseCache(maxsize=2)
+    kilogram = cache.parse(ureg, "kg")
+    assert kilogram == ureg.kilogram
+    cache.parse(ureg, "g")
+    with mock.patch.object(ureg, "Unit", wraps=ureg.Unit) as parse:
+        assert cache.parse(ureg, "kg") is kilogram
+        parse.assert_not_called()
+        # The least recently used unit is dropped
+        cache.parse(ureg, "t")
+        cache.parse(ureg, "g")
+    # Unit calls itself recursively with the parsed units
+    assert [
+        call.args for call in parse.call_args_list if isinstance(call.args[0], str)
+    ] == [
+        ("t",),
+        ("g",),
+    ]
+    assert len(cache) == 2
+    cache.clear()
+    assert len(cache) == 0
+
+
+def csv_file(*lines):
+    return StringIO("\n".join(lines) + "\n")
+
+
+class TestQuantityCsvImporter(TestCase):
+    def test_import(self):
+        result = QuantityCsvImporter(ChoicesDefinedInModel, chunk_size=2).import_csv(
+            csv_file("weight", "12.5 kg", "300 milligram", "2 lb", "1.5")
+        )
+        assert result == (4, [])
+        weights = ChoicesDefinedInModel.objects.order_by("pk").values_list(
+            "weight", flat=True
+        )
+        assert [weight.m_as("kg") for weight in weights] == pytest.approx(
+            [12.5, 0.0003, 0.90718474, 1.5]
+        )
+
+    def test_units_parsed_once(self):
+        importer = QuantityCsvImporter(HayBale, unit_cache=UnitParseCache())
+        with mock.patch.object(ureg, "Unit", wraps=ureg.Unit) as parse:
+            importer.import_csv(
+                csv_file("name,weight", *(f"bale {i},{i} g" for i in range(20)))
+            )
+        # The unit choices of the column and the unit text of the cells
+        assert [
+            call.args for call in parse.call_args_list if isinstance(call.args[0], str)
+        ] == [("gram",), ("g",)]
+        assert HayBale.objects.count() == 20
+
+    def test_row_errors(self):
+        result = QuantityCsvImporter(HayBale).import_csv(
+            csv_file(
+                "name,weight,weight_int",
+                "ok,1000 g,3 g",
+                "unit,1 m,",
+                "choice,1 g,3 kg",
+                "unknown,1 foo,",
+                "empty,,",
+                "number,heavy,",
+                "malformed,5 g*,",
+                "division,1 g,5 1/0",
+                "ok too,2 g,",
+            )
+        )
+        assert result.created == 2
+        assert result.errors == [
+            RowError(3, "weight", "Unit 'm' is not one of gram."),
+            RowError(4, "weight_int", "Unit 'kg' is not one of gram."),
+            RowError(5, "weight", "Unknown unit 'foo'."),
+            RowError(6, "weight", "This field cannot be empty."),
+            RowError(7, "weight", "'heavy' is not a quantity."),
+            RowError(8, "weight", "Unknown unit 'g*'."),
+            RowError(9, "weight_int", "Unknown unit '1/0'."),
+        ]
+        assert list(
+            HayBale.objects.order_by("pk").values_list("name", "weight", "weight_int")
+        ) == [
+            ("ok", Quantity(1000, "gram"), Quantity(3, "gram")),
+            ("ok too", Quantity(2, "gram"), None),
+        ]
+
+    def test_validators(self):
+        result = QuantityCsvImporter(ConstrainedHayBale).import_csv(
+            csv_file("name,weight", "ok,12 kg", "negative,-5 g")
+        )
+        assert result.created == 1
+        [error] = result.errors
+        assert error.row == 3
+        assert error.field == "weight"
+
+    def test_database_errors(self):
+        HayBale.objects.create(pk=10, name="existing", weight=1)
+        result = QuantityCsvImporter(HayBale, chunk_size=2).import_csv(
+            csv_file("id,name,weight", "1,a,1 g", "2,b,2 g", "3,c,3 g", "10,d,4 g")
+        )
+        assert result.created == 3
+        [error] = result.errors
+        assert (error.row, error.field) == (5, NON_FIELD_ERRORS)
+        assert list(HayBale.objects.order_by("pk").values_list("pk", "name")) == [
+            (1, "a"),
+            (2, "b"),
+            (3, "c"),
+            (10, "existing"),
+        ]
+
+    def test_header_units(self):
+        result = QuantityCsvImporter(OffsetUnitFloatFieldSaveModel).import_csv(
+            csv_file("name,weight [kelvin]", "boiling,373.15", "freezing,0 degC")
+        )
+        assert result == (2, [])
+        weights = OffsetUnitFloatFieldSaveModel.objects.order_by("pk").values_list(
+            "weight", flat=True
+        )
+        assert [weight.m_as("degC") for weight in weights] == pytest.approx([100, 0])
+        with pytest.raises(DimensionalityError):
+            QuantityCsvImporter(HayBale).import_csv(csv_file("weight [meter]"))
+        with pytest.raises(ValueError, match="no valid unit"):
+            QuantityCsvImporter(HayBale).import_csv(csv_file("weight [g*]"))
+
+    def test_decimal(self):
+        result = QuantityCsvImporter(DecimalFieldSaveModel).import_csv(
+            csv_file("name,weight", "a,1.25 g", "b,0.5")
+        )
+        assert result == (2, [])
+        weights = DecimalFieldSaveModel.objects.order_by("pk").values_list(
+            "weight", flat=True
+        )
+        assert [weight.magnitude for weight in weights] == [
+            Decimal("1.25"),
+            Decimal("0.50"),
+        ]
+
+    def test_round_trip(self):
+        HayBale.objects.bulk_create(
+            [HayBale(name=f"bale {i}", weight=i * 250) for i in range(4)]
+        )
+        file = StringIO()
+        QuantityCsvExporter(
+            HayBale.objects.order_by("pk"),
+            fields=["name", "weight"],
+            units={"weight": "kilogram"},
+        ).write(file)
+        HayBale.objects.all().delete()
+        file.seek(0)
+        assert QuantityCsvImporter(HayBale).import_csv(file) == (4, [])
+        assert list(
+            HayBale.objects.order_by("pk").values_list("weight", flat=True)
+        ) == [Quantity(i * 250, "gram") for i in range(4)]
+
+    def test_round_trip_range(self):
+        OperatingRange.objects.create(
+            name="a", weight=(Quantity(500, "gram"), Quantity(2, "kilogram"))
+        )
+        OperatingRange.objects.create(name="none", weight=None)
+        file = StringIO()
+        QuantityCsvExporter(
+            OperatingRange.objects.order_by("pk"),
+            fields=["name", "weight"],
+            units={"weight": "gram"},
+        ).write(file)
+        OperatingRange.objects.all().delete()
+        file.seek(0)
+        assert QuantityCsvImporter(OperatingRange).import_csv(file) == (2, [])
+        a, none = OperatingRange.objects.order_by("pk")
+        assert a.weight.lower == Quantity(0.5, "kilogram")
+        assert a.weight.upper == Quantity(2, "kilogram")
+        assert none.weight is None
+
+    def test_range_bounds(self):
+        importer = QuantityCsvImporter(OperatingRange)
+        result = importer.import_csv(
+            csv_file(
+                "name,weight [gram],weight_upper [gram]",
+                "a,500,2000",
+                "b,3000,2000",
+                "c,500,",
+            )
+        )
+        assert result.created == 1
+        assert [(e.row, e.field) for e in result.errors] == [
+            (3, "weight"),
+            (4, "weight"),
+        ]
+        assert "greater than the upper bound" in result.errors[0].message
+        with pytest.raises(ValueError, match="lower and the upper bound"):
+            importer.import_csv(csv_file("name,weight [gram]"))
+
+    def test_invalid_headers(self):
+        importer = QuantityCsvImporter(HayBale)
+        with pytest.raises(ValueError, match="not a quantity field"):
+            importer.import_csv(csv_file("name [kg]"))
+        with pytest.raises(ValueError, match="chunk_size"):
+            QuantityCsvImporter(HayBale, chunk_size=0)
+
+
+class TestImportCommand(TestCase):
+    def test_import(self):
+        with mock.patch(
+            "builtins.open",
+            mock.mock_open(read_data="name,weight\na,1000 gram\nb,1 m\n"),
+        ):
+            out, err = StringIO(), StringIO()
+            call_command(
+                "quantity_import",
+                "dummyapp.HayBale",
+                "bales.csv",
+                stdout=out,
+                stderr=err,
+            )
+        assert out.getvalue() == "Imported 1 rows, skipped 1 rows.\n"
+        assert err.getvalue() == "Row 3, weight: Unit 'm' is not one of gram.\n"
+        assert HayBale.objects.get().weight == Quantity(1000, "gram")
+
+    def test_invalid_arguments(self):
+        with pytest.raises(CommandError):
+            call_command("quantity_import", "dummyapp.Unknown", "bales.csv")
+        with pytest.raises(CommandError):
+            call_command("quantity_import", "dummyapp.HayBale", "/does/not/exist.csv")
+        with mock.patch("builtins.open", mock.mock_open(read_data="weight [meter]\n")):
+            with pytest.raises(CommandError):
+                call_command("quantity_import", "dummyapp.HayBale", "bales.csv")
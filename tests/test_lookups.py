@@ -0,0 +1,124 @@
+from decimal import Decimal
+
+import pytest
+
+from django.db.models import F
+from django.test import TestCase
+
+from pint import DimensionalityError
+
+from quantityfield.lookups import QuantityApprox, QuantityIn
+from quantityfield.units import ureg
+from tests.dummyapp.models import (
+    DecimalFieldSaveModel,
+    HayBale,
+    OffsetUnitFloatFieldSaveModel,
+)
+
+Quantity = ureg.Quantity
+
+
+@pytest.mark.django_db
+class TestQuantityLookups(TestCase):
+    def setUp(self):
+        self.light = HayBale.objects.create(name="light", weight=500, weight_int=5)
+        self.heavy = HayBale.objects.create(name="heavy", weight=2000, weight_int=20)
+
+    def names(self, **filters):
+        return set(HayBale.objects.filter(**filters).values_list("name", flat=True))
+
+    def test_lookups_registered(self):
+        field = HayBale._meta.get_field("weight")
+        self.assertIs(field.get_lookup("in"), QuantityIn)
+        self.assertIs(field.get_lookup("approx"), QuantityApprox)
+
+    def test_comparisons(self):
+        self.assertEqual(self.names(weight__gt=Quantity(1, "kg")), {"heavy"})
+        self.assertEqual(self.names(weight__gte=Quantity(2, "kg")), {"heavy"})
+        self.assertEqual(self.names(weight__lt=Quantity(1, "kg")), {"light"})
+        self.assertEqual(self.names(weight__lte=500), {"light"})
+        self.assertEqual(self.names(weight=Quantity(0.5, "kg")), {"light"})
+
+    def test_integer_field_fractional_bounds(self):
+        # Rounded like the lookups of Django's IntegerField
+        for lookup, value, names in [
+            ("gte", 5.5, {"heavy"}),
+            ("gte", Quantity(5.5, "g"), {"heavy"}),
+            ("gte", Quantity(0.0045, "kg"), {"light", "heavy"}),
+            ("lt", 5.5, {"light"}),
+            ("lt", Quantity(5.5, "g"), {"light"}),
+            ("gt", Quantity(5.5, "g"), {"heavy"}),
+            ("lte", Quantity(5.5, "g"), {"light"}),
+        ]:
+            with self.subTest(lookup=lookup, value=value):
+                self.assertEqual(self.names(**{f"weight_int__{lookup}": value}), names)
+
+    def test_in(self):
+        values = [Quantity(0.5, "kg"), 2000, Quantity(3, "kg"), None]
+        self.assertEqual(self.names(weight__in=values), {"light", "heavy"})
+
+    def test_in_with_expression(self):
+        self.assertEqual(
+            self.names(weight__in=[F("weight_int"), Quantity(2, "kg")]), {"heavy"}
+        )
+
+    def test_range(self):
+        self.assertEqual(
+            self.names(weight__range=(Quantity(1, "kg"), Quantity(5, "lb"))),
+            {"heavy"},
+        )
+
+    def test_dimension_mismatch_raised_when_building_query(self):
+        with self.assertRaises(DimensionalityError):
+            HayBale.objects.filter(weight__in=[Quantity(1, "kg"), Quantity(1, "m")])
+        with self.assertRaises(DimensionalityError):
+            HayBale.objects.filter(weight__gt=Quantity(1, "m"))
+
+    def test_approx(self):
+        self.assertEqual(
+            self.names(weight__approx=(Quantity(2.005, "kg"), Quantity(10, "g"))),
+            {"heavy"},
+        )
+        self.assertEqual(
+            self.names(weight__approx=(Quantity(2.02, "kg"), Quantity(10, "g"))),
+            set(),
+        )
+        self.assertIn(
+            "BETWEEN", str(HayBale.objects.filter(weight__approx=(1, 1)).query)
+        )
+
+    def test_approx_integer_field(self):
+        self.assertEqual(self.names(weight_int__approx=(5.4, 0.5)), {"light"})
+        # The center is not truncated to 5
+        self.assertEqual(self.names(weight_int__approx=(5.6, 0.5)), set())
+        self.assertEqual(
+            self.names(weight_int__approx=(Quantity(5.6, "g"), Quantity(0.7, "g"))),
+            {"light"},
+        )
+
+    def test_approx_invalid(self):
+        with self.assertRaises(ValueError):
+            HayBale.objects.filter(weight__approx=Quantity(1, "kg"))
+        with self.assertRaisesRegex(ValueError, "None"):
+            HayBale.objects.filter(weight_int__approx=(None, 1))
+
+
+@pytest.mark.django_db
+class TestQuantityLookupsSpecialFields(TestCase):
+    def test_decimal_approx(self):
+        DecimalFieldSaveModel.objects.create(name="a", weight=Decimal("10.50"))
+        qs = DecimalFieldSaveModel.objects.filter(
+            weight__approx=(Quantity(Decimal("0.01"), "kg"), Decimal("0.5"))
+        )
+        self.assertEqual(qs.count(), 1)
+
+    def test_offset_unit_approx(self):
+        OffsetUnitFloatFieldSaveModel.objects.create(name="boiling", weight=100)
+        qs = OffsetUnitFloatFieldSaveModel.objects.filter(
+            weight__approx=(Quantity(211.5, "degF"), Quantity(1, "degF"))
+        )
+        self.assertEqual(qs.count(), 1)
+        qs = OffsetUnitFloatFieldSaveModel.objects.filter(
+            weight__approx=(Quantity(210, "degF"), Quantity(1, "delta_degF"))
+        )
+        self.assertEqual(qs.count(), 0)
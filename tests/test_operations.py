@@ -0,0 +1,131 @@
+from unittest import mock
+
+import pytest
+
+from django.db import connection
+from django.db.migrations.loader import MigrationLoader
+from django.test import TransactionTestCase
+
+from pint import DimensionalityError
+
+from quantityfield.operations import (
+    ConvertQuantityBaseUnits,
+    ensure_progress_model,
+    get_progress_model,
+)
+from quantityfield.units import ureg
+from tests.dummyapp.models import HayBale, OffsetUnitFloatFieldSaveModel
+
+Quantity = ureg.Quantity
+
+
+class TestConvertQuantityBaseUnits(TransactionTestCase):
+    def setUp(self):
+        self.state = MigrationLoader(connection).project_state()
+
+    def forwards(self, operation):
+        with connection.schema_editor() as editor:
+            operation.database_forwards("dummyapp", editor, self.state, self.state)
+
+    def backwards(self, operation):
+        with connection.schema_editor() as editor:
+            operation.database_backwards("dummyapp", editor, self.state, self.state)
+
+    def weights(self, model=HayBale):
+        return list(model.objects.order_by("pk").values_list("weight", flat=True))
+
+    def test_convert_in_chunks(self):
+        HayBale.objects.bulk_create(
+            [HayBale(name=str(i), weight=i, weight_int=i * 1000) for i in range(7)]
+        )
+        progress = mock.Mock()
+        operation = ConvertQuantityBaseUnits(
+            "haybale", "weight", "kilogram", "gram", chunk_size=3, progress=progress
+        )
+        self.forwards(operation)
+        assert [w.magnitude for w in self.weights()] == [i * 1000 for i in range(7)]
+        assert progress.call_args_list == [
+            mock.call(3, 7),
+            mock.call(6, 7),
+            mock.call(7, 7),
+        ]
+        assert not get_progress_model().objects.exists()
+
+        self.backwards(operation)
+        assert [w.magnitude for w in self.weights()] == list(range(7))
+
+    def test_integer_field(self):
+        HayBale.objects.create(name="a", weight=1, weight_int=1500)
+        self.forwards(
+            ConvertQuantityBaseUnits("haybale", "weight_int", "gram", "kilogram")
+        )
+        weight = HayBale.objects.values_list("weight_int", flat=True)[0]
+        assert weight.magnitude == 2
+        assert type(weight.magnitude) is int
+
+    def test_offset_units(self):
+        OffsetUnitFloatFieldSaveModel.objects.create(name="a", weight=100)
+        OffsetUnitFloatFieldSaveModel.objects.create(name="b", weight=-40)
+        operation = ConvertQuantityBaseUnits(
+            "offsetunitfloatfieldsavemodel", "weight", "degC", "degF", chunk_size=1
+        )
+        self.forwards(operation)
+        magnitudes = [w.magnitude for w in self.weights(OffsetUnitFloatFieldSaveModel)]
+        assert magnitudes == pytest.approx([212, -40])
+        self.backwards(operation)
+        magnitudes = [w.magnitude for w in self.weights(OffsetUnitFloatFieldSaveModel)]
+        assert magnitudes == pytest.approx([100, -40])
+
+    def test_resume(self):
+        HayBale.objects.bulk_create(
+            [HayBale(name=str(i), weight=i) for i in range(1, 5)]
+        )
+        operation = ConvertQuantityBaseUnits(
+            "haybale", "weight", "kilogram", "gram", chunk_size=2
+        )
+        # Simulate a conversion interrupted after the first chunk
+        with connection.schema_editor() as editor:
+            ensure_progress_model(editor)
+        second = HayBale.objects.order_by("pk")[1]
+        HayBale.objects.filter(pk__lte=second.pk).update(weight=0)
+        get_progress_model().objects.create(
+            name="dummyapp.haybale.weight:kilogram", last_pk=str(second.pk)
+        )
+        self.forwards(operation)
+        assert [w.magnitude for w in self.weights()] == [0, 0, 3000, 4000]
+        assert not get_progress_model().objects.exists()
+
+    def test_same_units(self):
+        HayBale.objects.create(name="a", weight=1)
+        self.forwards(ConvertQuantityBaseUnits("haybale", "weight", "g", "gram"))
+        assert self.weights()[0].magnitude == 1
+
+    def test_incompatible_units(self):
+        with pytest.raises(DimensionalityError):
+            self.forwards(ConvertQuantityBaseUnits("haybale", "weight", "g", "m"))
+
+    def test_logarithmic_units(self):
+        operation = ConvertQuantityBaseUnits("haybale", "weight", "W", "dBm")
+        with pytest.raises(DimensionalityError):
+            operation.get_factors("W", "dBm")
+
+    def test_collect_sql(self):
+        operation = ConvertQuantityBaseUnits("haybale", "weight", "kg", "g")
+        with connection.schema_editor(collect_sql=True) as editor:
+            operation.database_forwards("dummyapp", editor, self.state, self.state)
+        assert len(editor.collected_sql) == 1
+        assert editor.collected_sql[0].startswith('UPDATE "dummyapp_haybale"')
+
+    def test_deconstruct(self):
+        operation = ConvertQuantityBaseUnits("haybale", "weight", "g", "kg")
+        name, args, kwargs = operation.deconstruct()
+        assert name == "ConvertQuantityBaseUnits"
+        assert kwargs == {
+            "model_name": "haybale",
+            "name": "weight",
+            "from_units": "g",
+            "to_units": "kg",
+        }
+        assert operation.describe() == "Convert haybale.weight from g to kg"
+        with pytest.raises(ValueError):
+            ConvertQuantityBaseUnits("haybale", "weight", "g", "kg", chunk_size=0)
@@ -0,0 +1,60 @@
+from decimal import Decimal
+
+import pytest
+
+from django.test import TestCase
+
+from quantityfield.units import ureg
+from tests.dummyapp.models import (
+    DecimalFieldSaveModel,
+    HayBale,
+    OffsetUnitFloatFieldSaveModel,
+)
+
+np = pytest.importorskip("numpy")
+
+Quantity = ureg.Quantity
+
+
+@pytest.mark.django_db
+class TestQuantityArray(TestCase):
+    def setUp(self):
+        HayBale.objects.create(name="a", weight=1000, weight_int=1)
+        HayBale.objects.create(name="b", weight=2 * ureg.kilogram, weight_int=2)
+        HayBale.objects.create(name="c", weight=500)
+
+    def test_base_units(self):
+        result = HayBale.objects.order_by("pk").quantity_array("weight")
+        self.assertIsInstance(result, Quantity)
+        self.assertEqual(result.units, ureg.gram)
+        self.assertEqual(result.magnitude.dtype, np.float64)
+        np.testing.assert_array_equal(result.magnitude, [1000, 2000, 500])
+
+    def test_converted(self):
+        result = HayBale.objects.order_by("pk").quantity_array("weight", units="kg")
+        self.assertEqual(result.units, ureg.kilogram)
+        np.testing.assert_allclose(result.magnitude, [1, 2, 0.5])
+
+    def test_null_is_nan(self):
+        result = HayBale.objects.order_by("pk").quantity_array("weight_int")
+        np.testing.assert_array_equal(result.magnitude, [1, 2, np.nan])
+
+    def test_filtered(self):
+        result = HayBale.objects.filter(weight__gt=800).quantity_array("weight")
+        self.assertEqual(len(result), 2)
+
+    def test_decimal(self):
+        DecimalFieldSaveModel.objects.create(name="d", weight=Decimal("1.5"))
+        result = DecimalFieldSaveModel.objects.quantity_array("weight", units="mg")
+        np.testing.assert_allclose(result.magnitude, [1500])
+
+    def test_offset_units(self):
+        OffsetUnitFloatFieldSaveModel.objects.create(name="t", weight=100)
+        result = OffsetUnitFloatFieldSaveModel.objects.quantity_array(
+            "weight", units="degF"
+        )
+        np.testing.assert_allclose(result.magnitude, [212])
+
+    def test_no_quantity_field(self):
+        with self.assertRaises(ValueError):
+            HayBale.objects.quantity_array("name")
@@ -0,0 +1,177 @@
+import datetime
+
+import pytest
+
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+
+from pint import DimensionalityError
+
+from quantityfield.series import (
+    QuantitySeries,
+    QuantitySeriesField,
+    decode_chunk,
+    encode_chunk,
+)
+from quantityfield.units import ureg
+from tests.dummyapp.models import SensorSeries
+
+np = pytest.importorskip("numpy")
+
+Quantity = ureg.Quantity
+
+START = datetime.datetime(2024, 1, 1, tzinfo=datetime.timezone.utc)
+
+
+class TestChunkCodec(TestCase):
+    def test_float_round_trip_is_lossless(self):
+        values = np.array([0.1, 0.2, 0.30000000000000004, -1e300, np.inf, 5e-324])
+        decoded = decode_chunk(encode_chunk(values))
+        assert decoded.dtype == np.float64
+        np.testing.assert_array_equal(decoded, values)
+
+    def test_int_round_trip(self):
+        values = np.array([np.iinfo(np.int64).min, 0, np.iinfo(np.int64).max, 3])
+        decoded = decode_chunk(encode_chunk(values))
+        assert decoded.dtype == np.int64
+        np.testing.assert_array_equal(decoded, values)
+
+    def test_slow_changing_values_compress(self):
+        values = np.arange(10000, dtype=np.int64)
+        assert len(encode_chunk(values)) < values.nbytes / 20
+
+
+@pytest.mark.django_db
+class TestQuantitySeriesField(TestCase):
+    def setUp(self):
+        self.series = SensorSeries.objects.create(name="a", started=START)
+        self.values = np.arange(10, dtype=np.float64) + 273.15
+        self.series.values.write(Quantity(self.values, "kelvin"))
+
+    def test_write_creates_chunks(self):
+        assert len(self.series.values) == 10
+        chunks = list(self.series.values.chunks.order_by("index"))
+        assert [chunk.length for chunk in chunks] == [4, 4, 2]
+        assert chunks[1].minimum == pytest.approx(277.15)
+        assert chunks[1].maximum == pytest.approx(280.15)
+        series = SensorSeries.objects.get(pk=self.series.pk)
+        assert len(series.values) == 10
+
+    def test_read_all(self):
+        value = SensorSeries.objects.get(pk=self.series.pk).values.read()
+        assert value.units == ureg.kelvin
+        np.testing.assert_array_equal(value.magnitude, self.values)
+
+    def test_read_window_loads_overlapping_chunks(self):
+        with CaptureQueriesContext(connection) as queries:
+            value = self.series.values.read(5, 7)
+        np.testing.assert_array_equal(value.magnitude, self.values[5:7])
+        assert len(queries) == 1
+        chunks = self.series.values.chunks.filter(index__gte=1, index__lte=1)
+        assert chunks.count() == 1
+
+    def test_read_window_over_chunks(self):
+        np.testing.assert_array_equal(
+            self.series.values.read(3, 9).magnitude, self.values[3:9]
+        )
+        np.testing.assert_array_equal(
+            self.series.values.read(8, 100).magnitude, self.values[8:]
+        )
+        assert len(self.series.values.read(20, 30).magnitude) == 0
+
+    def test_read_time(self):
+        value = self.series.values.read_time(
+            START + datetime.timedelta(seconds=2),
+            START + datetime.timedelta(seconds=4.5),
+        )
+        np.testing.assert_array_equal(value.magnitude, self.values[2:5])
+
+    def test_converts_units(self):
+        self.series.values.write(Quantity(np.array([0.0, 100.0]), "degC"))
+        np.testing.assert_allclose(
+            self.series.values.read().magnitude, [273.15, 373.15]
+        )
+        with pytest.raises(DimensionalityError):
+            self.series.values.write(Quantity(np.array([1.0]), "meter"))
+        with pytest.raises(ValueError, match="one dimensional"):
+            self.series.values.write(np.ones((2, 2)))
+
+    def test_append(self):
+        self.series.values.append(Quantity(np.array([1.0, 2.0, 3.0]), "kelvin"))
+        series = SensorSeries.objects.get(pk=self.series.pk)
+        assert len(series.values) == 13
+        np.testing.assert_array_equal(
+            series.values.read().magnitude, [*self.values, 1.0, 2.0, 3.0]
+        )
+        assert [chunk.length for chunk in series.values.chunks.order_by("index")] == [
+            4,
+            4,
+            4,
+            1,
+        ]
+
+    def test_save_of_outdated_instance_keeps_length(self):
+        outdated = SensorSeries.objects.get(pk=self.series.pk)
+        self.series.values.append(Quantity(np.array([1.0, 2.0]), "kelvin"))
+        outdated.name = "b"
+        outdated.save()
+        series = SensorSeries.objects.get(pk=self.series.pk)
+        assert (series.name, len(series.values)) == ("b", 12)
+
+    def test_append_to_outdated_instance(self):
+        outdated = SensorSeries.objects.get(pk=self.series.pk)
+        self.series.values.append(Quantity(np.array([1.0, 2.0]), "kelvin"))
+        outdated.values.append(Quantity(np.array([3.0]), "kelvin"))
+        assert len(outdated.values) == 13
+        np.testing.assert_array_equal(
+            SensorSeries.objects.get(pk=self.series.pk).values.read().magnitude,
+            [*self.values, 1.0, 2.0, 3.0],
+        )
+
+    def test_append_locks_instance(self):
+        table = SensorSeries._meta.db_table
+        with CaptureQueriesContext(connection) as queries:
+            self.series.values.append(Quantity(np.array([1.0]), "kelvin"))
+        lock = next(
+            query["sql"]
+            for query in queries
+            if query["sql"].startswith("SELECT") and table in query["sql"]
+        )
+        if connection.features.has_select_for_update:
+            assert "FOR UPDATE" in lock
+
+    def test_min_max(self):
+        assert self.series.values.min() == Quantity(273.15, "kelvin")
+        assert self.series.values.max() == Quantity(282.15, "kelvin")
+        empty = SensorSeries.objects.create(name="empty")
+        assert empty.values.min() is None
+        assert len(empty.values.read().magnitude) == 0
+
+    def test_unsaved_instance(self):
+        with pytest.raises(ValueError, match="Save"):
+            SensorSeries(name="new").values.write([1.0])
+
+    def test_delete_cascades(self):
+        chunk_model = SensorSeries._meta.get_field("values").chunk_model
+        self.series.delete()
+        assert not chunk_model.objects.exists()
+
+
+class TestQuantitySeriesFieldInit(TestCase):
+    def test_invalid_arguments(self):
+        with pytest.raises(ValueError):
+            QuantitySeriesField(1)
+        with pytest.raises(ValueError, match="chunk_size"):
+            QuantitySeriesField("kelvin", chunk_size=0)
+        with pytest.raises(ValueError, match="origin_field"):
+            QuantitySeriesField("kelvin", interval=datetime.timedelta(seconds=1))
+        with pytest.raises(DimensionalityError):
+            QuantitySeriesField("kelvin", unit_choices=["meter"])
+
+    def test_read_time_without_interval(self):
+        field = QuantitySeriesField("kelvin")
+        field.set_attributes_from_name("values")
+        handle = QuantitySeries(SensorSeries(name="a"), field)
+        with pytest.raises(ValueError, match="interval"):
+            handle.read_time(START, START)
@@ -0,0 +1,81 @@
+import tempfile
+from pathlib import Path
+from unittest import mock
+
+from django.apps import apps
+from django.conf import settings
+from django.test import SimpleTestCase, override_settings
+
+from pint import UnitRegistry, get_application_registry
+
+import quantityfield.settings as qf_settings
+from quantityfield.units import ureg
+
+
+class TestUnitRegistrySettings(SimpleTestCase):
+    def test_registry_from_settings(self):
+        self.assertIs(
+            qf_settings.get_unit_registry(), settings.DJANGO_PINT_UNIT_REGISTER
+        )
+        self.assertIs(qf_settings.DJANGO_PINT_UNIT_REGISTER, ureg)
+
+    def test_default_registry_created_lazily(self):
+        with mock.patch.object(qf_settings, "_unit_registry", None):
+            with mock.patch.object(
+                qf_settings, "_create_default_registry", wraps=UnitRegistry
+            ) as create:
+                first = qf_settings.get_unit_registry()
+                second = qf_settings.get_unit_registry()
+            self.assertIs(first, second)
+            self.assertEqual(create.call_count, 1)
+            self.assertIs(get_application_registry().get(), first)
+        # restore application registry for the other tests
+        qf_settings.set_application_registry(ureg)
+
+    def test_default_registry_with_cache_folder(self):
+        with tempfile.TemporaryDirectory() as folder:
+            with override_settings(DJANGO_PINT_CACHE_FOLDER=folder):
+                registry = qf_settings._create_default_registry()
+            self.assertEqual(registry.Quantity(1, "kg").to("g").magnitude, 1000)
+            self.assertTrue(any(Path(folder).iterdir()))
+
+    def test_cache_folder_not_supported(self):
+        class OldUnitRegistry(UnitRegistry):
+            def __init__(self, filename=""):
+                super().__init__(filename)
+
+        with (
+            tempfile.TemporaryDirectory() as folder,
+            mock.patch.object(qf_settings, "UnitRegistry", OldUnitRegistry),
+            override_settings(DJANGO_PINT_CACHE_FOLDER=folder),
+        ):
+            with self.assertWarnsRegex(RuntimeWarning, "pint>=0.18"):
+                registry = qf_settings._create_default_registry()
+            self.assertFalse(any(Path(folder).iterdir()))
+        self.assertIsInstance(registry, OldUnitRegistry)
+
+    def test_unit_table_from_settings(self):
+        with mock.patch.dict(qf_settings._unit_tables, clear=True):
+            with override_settings(DJANGO_PINT_UNIT_CODES=["gram", "kilogram"]):
+                table = qf_settings.get_unit_table()
+            self.assertIs(qf_settings.get_unit_table(), table)
+            self.assertIs(table.ureg, ureg)
+            self.assertEqual(table.get_code("kg"), 1)
+            self.assertEqual(table.setting, "DJANGO_PINT_UNIT_CODES")
+
+    def test_unit_table_of_other_setting(self):
+        with mock.patch.dict(qf_settings._unit_tables, clear=True):
+            with override_settings(OTHER_UNIT_CODES=["meter"]):
+                table = qf_settings.get_unit_table("OTHER_UNIT_CODES")
+            self.assertIsNot(qf_settings.get_unit_table(), table)
+            self.assertEqual(table.get_code("m"), 0)
+
+    def test_unit_table_warmed_on_ready(self):
+        with mock.patch.dict(qf_settings._unit_tables, clear=True):
+            with override_settings(DJANGO_PINT_UNIT_CODES=["gram"]):
+                apps.get_app_config("quantityfield").ready()
+            self.assertIn("DJANGO_PINT_UNIT_CODES", qf_settings._unit_tables)
+
+    def test_unknown_attribute(self):
+        with self.assertRaises(AttributeError):
+            qf_settings.NOT_EXISTING  # noqa: B018
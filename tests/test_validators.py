@@ -0,0 +1,133 @@
+import pytest
+
+from django.core.exceptions import ValidationError
+from django.core.validators import MaxValueValidator
+from django.db import IntegrityError, transaction
+from django.test import TestCase
+
+from quantityfield.units import ureg
+from quantityfield.validators import (
+    QuantityMaxValueValidator,
+    QuantityMinValueValidator,
+)
+from tests.dummyapp.models import ConstrainedHayBale
+
+Quantity = ureg.Quantity
+
+
+class TestQuantityValidators(TestCase):
+    def test_limit_precomputed_in_base_units(self):
+        validators = ConstrainedHayBale._meta.get_field("weight").validators
+        bound = [v for v in validators if isinstance(v, QuantityMaxValueValidator)]
+        assert bound[0].base_limit_value == 1000
+        assert bound[0].base_unit == ureg.kilogram
+
+    def test_offset_units(self):
+        field = ConstrainedHayBale._meta.get_field("temperature")
+        (validator,) = field.validators
+        assert validator.base_limit_value == pytest.approx(253.15)
+        validator(253.15)
+        validator(Quantity(-20, "degC"))
+        with pytest.raises(ValidationError):
+            validator(Quantity(-21, "degC"))
+
+    def test_message(self):
+        validator = QuantityMinValueValidator(Quantity(1, "kg")).bind(
+            ConstrainedHayBale._meta.get_field("weight")
+        )
+        with pytest.raises(ValidationError) as error:
+            validator(0.5)
+        assert error.value.code == "min_value"
+        assert "1 kilogram" in error.value.messages[0]
+
+    def test_unbound_validator(self):
+        with pytest.raises(ValueError, match="quantity fields"):
+            QuantityMinValueValidator(Quantity(1, "kg"))(1)
+
+    def test_limit_must_be_quantity(self):
+        with pytest.raises(ValueError, match="quantity"):
+            QuantityMinValueValidator(1)
+
+    def test_deconstruct(self):
+        validator = QuantityMinValueValidator(Quantity(-20, "degC"), message="cold")
+        path, args, kwargs = validator.deconstruct()
+        assert path == "quantityfield.validators.QuantityMinValueValidator"
+        assert args == ((-20, "degree_Celsius"),)
+        assert QuantityMinValueValidator(*args, **kwargs) == validator
+
+
+@pytest.mark.django_db
+class TestValidatorConstraints(TestCase):
+    def test_constraints_added(self):
+        constraints = {
+            constraint.name: constraint
+            for constraint in ConstrainedHayBale._meta.constraints
+        }
+        assert set(constraints) == {
+            "dummyapp_constrainedhaybale_weight_min_value",
+            "dummyapp_constrainedhaybale_weight_max_value",
+            "dummyapp_constrainedhaybale_weight_int_min_value",
+            "dummyapp_constrainedhaybale_weight_int_min_value_2",
+            "dummyapp_constrainedhaybale_weight_int_max_value",
+        }
+        max_value = constraints["dummyapp_constrainedhaybale_weight_max_value"]
+        assert max_value.condition.children == [("weight__lte", 1000)]
+
+    def test_integer_constraints_rounded(self):
+        constraints = {
+            constraint.name: constraint.condition.children
+            for constraint in ConstrainedHayBale._meta.constraints
+        }
+        prefix = "dummyapp_constrainedhaybale_weight_int"
+        assert constraints[f"{prefix}_min_value"] == [("weight_int__gte", 1)]
+        assert constraints[f"{prefix}_max_value"] == [("weight_int__lte", 2)]
+
+    def test_full_clean(self):
+        ConstrainedHayBale(name="ok", weight=Quantity(500, "g")).full_clean(
+            exclude=["temperature"]
+        )
+        with pytest.raises(ValidationError) as error:
+            ConstrainedHayBale(name="heavy", weight=Quantity(2, "tonne")).full_clean(
+                exclude=["temperature"]
+            )
+        assert "weight" in error.value.message_dict
+
+    def test_full_clean_integer_field(self):
+        ConstrainedHayBale(name="ok", weight_int=Quantity(2, "kg")).full_clean(
+            exclude=["weight", "temperature"]
+        )
+        for weight in (Quantity(0, "kg"), Quantity(3000, "g")):
+            with pytest.raises(ValidationError) as error:
+                ConstrainedHayBale(name="bad", weight_int=weight).full_clean(
+                    exclude=["weight", "temperature"]
+                )
+            assert "weight_int" in error.value.message_dict
+        with pytest.raises(IntegrityError), transaction.atomic():
+            ConstrainedHayBale.objects.create(name="bad", weight_int=0)
+
+    def test_integer_field_validators(self):
+        validators = ConstrainedHayBale._meta.get_field("weight_int").validators
+        minimum = validators[0]
+        assert minimum.base_limit_value == 0.5
+        assert minimum.limit_value == 0.5
+        assert minimum.limit_quantity == Quantity(500, "gram")
+        # The limits are compared with the range of the column, which is
+        # within the limits
+        assert not any(type(validator) is MaxValueValidator for validator in validators)
+
+    def test_bulk_create_enforced_by_database(self):
+        ConstrainedHayBale.objects.bulk_create(
+            [ConstrainedHayBale(name="ok", weight=Quantity(500, "g"))]
+        )
+        with pytest.raises(IntegrityError), transaction.atomic():
+            ConstrainedHayBale.objects.bulk_create(
+                [ConstrainedHayBale(name="heavy", weight=Quantity(2, "tonne"))]
+            )
+
+    def test_update_enforced_by_database(self):
+        ConstrainedHayBale.objects.create(name="ok", weight=Quantity(1, "kg"))
+        with pytest.raises(IntegrityError), transaction.atomic():
+            ConstrainedHayBale.objects.update(weight=Quantity(-1, "g"))
+
+    def test_null_allowed(self):
+        ConstrainedHayBale.objects.create(name="none", weight=None)
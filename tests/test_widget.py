@@ -1,6 +1,9 @@
 # flake8: noqa: F841
 
+import copy
+import json
 from decimal import Decimal
+from unittest import mock
 
 from django import forms
 from django.test import SimpleTestCase, TestCase
@@ -9,7 +12,12 @@ from pint import DimensionalityError, UndefinedUnitError
 
 from quantityfield.fields import IntegerQuantityFormField, QuantityFormField
 from quantityfield.units import ureg
-from quantityfield.widgets import QuantityWidget
+from quantityfield.widgets import (
+    QuantityTextInput,
+    QuantityWidget,
+    get_conversion_table,
+    get_unit_choices,
+)
 from tests.dummyapp.models import (
     ChoicesDefinedInModel,
     ChoicesDefinedInModelInt,
@@ -335,3 +343,180 @@ class TestWidgetRenderingDecimalFromFloat(TestWidgetRenderingBase):
     value = Decimal(1.0)
     expected_created = "1"
     expected_db = "1.0"
+
+
+class TextInputWeightForm(forms.Form):
+    weight = QuantityFormField(
+        base_units="gram", unit_choices=["ounce", "pound", "kilogram"], text_input=True
+    )
+    weight_int = IntegerQuantityFormField(
+        base_units="gram", text_input=True, required=False
+    )
+
+
+class TestQuantityTextInput(TestCase):
+    def clean(self, **data):
+        form = TextInputWeightForm(data=data)
+        form.is_valid()
+        return form
+
+    def test_widget(self):
+        form = TextInputWeightForm()
+        self.assertIsInstance(form.fields["weight"].widget, QuantityTextInput)
+        field = ChoicesDefinedInModel._meta.get_field("weight").formfield(
+            text_input=True
+        )
+        self.assertIsInstance(field.widget, QuantityTextInput)
+
+    def test_clean(self):
+        form = self.clean(weight="5 lb", weight_int="12")
+        self.assertEqual(form.errors, {})
+        self.assertAlmostEqual(form.cleaned_data["weight"].m_as("gram"), 2267.96185)
+        self.assertEqual(str(form.cleaned_data["weight"].units), "gram")
+        self.assertEqual(form.cleaned_data["weight_int"], Quantity(12, "gram"))
+        form = self.clean(weight=" 1.5kilogram ")
+        self.assertEqual(form.cleaned_data["weight"], Quantity(1500, "gram"))
+
+    def test_invalid(self):
+        for value, message in [
+            ("5 meter", "meter can not be converted to gram"),
+            ("5 mg", "mg is not a valid choice"),
+            ("5 foo", "foo is not a valid unit"),
+            ("heavy", "Enter a number."),
+        ]:
+            with self.subTest(value=value):
+                form = self.clean(weight=value)
+                self.assertEqual(form.errors["weight"], [message])
+        form = self.clean(weight="5 lb", weight_int="1.5 g")
+        self.assertEqual(form.errors["weight_int"], ["Enter a whole number."])
+
+    def test_malformed_units(self):
+        for value in ["5 1/0", "5 kg)", "5 (", "5 g*", "5 ,"]:
+            with self.subTest(value=value):
+                form = self.clean(weight=value)
+                unit = value.split(" ", 1)[1]
+                self.assertEqual(form.errors["weight"], [f"{unit} is not a valid unit"])
+
+    def test_empty(self):
+        form = self.clean(weight="")
+        self.assertEqual(form.errors["weight"], ["This field is required."])
+        form = self.clean(weight="1 oz", weight_int="")
+        self.assertIsNone(form.cleaned_data["weight_int"])
+
+    def test_units_parsed_once(self):
+        QuantityFormField.unit_parse_cache.clear()
+        with mock.patch.object(ureg, "Unit", wraps=ureg.Unit) as parse:
+            for _ in range(3):
+                self.clean(weight="5 lb")
+        self.assertEqual(
+            [call.args for call in parse.call_args_list if call.args == ("lb",)],
+            [("lb",)],
+        )
+
+    def test_render(self):
+        widget = QuantityTextInput(base_units="gram")
+        self.assertIn('value="5 pound"', widget.render("weight", Quantity(5, "lb")))
+        self.assertIn('value="12 gram"', widget.render("weight", 12))
+        self.assertIn('value="5 lb"', widget.render("weight", "5 lb"))
+        self.assertNotIn("value=", widget.render("weight", None))
+
+
+class TestSharedUnitChoices(SimpleTestCase):
+    def test_choices_shared(self):
+        first = QuantityWidget(base_units="gram", unit_choices=["gram", "ounce"])
+        second = QuantityWidget(base_units="gram", unit_choices=["gram", "ounce"])
+        self.assertIs(first.widgets[1].choices, second.widgets[1].choices)
+        other = QuantityWidget(base_units="gram", unit_choices=["gram"])
+        self.assertEqual(other.widgets[1].choices, [("gram", "gram")])
+
+    def test_all_units_shared(self):
+        first = QuantityWidget(base_units="gram")
+        second = QuantityWidget(base_units="gram")
+        self.assertIs(first.widgets[1].choices, second.widgets[1].choices)
+        self.assertIn(("kilogram", "kilogram"), first.widgets[1].choices)
+        self.assertIs(get_unit_choices(ureg), first.widgets[1].choices)
+
+    def test_choices_immutable(self):
+        choices = get_unit_choices(ureg, ["gram", "ounce"])
+        with self.assertRaises(TypeError):
+            choices.append(("kilogram", "kilogram"))
+        with self.assertRaises(TypeError):
+            choices[0] = ("kilogram", "kilogram")
+        self.assertEqual(choices, [("gram", "gram"), ("ounce", "ounce")])
+
+    def test_deepcopy(self):
+        widget = QuantityWidget(
+            attrs={"class": "weight"}, base_units="gram", unit_choices=["gram"]
+        )
+        copied = copy.deepcopy(widget)
+        self.assertIsNot(copied, widget)
+        self.assertIsNot(copied.widgets[1], widget.widgets[1])
+        self.assertIs(copied.widgets[1].choices, widget.widgets[1].choices)
+        copied.attrs["class"] = "other"
+        copied.widgets[0].attrs["class"] = "other"
+        self.assertEqual(widget.attrs["class"], "weight")
+        self.assertEqual(widget.widgets[0].attrs["class"], "weight")
+
+    def test_forms_share_choices(self):
+        first, second = HayBaleForm(), HayBaleForm()
+        self.assertIsNot(first.fields["weight"], second.fields["weight"])
+        self.assertIs(
+            first.fields["weight"].widget.widgets[1].choices,
+            second.fields["weight"].widget.widgets[1].choices,
+        )
+
+    def test_form_field_deepcopy_shares_allowed_units(self):
+        field = QuantityFormField(
+            base_units="gram", unit_choices=["ounce"], text_input=True
+        )
+        copied = copy.deepcopy(field)
+        self.assertIs(copied.allowed_units, field.allowed_units)
+
+
+class TestUnitConversionTable(SimpleTestCase):
+    def test_table(self):
+        table = json.loads(
+            get_conversion_table(ureg, "gram", ("gram", "kilogram", "ounce"))
+        )
+        self.assertEqual(table["gram"], [1, 0])
+        self.assertEqual(table["kilogram"], [0.001, 0])
+        self.assertAlmostEqual(table["ounce"][0], 1 / 28.349523125)
+
+    def test_offset_units(self):
+        table = json.loads(get_conversion_table(ureg, "degC", ("kelvin", "degF")))
+        factor, offset = table["kelvin"]
+        self.assertAlmostEqual(factor, 1)
+        self.assertAlmostEqual(offset, 273.15)
+        factor, offset = table["degF"]
+        self.assertAlmostEqual(factor, 1.8)
+        self.assertAlmostEqual(offset, 32)
+
+    def test_cached(self):
+        self.assertIs(
+            get_conversion_table(ureg, "gram", ("gram", "ounce")),
+            get_conversion_table(ureg, "gram", ("gram", "ounce")),
+        )
+
+    def test_widget(self):
+        widget = QuantityWidget(base_units="gram", unit_choices=["gram", "kilogram"])
+        html = widget.render("weight", Quantity(2, "kilogram"))
+        self.assertIn(
+            'data-unit-conversions="{&quot;gram&quot;:[1.0,0.0],'
+            '&quot;kilogram&quot;:[0.001,0.0]}"',
+            html,
+        )
+        self.assertNotIn("data-unit-conversions", widget.widgets[0].attrs)
+        self.assertIn("quantityfield/unit-switch.js", str(widget.media))
+
+    def test_widget_without_choices(self):
+        widget = QuantityWidget(base_units="gram")
+        self.assertNotIn("data-unit-conversions", widget.widgets[1].attrs)
+        widget = QuantityWidget(unit_choices=["gram"])
+        self.assertNotIn("data-unit-conversions", widget.widgets[1].attrs)
+
+    def test_form_field(self):
+        form = HayBaleForm()
+        conversions = json.loads(
+            form.fields["weight"].widget.widgets[1].attrs["data-unit-conversions"]
+        )
+        self.assertEqual(set(conversions), {"ounce", "gram"})